@@ -0,0 +1,77 @@
+"""Benchmark the radar camera against the animated image.
+
+Decodes the frames of the repository's ``radar_animation.gif`` and compares
+the work of one update cycle: the image entity re-encodes the whole
+animation, while the camera serves the downloaded palette PNG as it is.
+Re-encoding the newest frame to PNG is shown for scale.
+
+    python benchmarks/bench_radar_camera.py [--source radar_animation.gif]
+"""
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.hungaromet.radar_encoder import encode_gif  # noqa: E402
+from custom_components.hungaromet.radar_frames import (  # noqa: E402
+    decode_frame,
+    encode_png,
+)
+
+
+def _frames(source):
+    frames = []
+    with Image.open(source) as animation:
+        for index, image in enumerate(ImageSequence.Iterator(animation)):
+            buffer = BytesIO()
+            image.convert("RGB").save(buffer, format="PNG")
+            frames.append(decode_frame(f"frame{index}.png", buffer.getvalue()))
+    return frames
+
+
+def _measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = func()
+        best = min(best, time.perf_counter() - started)
+    return len(data), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default=str(ROOT / "radar_animation.gif"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = _frames(args.source)
+    print(f"{len(frames)} frames of {frames[0].size[0]}x{frames[0].size[1]}")
+    # Stand-ins for the palette PNGs the radar image downloaded
+    downloaded = [encode_png(frame) for frame in frames]
+    results = (
+        (
+            "image: animated GIF",
+            _measure(
+                lambda: encode_gif([frame.image() for frame in frames]), args.repeat
+            ),
+        ),
+        ("PNG re-encode", _measure(lambda: encode_png(frames[-1]), args.repeat)),
+        ("camera: as downloaded", _measure(lambda: downloaded[-1], args.repeat)),
+    )
+    baseline = results[0][1][1]
+    for label, (size, seconds) in results:
+        print(
+            f"{label:<22} {size / 1024:8.1f} KiB {seconds * 1000:8.1f} ms"
+            f"  ({seconds / baseline:.0%} time)"
+        )
+
+
+if __name__ == "__main__":
+    main()
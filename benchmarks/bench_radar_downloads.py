@@ -0,0 +1,83 @@
+"""Benchmark sequential versus parallel radar frame downloads.
+
+Serves synthetic radar PNGs from a local HTTP server that adds a fixed
+latency to every response, then times ``download_images`` for growing
+frame counts with one worker (the old sequential behaviour) and with the
+default worker limit.
+
+    python benchmarks/bench_radar_downloads.py [--latency 0.15]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.hungaromet.radar_gif_creator import (  # noqa: E402
+    MAX_PARALLEL_DOWNLOADS,
+    download_images,
+)
+
+
+def _frame_png():
+    buffer = BytesIO()
+    Image.new("RGB", (1024, 768), color=(30, 60, 90)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _handler(payload, latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--frames", type=int, nargs="+", default=[1, 3, 6, 12, 24])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), _handler(_frame_png(), args.latency)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"latency per frame: {args.latency * 1000:.0f} ms")
+    print(f"{'frames':>6} {'sequential':>12} {'parallel':>12} {'speedup':>8}")
+    try:
+        for count in args.frames:
+            urls = [f"{base}frame_{index:03d}.png" for index in range(count)]
+            timings = []
+            for workers in (1, MAX_PARALLEL_DOWNLOADS):
+                started = time.perf_counter()
+                frames = download_images(urls, max_workers=workers)
+                timings.append(time.perf_counter() - started)
+                assert len(frames) == count
+            print(
+                f"{count:>6} {timings[0] * 1000:>10.0f}ms {timings[1] * 1000:>10.0f}ms"
+                f" {timings[0] / timings[1]:>7.1f}x"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark radar GIF encoding.
+
+Uses the frames of the repository's ``radar_animation.gif`` as source
+frames (converted to RGB, as decoded radar PNGs arrive) and compares
+Pillow's default per-frame quantization with ``encode_gif``'s shared
+palette and frame-difference encoding. Sizes are only comparable when the
+colours survive, so each result also reports how far decoded pixels are
+from the source. Input using at most 255 colours must round-trip exactly.
+
+    python benchmarks/bench_radar_encoding.py [--source radar_animation.gif]
+"""
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.hungaromet.radar_encoder import (  # noqa: E402
+    PALETTE_COLORS,
+    encode_gif,
+)
+
+
+def _pillow_default(images, duration=1000, end_delay=3000):
+    buffer = BytesIO()
+    images[0].save(
+        buffer,
+        format="GIF",
+        save_all=True,
+        append_images=images[1:],
+        duration=[duration] * (len(images) - 1) + [end_delay],
+        loop=0,
+    )
+    return buffer.getvalue()
+
+
+def _measure(encoder, frames, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = encoder(frames)
+        best = min(best, time.perf_counter() - started)
+    return len(data), best
+
+
+def _errors(data, frames):
+    """Return the largest channel error and the share of pixels off by > 8."""
+    with Image.open(BytesIO(data)) as animation:
+        decoded = [
+            np.asarray(frame.convert("RGB"), dtype=np.int16)
+            for frame in ImageSequence.Iterator(animation)
+        ]
+    worst, off = 0, 0
+    for frame, source in zip(decoded, frames):
+        error = np.abs(frame - np.asarray(source, dtype=np.int16)).max(axis=2)
+        worst = max(worst, int(error.max()))
+        off += int((error > 8).sum())
+    return worst, off / sum(frame.width * frame.height for frame in frames)
+
+
+def _color_count(frames):
+    colors = set()
+    for frame in frames:
+        colors.update(color for _, color in frame.getcolors(frame.width * frame.height))
+    return len(colors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default=str(ROOT / "radar_animation.gif"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with Image.open(args.source) as source:
+        frames = [frame.convert("RGB") for frame in ImageSequence.Iterator(source)]
+    print(f"{len(frames)} frames of {frames[0].size[0]}x{frames[0].size[1]}")
+
+    baseline = _measure(_pillow_default, frames, args.repeat)
+    for label, encoder, (size, seconds) in (
+        ("pillow default", _pillow_default, baseline),
+        (
+            "shared palette + diff",
+            encode_gif,
+            _measure(encode_gif, frames, args.repeat),
+        ),
+    ):
+        worst, off = _errors(encoder(frames), frames)
+        print(
+            f"{label:<22} {size / 1024:8.1f} KiB {seconds * 1000:8.1f} ms"
+            f"  ({size / baseline[0]:.0%} size, {seconds / baseline[1]:.0%} time)"
+            f"  max error {worst:3d}, {off:.2%} pixels off by > 8"
+        )
+
+    # Frames fitting one palette must not lose a single colour
+    exact = frames if _color_count(frames) <= PALETTE_COLORS else frames[:1]
+    assert _color_count(exact) <= PALETTE_COLORS
+    assert _errors(encode_gif(exact), exact)[0] == 0, "lossy round trip"
+    print(f"{len(exact)} frame(s) of {_color_count(exact)} colours round-trip exactly")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark radar animation formats.
+
+Encodes the frames of the repository's ``radar_animation.gif`` (converted
+to RGB, as decoded radar PNGs arrive) with every encoder in
+``radar_encoder.ENCODERS`` and reports output size and encode time.
+
+    python benchmarks/bench_radar_formats.py [--source radar_animation.gif]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.hungaromet.radar_encoder import (  # noqa: E402
+    ENCODERS,
+    FORMAT_GIF,
+)
+
+
+def _measure(encode, frames, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = encode(frames)
+        best = min(best, time.perf_counter() - started)
+    return len(data), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default=str(ROOT / "radar_animation.gif"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with Image.open(args.source) as source:
+        frames = [frame.convert("RGB") for frame in ImageSequence.Iterator(source)]
+    print(f"{len(frames)} frames of {frames[0].size[0]}x{frames[0].size[1]}")
+
+    results = {
+        image_format: _measure(encoder.encode, frames, args.repeat)
+        for image_format, encoder in ENCODERS.items()
+    }
+    baseline = results[FORMAT_GIF]
+    for image_format, (size, seconds) in results.items():
+        print(
+            f"{image_format:<6} {size / 1024:8.1f} KiB {seconds * 1000:8.1f} ms"
+            f"  ({size / baseline[0]:.0%} size, {seconds / baseline[1]:.0%} time)"
+        )
+
+
+if __name__ == "__main__":
+    main()
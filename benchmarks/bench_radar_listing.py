@@ -0,0 +1,90 @@
+"""Benchmark parsing of the radar directory listing.
+
+Builds a synthetic Apache-style listing and times ``parse_listing``. When
+BeautifulSoup happens to be installed, the previous ``html.parser`` based
+implementation is timed as well for comparison.
+
+    python benchmarks/bench_radar_listing.py [--entries 10000] [--count 6]
+"""
+
+import argparse
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.hungaromet.radar_gif_creator import (  # noqa: E402
+    parse_listing,
+)
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # optional comparison
+    BeautifulSoup = None
+
+
+def _listing(entries):
+    start = datetime(2024, 1, 1)
+    rows = []
+    for index in range(entries):
+        stamp = (start + timedelta(minutes=5 * index)).strftime("%Y%m%d_%H%M")
+        name = f"refl2D_pscappi_{stamp}.png"
+        rows.append(
+            f'<tr><td valign="top"><img src="/icons/image2.gif" alt="[IMG]"></td>'
+            f'<td><a href="{name}">{name}</a></td>'
+            f'<td align="right">{stamp} </td><td align="right">412K</td></tr>'
+        )
+    return (
+        "<html><head><title>Index of /radar</title></head><body><table>"
+        '<tr><th><a href="?C=N;O=D">Name</a></th></tr>'
+        + "\n".join(rows)
+        + "</table></body></html>"
+    )
+
+
+def _legacy_parse(html, count):
+    soup = BeautifulSoup(html, "html.parser")
+    png_files = [
+        a.get("href")
+        for a in soup.find_all("a")
+        if isinstance(a.get("href"), str) and a.get("href").endswith(".png")
+    ]
+    seen = set()
+    unique = []
+    for name in png_files:
+        if name not in seen:
+            unique.append(name)
+            seen.add(name)
+    unique.sort(reverse=True)
+    latest = unique[:count]
+    latest.sort()
+    return latest
+
+
+def _time(func, html, count, repeat):
+    return min(timeit.repeat(lambda: func(html, count), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--count", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = _listing(args.entries)
+    print(f"listing: {args.entries} entries, {len(html) / 1024:.0f} KiB")
+    regex = _time(parse_listing, html, args.count, args.repeat)
+    print(f"regex + nlargest: {regex * 1000:8.2f} ms")
+    if BeautifulSoup is None:
+        print("bs4 not installed; skipping the html.parser comparison")
+        return
+    assert _legacy_parse(html, args.count) == parse_listing(html, args.count)
+    legacy = _time(_legacy_parse, html, args.count, args.repeat)
+    print(f"bs4 html.parser:  {legacy * 1000:8.2f} ms ({legacy / regex:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark the town and home location overlay.
+
+Decodes the frames of the repository's ``radar_animation.gif`` into palette
+frames sharing one palette, as the composites do, and times one update
+cycle with and without the overlay: rendering the layer (once per location
+and crop), blending it into every frame and encoding the GIF. The first
+blend with a palette matches its colours; later builds only look them up.
+
+    python benchmarks/bench_radar_overlay.py [--source radar_animation.gif]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.hungaromet.radar_encoder import encode_gif  # noqa: E402
+from custom_components.hungaromet.radar_overlay import (  # noqa: E402
+    RadarOverlay,
+    apply_overlay,
+    render_layer,
+)
+
+HOME = RadarOverlay(47.498, 19.040)
+
+
+def _frames(source):
+    with Image.open(source) as animation:
+        frames = [image.convert("RGB") for image in ImageSequence.Iterator(animation)]
+    palette = frames[0].quantize(255)
+    return [frame.quantize(palette=palette) for frame in frames]
+
+
+def _measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _render(size):
+    render_layer.cache_clear()
+    render_layer(HOME, None, size)
+
+
+def _first_blend(frames, size):
+    # Forget the matched colours, as a new palette would
+    render_layer(HOME, None, size).tables.clear()
+    apply_overlay(frames, HOME, None, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default=str(ROOT / "radar_animation.gif"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = _frames(args.source)
+    size = frames[0].size
+    print(f"{len(frames)} frames of {size[0]}x{size[1]}")
+    results = (
+        ("encode only", _measure(lambda: encode_gif(frames), args.repeat)),
+        ("render layer (once)", _measure(lambda: _render(size), args.repeat)),
+        (
+            "blend, new palette",
+            _measure(lambda: _first_blend(frames, size), args.repeat),
+        ),
+        (
+            "blend, known palette",
+            _measure(lambda: apply_overlay(frames, HOME, None, size), args.repeat),
+        ),
+        (
+            "blend + encode",
+            _measure(
+                lambda: encode_gif(apply_overlay(frames, HOME, None, size)),
+                args.repeat,
+            ),
+        ),
+    )
+    baseline = results[0][1]
+    for label, seconds in results:
+        print(f"{label:<22} {seconds * 1000:8.1f} ms  ({seconds / baseline:.0%} time)")
+
+
+if __name__ == "__main__":
+    main()
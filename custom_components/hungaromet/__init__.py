@@ -1,12 +1,122 @@
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.typing import ConfigType
 
+from .const import (
+    CONF_CPU_WORKERS,
+    CONF_DISTANCE_KM,
+    CONF_IO_WORKERS,
+    DEFAULT_CPU_WORKERS,
+    DEFAULT_DISTANCE_KM,
+    DEFAULT_IO_WORKERS,
+    DOMAIN,
+    RADAR_DEVICE_ID,
+)
+from .executor import async_setup_executors
+from .hub import async_close_radar_downloader, async_get_hub, async_release_hub
+from .sensor_descriptions import DATASET_DEVICES
+from .services import async_setup_services
+
+PLATFORMS = ["sensor", "image", "camera"]
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema({
+            vol.Optional(CONF_IO_WORKERS, default=DEFAULT_IO_WORKERS): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=16)
+            ),
+            vol.Optional(CONF_CPU_WORKERS, default=DEFAULT_CPU_WORKERS): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=8)
+            ),
+        })
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    domain_config = config.get(DOMAIN, {})
+    async_setup_executors(
+        hass,
+        domain_config.get(CONF_IO_WORKERS, DEFAULT_IO_WORKERS),
+        domain_config.get(CONF_CPU_WORKERS, DEFAULT_CPU_WORKERS),
+    )
+    async_setup_services(hass)
+
+    @callback
+    def _async_handle_stop(event: Event) -> None:
+        async_close_radar_downloader(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_handle_stop)
     return True
 
 
+def _unique_id_prefix(entry: ConfigEntry) -> str:
+    return f"{entry.entry_id}_"
+
+
+def _file_prefix(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """
+    Keep the unprefixed file names of single-entry installs for the first
+    entry, so existing dashboards and automations keep their paths.
+    """
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if not entries or entries[0].entry_id == entry.entry_id:
+        return ""
+    return _unique_id_prefix(entry)
+
+
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Prefix ids created before several entries could share the hub."""
+    prefix = _unique_id_prefix(entry)
+
+    @callback
+    def _migrate_entity(entity_entry: er.RegistryEntry):
+        if entity_entry.domain not in PLATFORMS or entity_entry.unique_id.startswith(
+            prefix
+        ):
+            return None
+        return {"new_unique_id": f"{prefix}{entity_entry.unique_id}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate_entity)
+
+    device_registry = dr.async_get(hass)
+    device_ids = [device["id"] for device in DATASET_DEVICES.values()]
+    for device_id in [*device_ids, RADAR_DEVICE_ID]:
+        device_entry = device_registry.async_get_device(identifiers={(device_id,)})
+        if device_entry is None or entry.entry_id not in device_entry.config_entries:
+            continue
+        device_registry.async_update_device(
+            device_entry.id, new_identifiers={(f"{prefix}{device_id}",)}
+        )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "image"])
+    await _async_migrate_unique_ids(hass, entry)
+    async_get_hub(hass).register(
+        entry.entry_id,
+        entry.data.get(CONF_LATITUDE, hass.config.latitude),
+        entry.data.get(CONF_LONGITUDE, hass.config.longitude),
+        entry.options.get(
+            CONF_DISTANCE_KM, entry.data.get(CONF_DISTANCE_KM, DEFAULT_DISTANCE_KM)
+        ),
+        _unique_id_prefix(entry),
+        _file_prefix(hass, entry),
+    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded:
+        async_release_hub(hass, entry.entry_id)
+    return unloaded
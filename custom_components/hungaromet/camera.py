@@ -0,0 +1,29 @@
+"""
+Home Assistant camera platform for HungaroMet radar frames.
+"""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import CONF_RADAR_CAMERA, DEFAULT_RADAR_CAMERA
+from .hub import async_get_hub
+from .radar_camera import HungarometRadarCamera
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+):
+    """
+    Set up the HungaroMet radar frame camera when enabled for the entry.
+    """
+    config = {**entry.data, **entry.options}
+    if config.get(CONF_RADAR_CAMERA, DEFAULT_RADAR_CAMERA):
+        location = async_get_hub(hass).locations[entry.entry_id]
+        async_add_entities(
+            [
+                HungarometRadarCamera(
+                    hass, unique_id_prefix=location.unique_id_prefix
+                )
+            ]
+        )
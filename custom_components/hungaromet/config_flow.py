@@ -2,11 +2,43 @@
 
 import logging
 
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.config_entries import ConfigFlow
-from homeassistant.const import CONF_NAME
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
 
-from .const import CONF_DISTANCE_KM, DEFAULT_DISTANCE_KM, DEFAULT_NAME, DOMAIN
+from .const import (
+    CONF_DISTANCE_KM,
+    CONF_RADAR_ARCHIVE_HOURS,
+    CONF_RADAR_ARCHIVE_MAX_MB,
+    CONF_RADAR_CAMERA,
+    CONF_RADAR_DOWNSCALE,
+    CONF_RADAR_FORMAT,
+    CONF_RADAR_NOWCAST,
+    CONF_RADAR_OVERLAY,
+    CONF_RADAR_PRODUCTS,
+    CONF_RADAR_RADIUS_KM,
+    CONF_RADAR_SENSOR_RADIUS_KM,
+    CONF_RADAR_SUBPROCESS,
+    CONF_RADAR_VARIANTS,
+    DEFAULT_DISTANCE_KM,
+    DEFAULT_NAME,
+    DEFAULT_RADAR_ARCHIVE_HOURS,
+    DEFAULT_RADAR_ARCHIVE_MAX_MB,
+    DEFAULT_RADAR_CAMERA,
+    DEFAULT_RADAR_DOWNSCALE,
+    DEFAULT_RADAR_FORMAT,
+    DEFAULT_RADAR_NOWCAST,
+    DEFAULT_RADAR_OVERLAY,
+    DEFAULT_RADAR_PRODUCTS,
+    DEFAULT_RADAR_RADIUS_KM,
+    DEFAULT_RADAR_SENSOR_RADIUS_KM,
+    DEFAULT_RADAR_SUBPROCESS,
+    DEFAULT_RADAR_VARIANTS,
+    DOMAIN,
+    RADAR_FORMATS,
+    RADAR_VARIANTS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +56,48 @@ class HungarometConfigFlow(ConfigFlow, domain=DOMAIN):
                     CONF_DISTANCE_KM: user_input.get(
                         CONF_DISTANCE_KM, DEFAULT_DISTANCE_KM
                     ),
+                    CONF_LATITUDE: user_input.get(
+                        CONF_LATITUDE, self.hass.config.latitude
+                    ),
+                    CONF_LONGITUDE: user_input.get(
+                        CONF_LONGITUDE, self.hass.config.longitude
+                    ),
+                    CONF_RADAR_RADIUS_KM: user_input.get(
+                        CONF_RADAR_RADIUS_KM, DEFAULT_RADAR_RADIUS_KM
+                    ),
+                    CONF_RADAR_DOWNSCALE: user_input.get(
+                        CONF_RADAR_DOWNSCALE, DEFAULT_RADAR_DOWNSCALE
+                    ),
+                    CONF_RADAR_FORMAT: user_input.get(
+                        CONF_RADAR_FORMAT, DEFAULT_RADAR_FORMAT
+                    ),
+                    CONF_RADAR_SUBPROCESS: user_input.get(
+                        CONF_RADAR_SUBPROCESS, DEFAULT_RADAR_SUBPROCESS
+                    ),
+                    CONF_RADAR_SENSOR_RADIUS_KM: user_input.get(
+                        CONF_RADAR_SENSOR_RADIUS_KM, DEFAULT_RADAR_SENSOR_RADIUS_KM
+                    ),
+                    CONF_RADAR_NOWCAST: user_input.get(
+                        CONF_RADAR_NOWCAST, DEFAULT_RADAR_NOWCAST
+                    ),
+                    CONF_RADAR_CAMERA: user_input.get(
+                        CONF_RADAR_CAMERA, DEFAULT_RADAR_CAMERA
+                    ),
+                    CONF_RADAR_ARCHIVE_HOURS: user_input.get(
+                        CONF_RADAR_ARCHIVE_HOURS, DEFAULT_RADAR_ARCHIVE_HOURS
+                    ),
+                    CONF_RADAR_ARCHIVE_MAX_MB: user_input.get(
+                        CONF_RADAR_ARCHIVE_MAX_MB, DEFAULT_RADAR_ARCHIVE_MAX_MB
+                    ),
+                    CONF_RADAR_OVERLAY: user_input.get(
+                        CONF_RADAR_OVERLAY, DEFAULT_RADAR_OVERLAY
+                    ),
+                    CONF_RADAR_VARIANTS: list(
+                        user_input.get(CONF_RADAR_VARIANTS, DEFAULT_RADAR_VARIANTS)
+                    ),
+                    CONF_RADAR_PRODUCTS: user_input.get(
+                        CONF_RADAR_PRODUCTS, DEFAULT_RADAR_PRODUCTS
+                    ),
                 },
             )
         return self.async_show_form(
@@ -33,6 +107,42 @@ class HungarometConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_DISTANCE_KM, default=DEFAULT_DISTANCE_KM): vol.All(
                     vol.Coerce(float), vol.Range(min=1, max=100)
                 ),
+                vol.Optional(
+                    CONF_LATITUDE, default=self.hass.config.latitude
+                ): cv.latitude,
+                vol.Optional(
+                    CONF_LONGITUDE, default=self.hass.config.longitude
+                ): cv.longitude,
+                vol.Optional(
+                    CONF_RADAR_RADIUS_KM, default=DEFAULT_RADAR_RADIUS_KM
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=500)),
+                vol.Optional(
+                    CONF_RADAR_DOWNSCALE, default=DEFAULT_RADAR_DOWNSCALE
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+                vol.Optional(
+                    CONF_RADAR_FORMAT, default=DEFAULT_RADAR_FORMAT
+                ): vol.In(RADAR_FORMATS),
+                vol.Optional(
+                    CONF_RADAR_SUBPROCESS, default=DEFAULT_RADAR_SUBPROCESS
+                ): bool,
+                vol.Optional(
+                    CONF_RADAR_SENSOR_RADIUS_KM, default=DEFAULT_RADAR_SENSOR_RADIUS_KM
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(CONF_RADAR_NOWCAST, default=DEFAULT_RADAR_NOWCAST): bool,
+                vol.Optional(CONF_RADAR_CAMERA, default=DEFAULT_RADAR_CAMERA): bool,
+                vol.Optional(
+                    CONF_RADAR_ARCHIVE_HOURS, default=DEFAULT_RADAR_ARCHIVE_HOURS
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=168)),
+                vol.Optional(
+                    CONF_RADAR_ARCHIVE_MAX_MB, default=DEFAULT_RADAR_ARCHIVE_MAX_MB
+                ): vol.All(vol.Coerce(int), vol.Range(min=16, max=10240)),
+                vol.Optional(CONF_RADAR_OVERLAY, default=DEFAULT_RADAR_OVERLAY): bool,
+                vol.Optional(
+                    CONF_RADAR_VARIANTS, default=DEFAULT_RADAR_VARIANTS
+                ): cv.multi_select(list(RADAR_VARIANTS)),
+                vol.Optional(
+                    CONF_RADAR_PRODUCTS, default=DEFAULT_RADAR_PRODUCTS
+                ): str,
             }),
             errors=errors,
         )
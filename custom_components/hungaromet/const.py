@@ -2,6 +2,45 @@ DOMAIN = "hungaromet"
 DEFAULT_NAME = "HungaroMet"
 CONF_DISTANCE_KM = "distance_km"
 DEFAULT_DISTANCE_KM = 20
+CONF_RADAR_RADIUS_KM = "radar_radius_km"
+CONF_RADAR_DOWNSCALE = "radar_downscale"
+CONF_RADAR_FORMAT = "radar_format"
+CONF_RADAR_SUBPROCESS = "radar_subprocess"
+CONF_RADAR_SENSOR_RADIUS_KM = "radar_sensor_radius_km"
+CONF_RADAR_NOWCAST = "radar_nowcast"
+CONF_RADAR_CAMERA = "radar_camera"
+CONF_RADAR_ARCHIVE_HOURS = "radar_archive_hours"
+CONF_RADAR_ARCHIVE_MAX_MB = "radar_archive_max_mb"
+CONF_RADAR_OVERLAY = "radar_overlay"
+CONF_RADAR_VARIANTS = "radar_variants"
+CONF_RADAR_PRODUCTS = "radar_products"
+# Integration-wide thread pools, set in the hungaromet: YAML section
+CONF_IO_WORKERS = "io_workers"
+CONF_CPU_WORKERS = "cpu_workers"
+# A radius of 0 keeps the whole composite
+DEFAULT_RADAR_RADIUS_KM = 0
+DEFAULT_RADAR_DOWNSCALE = 1
+DEFAULT_RADAR_FORMAT = "gif"
+RADAR_FORMATS = ("gif", "webp", "apng")
+# Smaller animations built next to the full one, each its own image entity
+RADAR_VARIANT_HALF = "half"
+RADAR_VARIANT_THUMBNAIL = "thumbnail"
+RADAR_VARIANTS = (RADAR_VARIANT_HALF, RADAR_VARIANT_THUMBNAIL)
+DEFAULT_RADAR_VARIANTS = ()
+# Comma separated products besides the default one, e.g. "composite/png/refl2D"
+DEFAULT_RADAR_PRODUCTS = ""
+DEFAULT_IO_WORKERS = 4
+# Encoding holds the GIL for most of its time, so more threads gain little
+DEFAULT_CPU_WORKERS = 2
+DEFAULT_RADAR_SUBPROCESS = False
+DEFAULT_RADAR_SENSOR_RADIUS_KM = 10
+DEFAULT_RADAR_NOWCAST = False
+DEFAULT_RADAR_CAMERA = False
+# Hours of radar frames kept on disk for time-lapses; 0 disables the archive
+DEFAULT_RADAR_ARCHIVE_HOURS = 0
+# A day of composites takes about 100 MB; the oldest frames go beyond this
+DEFAULT_RADAR_ARCHIVE_MAX_MB = 256
+DEFAULT_RADAR_OVERLAY = False
 
 URL_PROTOCOL = "https://"
 URL_BASE = "odp.met.hu"
@@ -12,4 +51,33 @@ URL_RADAR = f"{URL_PROTOCOL}{URL_BASE}/weather/radar"
 URL_DAILY = f"{URL_SYNOPTIC}/daily/csv/HABP_1D_LATEST.csv.zip"
 URL_HOURLY = f"{URL_SYNOPTIC}/hourly/csv/HABP_1H_SYNOP_LATEST.csv.zip"
 URL_TEN_MINUTES = f"{URL_SYNOPTIC}/10_minutes/csv/HABP_10M_SYNOP_LATEST.csv.zip"
-RADAR_BASE_URL = f"{URL_RADAR}/composite/png/refl2D_pscappi/"
+# Radar products are directories of timestamped PNGs under URL_RADAR
+RADAR_PRODUCT_DEFAULT = "composite/png/refl2D_pscappi"
+RADAR_BASE_URL = f"{URL_RADAR}/{RADAR_PRODUCT_DEFAULT}/"
+# Device shared by the radar image and camera entities
+RADAR_DEVICE_ID = "hungaromet_radar_gif"
+# Sent with the (name, PNG bytes) frames of every radar build of a device
+SIGNAL_RADAR_FRAMES = "hungaromet_radar_frames_{}"
+
+SERVICE_UPDATE = "update"
+SERVICE_RADAR_TIMELAPSE = "radar_timelapse"
+ATTR_DATASET = "dataset"
+ATTR_FORCE = "force"
+ATTR_HOURS = "hours"
+ATTR_FORMAT = "format"
+ATTR_ENTRY_ID = "entry_id"
+
+DATASET_DAILY = "daily"
+DATASET_HOURLY = "hourly"
+DATASET_TEN_MINUTES = "ten_minutes"
+DATASET_RADAR = "radar"
+DATASETS = (DATASET_DAILY, DATASET_HOURLY, DATASET_TEN_MINUTES, DATASET_RADAR)
+
+DATA_RADAR_IMAGES = "radar_images"
+DATA_RADAR_FRAMES = "radar_frames"
+DATA_RADAR_ARCHIVE = "radar_archive"
+DATA_RADAR_VIEW = "radar_view"
+DATA_RADAR_DOWNLOADER = "radar_downloader"
+DATA_EXECUTORS = "executors"
+DATA_SCHEDULER = "scheduler"
+DATA_HUB = "hub"
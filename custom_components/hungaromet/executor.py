@@ -0,0 +1,141 @@
+"""Thread pools owned by the integration instead of Home Assistant's executor."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+
+from .const import DATA_EXECUTORS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HungarometExecutor:
+    """
+    Small thread pool that counts the jobs waiting for a worker, so a
+    backlog shows up in the metrics instead of in the shared executor.
+    """
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"hungaromet_{name}"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.max_wait_ms = 0.0
+
+    def _call(self, claimed, submitted, func, args):
+        with self._lock:
+            if claimed[0]:
+                # The caller was cancelled and already counted the job out
+                return None
+            claimed[0] = True
+            self.queued -= 1
+            self.running += 1
+            self.max_wait_ms = max(
+                self.max_wait_ms, round((time.monotonic() - submitted) * 1000, 1)
+            )
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def async_run(self, func, *args):
+        """Run ``func(*args)`` on this pool and return its result."""
+        # Set by whichever of the worker and a cancelled caller is first
+        claimed = [False]
+        with self._lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._call, claimed, time.monotonic(), func, args
+            )
+        finally:
+            with self._lock:
+                if not claimed[0]:
+                    claimed[0] = True
+                    self.queued -= 1
+
+    def stats(self):
+        """Return the pool size and queue metrics."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass(frozen=True)
+class HungarometExecutors:
+    """Separate pools for waiting on the network and for CPU-bound work."""
+
+    io: HungarometExecutor
+    cpu: HungarometExecutor
+
+    def stats(self):
+        return {"io": self.io.stats(), "cpu": self.cpu.stats()}
+
+    def shutdown(self):
+        self.io.shutdown()
+        self.cpu.shutdown()
+
+
+def async_setup_executors(hass, io_workers, cpu_workers):
+    """Create the integration's pools, shut down with Home Assistant."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    executors = domain_data.get(DATA_EXECUTORS)
+    if executors is not None:
+        return executors
+    executors = domain_data[DATA_EXECUTORS] = HungarometExecutors(
+        io=HungarometExecutor("io", io_workers),
+        cpu=HungarometExecutor("cpu", cpu_workers),
+    )
+
+    def _shutdown(event):
+        executors.shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
+    _LOGGER.debug(
+        "HungaroMet executors: %s I/O and %s CPU workers", io_workers, cpu_workers
+    )
+    return executors
+
+
+def _executors(hass):
+    # Not created yet when a platform is set up without async_setup
+    return hass.data.get(DOMAIN, {}).get(DATA_EXECUTORS)
+
+
+async def async_run_io(hass, func, *args):
+    """Run blocking I/O such as downloads and file access off the event loop."""
+    executors = _executors(hass)
+    if executors is None:
+        return await hass.async_add_executor_job(func, *args)
+    return await executors.io.async_run(func, *args)
+
+
+async def async_run_cpu(hass, func, *args):
+    """Run parsing, aggregation and image work off the event loop."""
+    executors = _executors(hass)
+    if executors is None:
+        return await hass.async_add_executor_job(func, *args)
+    return await executors.cpu.async_run(func, *args)
@@ -0,0 +1,197 @@
+"""Domain-level hub sharing HungaroMet downloads between config entries."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_HUB,
+    DATA_RADAR_ARCHIVE,
+    DATA_RADAR_DOWNLOADER,
+    DATA_RADAR_FRAMES,
+    DATASET_DAILY,
+    DATASET_HOURLY,
+    DATASET_TEN_MINUTES,
+    DOMAIN,
+)
+from .executor import async_run_cpu, async_run_io
+from .weather_data import (
+    aggregate_daily_data,
+    aggregate_hourly_data,
+    aggregate_ten_minutes_data,
+    fetch_daily_frame,
+    fetch_hourly_frame,
+    fetch_ten_minutes_frame,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests arriving within this window share one download of a feed. It is
+# shorter than any update cadence, so every scheduled cycle fetches fresh data.
+FEED_MAX_AGE = timedelta(minutes=2)
+
+FEED_FETCHERS = {
+    DATASET_DAILY: fetch_daily_frame,
+    DATASET_HOURLY: fetch_hourly_frame,
+    DATASET_TEN_MINUTES: fetch_ten_minutes_frame,
+}
+
+FEED_AGGREGATORS = {
+    DATASET_DAILY: aggregate_daily_data,
+    DATASET_HOURLY: aggregate_hourly_data,
+    DATASET_TEN_MINUTES: aggregate_ten_minutes_data,
+}
+
+
+@dataclass
+class HungarometLocation:
+    """Reference point and radius registered by one config entry."""
+
+    hub: "HungarometHub"
+    key: str
+    latitude: float
+    longitude: float
+    distance_km: float
+    unique_id_prefix: str = ""
+    # Prefix of the files written for this location
+    file_prefix: str = ""
+    entities: list = field(default_factory=list)
+
+    async def async_get_data(self, dataset: str, force: bool = False):
+        """Return ``(data, station_info)`` of ``dataset`` for this location."""
+        return await self.hub.async_get_data(self, dataset, force)
+
+
+class HungarometHub:
+    """Fetch and parse each national feed once per cycle for all locations."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.locations: Dict[str, HungarometLocation] = {}
+        self._feeds: Dict[str, Tuple[float, Any]] = {}
+        self._views: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def refcount(self) -> int:
+        return len(self.locations)
+
+    def register(
+        self,
+        key: str,
+        latitude: float,
+        longitude: float,
+        distance_km: float,
+        unique_id_prefix: str = "",
+        file_prefix: str = "",
+    ) -> HungarometLocation:
+        location = HungarometLocation(
+            self,
+            key,
+            latitude,
+            longitude,
+            distance_km,
+            unique_id_prefix,
+            file_prefix,
+        )
+        self.locations[key] = location
+        self._drop_views(key)
+        _LOGGER.debug(
+            "HungaroMet hub: registered %s (%s locations)", key, self.refcount
+        )
+        return location
+
+    def unregister(self, key: str) -> bool:
+        """Forget a location; return True when it was the last one."""
+        self.locations.pop(key, None)
+        self._drop_views(key)
+        return not self.locations
+
+    def _drop_views(self, key: str) -> None:
+        for view_key in [view_key for view_key in self._views if view_key[0] == key]:
+            del self._views[view_key]
+
+    async def async_get_feed(self, dataset: str, force: bool = False):
+        """Return ``(fetched_at, frame)`` of a feed, downloading it if stale.
+
+        Concurrent callers wait for the same download instead of starting
+        their own.
+        """
+        lock = self._locks.setdefault(dataset, asyncio.Lock())
+        async with lock:
+            cached = self._feeds.get(dataset)
+            max_age = FEED_MAX_AGE.total_seconds()
+            if (
+                cached is not None
+                and not force
+                and time.monotonic() - cached[0] < max_age
+            ):
+                return cached
+            frame = await async_run_io(self.hass, FEED_FETCHERS[dataset])
+            self._feeds[dataset] = (time.monotonic(), frame)
+            return self._feeds[dataset]
+
+    async def async_get_data(
+        self, location: HungarometLocation, dataset: str, force: bool = False
+    ):
+        """Return the aggregated view of ``dataset`` for ``location``."""
+        fetched_at, frame = await self.async_get_feed(dataset, force)
+        view_key = (location.key, dataset)
+        view = self._views.get(view_key)
+        if view is not None and view[0] == fetched_at:
+            return view[1]
+        result = await async_run_cpu(
+            self.hass,
+            FEED_AGGREGATORS[dataset],
+            frame,
+            location.latitude,
+            location.longitude,
+            location.distance_km,
+        )
+        self._views[view_key] = (fetched_at, result)
+        return result
+
+    def shutdown(self) -> None:
+        self._feeds.clear()
+        self._views.clear()
+        self.locations.clear()
+
+
+def async_get_hub(hass: HomeAssistant) -> HungarometHub:
+    """Return the domain hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_HUB)
+    if hub is None:
+        hub = domain_data[DATA_HUB] = HungarometHub(hass)
+    return hub
+
+
+def async_release_hub(hass: HomeAssistant, key: str) -> None:
+    """
+    Unregister ``key`` and tear the hub and the shared radar state down after
+    the last location.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    hub = domain_data.get(DATA_HUB)
+    if hub is None:
+        return
+    if hub.unregister(key):
+        hub.shutdown()
+        del domain_data[DATA_HUB]
+        async_close_radar_downloader(hass)
+        # A later entry starts over with its own frames and archive options
+        domain_data.pop(DATA_RADAR_FRAMES, None)
+        domain_data.pop(DATA_RADAR_ARCHIVE, None)
+        _LOGGER.debug("HungaroMet hub: last location released, hub removed")
+
+
+def async_close_radar_downloader(hass: HomeAssistant) -> None:
+    """Close the radar session of ``hass``; the next radar entity opens another."""
+    downloader = hass.data.get(DOMAIN, {}).pop(DATA_RADAR_DOWNLOADER, None)
+    if downloader is not None:
+        downloader.close()
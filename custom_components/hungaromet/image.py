@@ -3,14 +3,48 @@ Home Assistant image platform for HungaroMet radar GIF.
 """
 
 import logging
+import re
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from .radar_gif_image import HungarometRadarImage
+
+from .const import (
+    CONF_RADAR_ARCHIVE_HOURS,
+    CONF_RADAR_ARCHIVE_MAX_MB,
+    CONF_RADAR_DOWNSCALE,
+    CONF_RADAR_FORMAT,
+    CONF_RADAR_NOWCAST,
+    CONF_RADAR_OVERLAY,
+    CONF_RADAR_PRODUCTS,
+    CONF_RADAR_RADIUS_KM,
+    CONF_RADAR_SUBPROCESS,
+    CONF_RADAR_VARIANTS,
+    DEFAULT_RADAR_ARCHIVE_HOURS,
+    DEFAULT_RADAR_ARCHIVE_MAX_MB,
+    DEFAULT_RADAR_DOWNSCALE,
+    DEFAULT_RADAR_FORMAT,
+    DEFAULT_RADAR_NOWCAST,
+    DEFAULT_RADAR_OVERLAY,
+    DEFAULT_RADAR_PRODUCTS,
+    DEFAULT_RADAR_RADIUS_KM,
+    DEFAULT_RADAR_SUBPROCESS,
+    DEFAULT_RADAR_VARIANTS,
+    RADAR_PRODUCT_DEFAULT,
+)
+from .hub import async_get_hub
+from .radar_frames import product_name
+from .radar_gif_image import HungarometRadarImage, HungarometRadarVariantImage
+from .radar_overlay import RadarOverlay
+from .radar_region import RadarRegion
+from .radar_view import async_register_radar_view
 
 _LOGGER = logging.getLogger(__name__)
 
+# Product directories below URL_RADAR, e.g. composite/png/refl2D
+_PRODUCT_RE = re.compile(r"^[A-Za-z0-9_.-]+(/[A-Za-z0-9_.-]+)*$")
+
 
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -28,9 +62,107 @@ async def async_setup_entry(
     """
     Set up the HungaroMet radar GIF image entity from a config entry.
     """
-    _setup_image_entities(hass, async_add_entities)
+    config = {**entry.data, **entry.options}
+    location = async_get_hub(hass).locations[entry.entry_id]
+    _setup_image_entities(
+        hass,
+        async_add_entities,
+        _entry_region(hass, entry),
+        config.get(CONF_RADAR_FORMAT, DEFAULT_RADAR_FORMAT),
+        config.get(CONF_RADAR_SUBPROCESS, DEFAULT_RADAR_SUBPROCESS),
+        config.get(CONF_RADAR_NOWCAST, DEFAULT_RADAR_NOWCAST),
+        config.get(CONF_RADAR_ARCHIVE_HOURS, DEFAULT_RADAR_ARCHIVE_HOURS),
+        config.get(CONF_RADAR_ARCHIVE_MAX_MB, DEFAULT_RADAR_ARCHIVE_MAX_MB),
+        _entry_overlay(hass, entry),
+        config.get(CONF_RADAR_VARIANTS, DEFAULT_RADAR_VARIANTS),
+        _entry_products(entry),
+        location.unique_id_prefix,
+        location.file_prefix,
+    )
+
+
+def _entry_region(hass, entry):
+    """Return the radar crop region configured for ``entry``, if any."""
+    config = {**entry.data, **entry.options}
+    radius_km = config.get(CONF_RADAR_RADIUS_KM, DEFAULT_RADAR_RADIUS_KM)
+    if not radius_km:
+        return None
+    return RadarRegion(
+        config.get(CONF_LATITUDE, hass.config.latitude),
+        config.get(CONF_LONGITUDE, hass.config.longitude),
+        radius_km,
+        config.get(CONF_RADAR_DOWNSCALE, DEFAULT_RADAR_DOWNSCALE),
+    )
 
 
-def _setup_image_entities(hass, async_add_entities):
-    entity = HungarometRadarImage(hass)
-    async_add_entities([entity], True)
+def _entry_overlay(hass, entry):
+    """Return the home location overlay of ``entry`` when enabled."""
+    config = {**entry.data, **entry.options}
+    if not config.get(CONF_RADAR_OVERLAY, DEFAULT_RADAR_OVERLAY):
+        return None
+    return RadarOverlay(
+        config.get(CONF_LATITUDE, hass.config.latitude),
+        config.get(CONF_LONGITUDE, hass.config.longitude),
+    )
+
+
+def _entry_products(entry):
+    """Return the radar products of ``entry`` besides the default one."""
+    config = {**entry.data, **entry.options}
+    products = []
+    for product in config.get(CONF_RADAR_PRODUCTS, DEFAULT_RADAR_PRODUCTS).split(","):
+        product = product.strip().strip("/")
+        if not product or product in products or product == RADAR_PRODUCT_DEFAULT:
+            continue
+        if not _PRODUCT_RE.match(product) or ".." in product.split("/"):
+            _LOGGER.warning("Ignoring invalid radar product %r", product)
+            continue
+        products.append(product)
+    return products
+
+
+def _setup_image_entities(
+    hass,
+    async_add_entities,
+    region=None,
+    image_format=DEFAULT_RADAR_FORMAT,
+    use_subprocess=DEFAULT_RADAR_SUBPROCESS,
+    nowcast=DEFAULT_RADAR_NOWCAST,
+    archive_hours=DEFAULT_RADAR_ARCHIVE_HOURS,
+    archive_max_mb=DEFAULT_RADAR_ARCHIVE_MAX_MB,
+    overlay=None,
+    variants=(),
+    products=(),
+    unique_id_prefix="",
+    file_prefix="",
+):
+    async_register_radar_view(hass)
+    # Next to the radar archive and time-lapses, served under /local/
+    output_dir = hass.config.path("www")
+    entities = []
+    for product in [RADAR_PRODUCT_DEFAULT, *products]:
+        entity = HungarometRadarImage(
+            hass,
+            name=(
+                "HungaroMet Radar"
+                if product == RADAR_PRODUCT_DEFAULT
+                else f"HungaroMet Radar {product_name(product)}"
+            ),
+            region=region,
+            image_format=image_format,
+            use_subprocess=use_subprocess,
+            nowcast=nowcast,
+            archive_hours=archive_hours,
+            archive_max_mb=archive_max_mb,
+            overlay=overlay,
+            variants=variants,
+            product=product,
+            unique_id_prefix=unique_id_prefix,
+            file_prefix=file_prefix,
+            output_dir=output_dir,
+        )
+        entities.append(entity)
+        entities.extend(
+            HungarometRadarVariantImage(entity, variant) for variant in variants
+        )
+    async_add_entities(entities, True)
@@ -0,0 +1,227 @@
+"""Rolling on-disk archive of radar frames and time-lapses built from it."""
+
+import logging
+import os
+import threading
+from datetime import timedelta
+
+import numpy as np
+
+try:
+    from .const import DATA_RADAR_ARCHIVE, DEFAULT_RADAR_ARCHIVE_MAX_MB, DOMAIN
+    from .radar_encoder import FORMAT_GIF, get_encoder
+    from .radar_frames import (
+        decode_frame,
+        encode_png,
+        frame_timestamp,
+        get_frame_store,
+    )
+    from .radar_region import apply_region
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from const import DATA_RADAR_ARCHIVE, DEFAULT_RADAR_ARCHIVE_MAX_MB, DOMAIN
+    from radar_encoder import FORMAT_GIF, get_encoder
+    from radar_frames import decode_frame, encode_png, frame_timestamp, get_frame_store
+    from radar_region import apply_region
+
+_LOGGER = logging.getLogger(__name__)
+
+# Below the configuration's www directory, next to the time-lapses and the
+# radar animations; entries after the first prefix it like their files
+ARCHIVE_DIRECTORY_NAME = "hungaromet_radar_archive"
+ARCHIVE_MAX_BYTES = DEFAULT_RADAR_ARCHIVE_MAX_MB * 1024 * 1024
+# Longer windows are sampled down to this many evenly spaced frames
+TIMELAPSE_MAX_FRAMES = 48
+TIMELAPSE_FRAME_MS = 200
+TIMELAPSE_END_DELAY_MS = 2000
+
+
+class RadarArchive:
+    """
+    Frames stored as PNG files named like the composites, kept for
+    ``retention`` behind the newest frame and within ``max_bytes``; the
+    oldest go first. Time-lapses are cached until the next frame arrives.
+    """
+
+    def __init__(
+        self,
+        directory,
+        retention=timedelta(hours=24),
+        max_bytes=ARCHIVE_MAX_BYTES,
+        region=None,
+        store=None,
+        file_prefix="",
+    ):
+        self.retention = retention
+        self.max_bytes = max_bytes
+        self.directory = directory
+        # Optional RadarRegion the time-lapses are cropped to
+        self.region = region
+        # Optional RadarFrameStore consulted before decoding from disk
+        self.store = store
+        # Prefix of the time-lapse files, as of the entry's other files
+        self.file_prefix = file_prefix
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        # name -> (timestamp, size in bytes), loaded from disk on first use
+        self._index = None
+        # Bumped by every new frame; time-lapses of older versions are stale
+        self._version = 0
+        self._timelapses = {}
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            timestamp = frame_timestamp(entry.name)
+            if timestamp is not None and entry.is_file():
+                self._index[entry.name] = (timestamp, entry.stat().st_size)
+        self.nbytes = sum(size for _, size in self._index.values())
+
+    def __len__(self):
+        with self._lock:
+            self._load_index()
+            return len(self._index)
+
+    def names(self):
+        """Return the archived frame names, oldest first."""
+        with self._lock:
+            self._load_index()
+            return sorted(self._index, key=lambda name: self._index[name][0])
+
+    def add(self, frames):
+        """
+        Write the timestamped ``frames`` not archived yet, then evict.
+        Returns the number of frames written.
+        """
+        written = 0
+        with self._lock:
+            self._load_index()
+            for frame in frames:
+                if frame.timestamp is None or frame.name in self._index:
+                    continue
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, frame.name)
+                data = encode_png(frame, compress_level=6)
+                # Readers never see a partially written frame
+                with open(path + ".tmp", "wb") as frame_file:
+                    frame_file.write(data)
+                os.replace(path + ".tmp", path)
+                self._index[frame.name] = (frame.timestamp, len(data))
+                self.nbytes += len(data)
+                written += 1
+            if written:
+                self._evict()
+                self._version += 1
+                self._timelapses.clear()
+        return written
+
+    def _evict(self):
+        ordered = sorted(self._index, key=lambda name: self._index[name][0])
+        cutoff = self._index[ordered[-1]][0] - self.retention
+        for name in ordered[:-1]:
+            if self._index[name][0] >= cutoff and self.nbytes <= self.max_bytes:
+                break
+            _, size = self._index.pop(name)
+            self.nbytes -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def _load(self, name):
+        # Recent frames are usually still decoded in the shared store
+        frame = self.store.get(name) if self.store is not None else None
+        if frame is not None:
+            return frame
+        with open(os.path.join(self.directory, name), "rb") as frame_file:
+            return decode_frame(name, frame_file.read())
+
+    def window(self, hours, max_frames=TIMELAPSE_MAX_FRAMES):
+        """
+        Return the names of at most ``max_frames`` evenly spaced frames of
+        the last ``hours`` before the newest frame, oldest first.
+        """
+        with self._lock:
+            self._load_index()
+            ordered = sorted(self._index, key=lambda name: self._index[name][0])
+            if not ordered:
+                return []
+            start = self._index[ordered[-1]][0] - timedelta(hours=hours)
+            names = [name for name in ordered if self._index[name][0] > start]
+        if len(names) > max_frames:
+            picks = np.linspace(0, len(names) - 1, max_frames).round().astype(int)
+            names = [names[pick] for pick in dict.fromkeys(picks.tolist())]
+        return names
+
+    def timelapse_path(self, hours, image_format=FORMAT_GIF):
+        """Return the file a time-lapse of the last ``hours`` is written to."""
+        extension = get_encoder(image_format).extension
+        return os.path.join(
+            os.path.dirname(self.directory),
+            f"{self.file_prefix}radar_timelapse_{hours:g}h.{extension}",
+        )
+
+    def timelapse(self, hours, image_format=FORMAT_GIF):
+        """
+        Return ``(data, frame count)`` of a time-lapse over the last
+        ``hours``, or None without archived frames. Built from the archive
+        only and reused until a new frame is added.
+        """
+        key = (hours, image_format)
+        with self._lock:
+            cached = self._timelapses.get(key)
+            version = self._version
+        if cached is not None:
+            return cached
+        frames = []
+        for name in self.window(hours):
+            try:
+                frames.append(self._load(name))
+            except FileNotFoundError:
+                # Evicted by a frame added since the window was listed
+                continue
+        if not frames:
+            return None
+        images = apply_region([frame.image() for frame in frames], self.region)
+        data = get_encoder(image_format).encode(
+            images, duration=TIMELAPSE_FRAME_MS, end_delay=TIMELAPSE_END_DELAY_MS
+        )
+        result = (data, len(frames))
+        with self._lock:
+            # A frame added meanwhile already invalidated this result
+            if version == self._version:
+                self._timelapses[key] = result
+        _LOGGER.debug(
+            "Radar time-lapse of %s h built from %s frames", hours, len(frames)
+        )
+        return result
+
+
+def get_radar_archive(
+    hass,
+    retention_hours,
+    region=None,
+    max_mb=DEFAULT_RADAR_ARCHIVE_MAX_MB,
+    file_prefix="",
+):
+    """
+    Return the radar archive of the entry whose files carry ``file_prefix``,
+    creating it on first use. Each entry keeps its own crop and retention.
+    """
+    archives = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_RADAR_ARCHIVE, {})
+    archive = archives.get(file_prefix)
+    if archive is None:
+        archive = archives[file_prefix] = RadarArchive(
+            hass.config.path("www", f"{file_prefix}{ARCHIVE_DIRECTORY_NAME}"),
+            retention=timedelta(hours=retention_hours),
+            max_bytes=max_mb * 1024 * 1024,
+            region=region,
+            store=get_frame_store(hass),
+            file_prefix=file_prefix,
+        )
+    return archive
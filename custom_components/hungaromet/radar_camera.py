@@ -0,0 +1,95 @@
+import itertools
+import logging
+
+from homeassistant.components.camera import Camera, async_get_still_stream
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import RADAR_DEVICE_ID, SIGNAL_RADAR_FRAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds each radar frame is shown in the frame stream
+FRAME_INTERVAL_SECONDS = 1.0
+
+
+# Motion detection and power switching do not apply to a radar feed
+class HungarometRadarCamera(Camera):  # pylint: disable=abstract-method
+    """
+    Camera serving the frames of the radar image one by one, never animated.
+    It lists and downloads nothing itself: every build of the radar image of
+    its device hands over the downloaded PNGs, which are served as they are.
+    """
+
+    _attr_frame_interval = FRAME_INTERVAL_SECONDS
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass,
+        name="HungaroMet Radar kamera",
+        unique_id_prefix="",
+    ):
+        super().__init__()
+        self.hass = hass
+        self.content_type = "image/png"
+        self._device_id = f"{unique_id_prefix}{RADAR_DEVICE_ID}"
+        self._attr_name = name
+        self._attr_unique_id = f"{unique_id_prefix}hungaromet_radar_camera"
+        self._attr_device_info = {
+            "identifiers": {(self._device_id,)},
+            "name": "HungaroMet Radar",
+            "manufacturer": "HungaroMet",
+            "model": "Radar Image",
+            "entry_type": "service",
+        }
+        # (name, PNG bytes) of the served frames, oldest first
+        self._frames = []
+
+    @property
+    def available(self) -> bool:
+        return bool(self._frames)
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "frames": [name for name, _ in self._frames],
+            "frame_interval": self.frame_interval,
+        }
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_RADAR_FRAMES.format(self._device_id),
+                self._async_handle_frames,
+            )
+        )
+
+    @callback
+    def _async_handle_frames(self, frames):
+        """Serve the frames of a new radar build."""
+        if frames == self._frames:
+            return
+        _LOGGER.debug("HungaroMet radar camera: %d new frames", len(frames))
+        self._frames = frames
+        self.async_write_ha_state()
+
+    async def async_camera_image(self, width=None, height=None):
+        """Return the newest radar frame."""
+        return self._frames[-1][1] if self._frames else None
+
+    async def handle_async_mjpeg_stream(self, request):
+        """Stream the cached frames in a loop, oldest to newest."""
+        position = itertools.count()
+
+        async def next_frame():
+            # Read on every step so a new frame joins the running stream
+            frames = self._frames
+            if not frames:
+                return None
+            return frames[next(position) % len(frames)][1]
+
+        return await async_get_still_stream(
+            request, next_frame, self.content_type, self.frame_interval
+        )
@@ -0,0 +1,59 @@
+"""HTTP session and request limit shared by every radar product."""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .const import DATA_RADAR_DOWNLOADER, DOMAIN
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from const import DATA_RADAR_DOWNLOADER, DOMAIN
+
+# Upper bound on simultaneous requests to the radar server, across products
+MAX_PARALLEL_REQUESTS = 4
+
+
+class RadarDownloader:
+    """
+    Requests for every radar product go through one pooled session and at
+    most ``max_parallel`` at a time, so another product adds requests to
+    the queue rather than a second burst.
+    """
+
+    def __init__(self, max_parallel=MAX_PARALLEL_REQUESTS):
+        self.max_parallel = max_parallel
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_parallel)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._slots = threading.BoundedSemaphore(max_parallel)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.request_count = 0
+
+    def get(self, url, timeout=None):
+        """Return the response to a GET of ``url`` once a slot is free."""
+        with self._slots:
+            with self._lock:
+                self.in_flight += 1
+                self.request_count += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                return self.session.get(url, timeout=timeout)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+    def close(self):
+        self.session.close()
+
+
+def get_radar_downloader(hass):
+    """Return the downloader shared by the radar entities of ``hass``."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    downloader = domain_data.get(DATA_RADAR_DOWNLOADER)
+    if downloader is None:
+        downloader = domain_data[DATA_RADAR_DOWNLOADER] = RadarDownloader()
+    return downloader
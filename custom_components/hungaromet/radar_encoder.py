@@ -0,0 +1,275 @@
+"""Encoding of radar frames into compact animations."""
+
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable
+
+import numpy as np
+from PIL import Image, features
+
+_LOGGER = logging.getLogger(__name__)
+
+# One palette slot stays free so unchanged pixels can be marked transparent
+PALETTE_COLORS = 255
+TRANSPARENT_INDEX = 255
+# Frames with more colours are sampled every this many pixels in both
+# directions, keeping real colours rather than averaged ones
+PALETTE_SAMPLE_STRIDE = 4
+
+FORMAT_GIF = "gif"
+FORMAT_WEBP = "webp"
+FORMAT_APNG = "apng"
+
+# Lossless keeps radar colours exact; low effort already beats GIF in size
+WEBP_OPTIONS = {"lossless": True, "quality": 50, "method": 2}
+
+
+def _exact_colors(images):
+    """
+    Return the sorted packed RGB colours used across ``images``, or None
+    when there are more than fit the palette.
+    """
+    colors = set()
+    for image in images:
+        used = image.convert("RGB").getcolors(PALETTE_COLORS)
+        if used is None:
+            return None
+        colors.update(color for _, color in used)
+        if len(colors) > PALETTE_COLORS:
+            return None
+    return np.array(
+        sorted((red << 16) | (green << 8) | blue for red, green, blue in colors),
+        dtype=np.uint32,
+    )
+
+
+def _packed(image):
+    rgb = np.asarray(image.convert("RGB"), dtype=np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _palette_image(colors):
+    palette = Image.new("P", (1, 1))
+    palette.putpalette(
+        np.stack([colors >> 16, (colors >> 8) & 0xFF, colors & 0xFF], axis=1)
+        .astype(np.uint8)
+        .ravel()
+        .tolist()
+    )
+    return palette
+
+
+def _map_exact(images, colors):
+    """Index every pixel by its own colour in ``colors``, losing nothing."""
+    palette = _palette_image(colors).getpalette()
+    frames = []
+    for image in images:
+        frame = Image.fromarray(
+            np.searchsorted(colors, _packed(image)).astype(np.uint8), "P"
+        )
+        frame.putpalette(palette)
+        frames.append(frame)
+    return frames
+
+
+def build_shared_palette(images):
+    """
+    Return a P-mode image whose palette fits every frame. When the frames
+    use at most ``PALETTE_COLORS`` colours together, those exact colours
+    are the palette. Otherwise the median cut runs once on a strided
+    montage of real pixels of all frames.
+    """
+    colors = _exact_colors(images)
+    if colors is not None:
+        return _palette_image(colors)
+    return _sampled_palette(images)
+
+
+def _sampled_palette(images):
+    samples = [
+        Image.fromarray(
+            np.asarray(image.convert("RGB"))[
+                ::PALETTE_SAMPLE_STRIDE, ::PALETTE_SAMPLE_STRIDE
+            ]
+        )
+        for image in images
+    ]
+    width = max(sample.width for sample in samples)
+    montage = Image.new("RGB", (width, sum(sample.height for sample in samples)))
+    top = 0
+    for sample in samples:
+        montage.paste(sample, (0, top))
+        top += sample.height
+    return montage.quantize(
+        colors=PALETTE_COLORS,
+        method=Image.Quantize.MEDIANCUT,
+        dither=Image.Dither.NONE,
+    )
+
+
+def _common_palette(images):
+    """Return the palette all ``images`` already share, or None."""
+    if not images or any(image.mode != "P" for image in images):
+        return None
+    palette = images[0].getpalette()
+    for image in images:
+        if image.getpalette() != palette:
+            return None
+        if int(np.asarray(image).max()) >= TRANSPARENT_INDEX:
+            return None
+    return palette
+
+
+def quantize_frames(images, palette=None):
+    """
+    Map every frame onto one shared palette without dithering. Frames
+    decoded from the same palette PNG product are reused as they are, and
+    frames using at most ``PALETTE_COLORS`` colours keep them exactly.
+    """
+    colors = None
+    if palette is None:
+        if _common_palette(images) is not None:
+            return _with_transparent_slot([image.copy() for image in images])
+        colors = _exact_colors(images)
+    if colors is not None:
+        frames = _map_exact(images, colors)
+    else:
+        if palette is None:
+            palette = _sampled_palette(images)
+        frames = [
+            image.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+            for image in images
+        ]
+    return _with_transparent_slot(frames)
+
+
+def _with_transparent_slot(frames):
+    # Give the transparent index a palette entry; PNG drops tRNS entries
+    # beyond the end of the palette
+    colors = frames[0].getpalette() if frames else []
+    colors = colors + [0, 0, 0] * (TRANSPARENT_INDEX + 1 - len(colors) // 3)
+    for frame in frames:
+        frame.info.pop("transparency", None)
+        frame.putpalette(colors)
+    return frames
+
+
+def diff_frames(frames):
+    """
+    Replace pixels that did not change since the previous frame with the
+    transparent index. The GIF writer then only stores the bounding box of
+    what changed, and unchanged pixels compress to long runs.
+    """
+    if not frames:
+        return []
+    palette = frames[0].getpalette()
+    result = [frames[0]]
+    previous = np.asarray(frames[0])
+    for frame in frames[1:]:
+        current = np.asarray(frame)
+        if current.shape != previous.shape:
+            result.append(frame)
+        else:
+            delta = Image.fromarray(
+                np.where(current == previous, TRANSPARENT_INDEX, current).astype(
+                    np.uint8
+                ),
+                "P",
+            )
+            delta.putpalette(palette)
+            result.append(delta)
+        previous = current
+    return result
+
+
+def _durations(count, duration, end_delay):
+    return [duration] * (count - 1) + [end_delay]
+
+
+def encode_gif(images, duration=1000, end_delay=3000):
+    """
+    Encode ``images`` into an animated GIF with a shared palette and
+    frame-difference compression. The last frame is shown for ``end_delay``.
+    """
+    frames = diff_frames(quantize_frames(images))
+    buffer = BytesIO()
+    frames[0].save(
+        buffer,
+        format="GIF",
+        save_all=True,
+        append_images=frames[1:],
+        duration=_durations(len(frames), duration, end_delay),
+        loop=0,
+        transparency=TRANSPARENT_INDEX,
+        # Keep each frame in place so transparent pixels show the previous one
+        disposal=1,
+    )
+    return buffer.getvalue()
+
+
+def encode_apng(images, duration=1000, end_delay=3000):
+    """Encode ``images`` into an animated PNG using the same frame differences."""
+    frames = diff_frames(quantize_frames(images))
+    buffer = BytesIO()
+    frames[0].save(
+        buffer,
+        format="PNG",
+        save_all=True,
+        append_images=frames[1:],
+        duration=_durations(len(frames), duration, end_delay),
+        loop=0,
+        transparency=TRANSPARENT_INDEX,
+        disposal=0,
+        # Composite over the previous frame so transparent pixels keep it
+        blend=1,
+    )
+    return buffer.getvalue()
+
+
+def encode_webp(images, duration=1000, end_delay=3000):
+    """
+    Encode ``images`` into a lossless animated WebP. libwebp finds the changed
+    rectangles itself, so frames are only mapped to the shared palette.
+    """
+    frames = [frame.convert("RGB") for frame in quantize_frames(images)]
+    buffer = BytesIO()
+    frames[0].save(
+        buffer,
+        format="WEBP",
+        save_all=True,
+        append_images=frames[1:],
+        duration=_durations(len(frames), duration, end_delay),
+        loop=0,
+        **WEBP_OPTIONS,
+    )
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True)
+class AnimationEncoder:
+    """Animation format the radar frames can be encoded into."""
+
+    content_type: str
+    extension: str
+    encode: Callable[..., bytes]
+
+
+ENCODERS = {
+    FORMAT_GIF: AnimationEncoder("image/gif", "gif", encode_gif),
+    FORMAT_WEBP: AnimationEncoder("image/webp", "webp", encode_webp),
+    FORMAT_APNG: AnimationEncoder("image/apng", "png", encode_apng),
+}
+
+
+def get_encoder(image_format):
+    """Return the encoder of ``image_format``, falling back to GIF."""
+    encoder = ENCODERS.get(image_format)
+    if encoder is None or (
+        image_format == FORMAT_WEBP and not features.check("webp")
+    ):
+        _LOGGER.warning(
+            "Radar animation format %s is not available; using GIF", image_format
+        )
+        return ENCODERS[FORMAT_GIF]
+    return encoder
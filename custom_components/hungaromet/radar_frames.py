@@ -0,0 +1,158 @@
+"""Decode-once store of radar frames shared by all radar consumers."""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+try:
+    from .const import DATA_RADAR_FRAMES, DOMAIN
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from const import DATA_RADAR_FRAMES, DOMAIN
+
+# Enough for about 20 full 1024x768 composites
+FRAME_STORE_MAX_BYTES = 16 * 1024 * 1024
+
+# Composite file names end in the UTC time they show, e.g. ..._20240101_1205.png
+_FRAME_TIME_RE = re.compile(r"(\d{8})_?(\d{4})\.png$", re.IGNORECASE)
+
+
+def frame_timestamp(name):
+    """Return the UTC time encoded in a frame file name, or None."""
+    match = _FRAME_TIME_RE.search(name)
+    if match is None:
+        return None
+    try:
+        return datetime.strptime("".join(match.groups()), "%Y%m%d%H%M").replace(
+            tzinfo=timezone.utc
+        )
+    except ValueError:
+        return None
+
+
+def frame_product(name):
+    """Return the product prefix of a frame file name, e.g. refl2D_pscappi."""
+    match = _FRAME_TIME_RE.search(name)
+    return name[: match.start()].rstrip("_") if match else None
+
+
+def product_name(product):
+    """Return the short name of a product path, e.g. refl2D_pscappi."""
+    return product.strip("/").rsplit("/", 1)[-1]
+
+
+@dataclass(frozen=True, eq=False)
+class RadarFrame:
+    """One decoded composite as palette indices plus its palette."""
+
+    name: str
+    timestamp: Optional[datetime]
+    indices: np.ndarray
+    palette: bytes
+    transparency: Optional[object] = None
+
+    @property
+    def size(self):
+        return self.indices.shape[1], self.indices.shape[0]
+
+    @property
+    def nbytes(self):
+        return self.indices.nbytes + len(self.palette)
+
+    def image(self):
+        """Return the frame as a P-mode image sharing the index array."""
+        image = Image.fromarray(self.indices, "P")
+        image.putpalette(self.palette)
+        if self.transparency is not None:
+            image.info["transparency"] = self.transparency
+        return image
+
+
+def decode_frame(name, data):
+    """Decode PNG ``data`` once into a RadarFrame."""
+    with Image.open(BytesIO(data)) as image:
+        if image.mode != "P":
+            # Composites are palette PNGs; map anything else onto one
+            image = image.convert("RGB").quantize(
+                colors=256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE
+            )
+        indices = np.array(image, dtype=np.uint8)
+        palette = bytes(image.getpalette())
+        transparency = image.info.get("transparency")
+    indices.setflags(write=False)
+    return RadarFrame(name, frame_timestamp(name), indices, palette, transparency)
+
+
+def encode_png(frame, compress_level=1):
+    """Return ``frame`` as a palette PNG, by default favouring speed over size."""
+    buffer = BytesIO()
+    frame.image().save(buffer, format="PNG", compress_level=compress_level)
+    return buffer.getvalue()
+
+
+class RadarFrameStore:
+    """
+    LRU store of decoded frames keyed by file name, bounded in bytes. Shared
+    by every radar consumer, so all access holds a lock.
+    """
+
+    def __init__(self, max_bytes=FRAME_STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._frames = OrderedDict()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._frames
+
+    def get(self, name):
+        with self._lock:
+            frame = self._frames.get(name)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(name)
+            self.hits += 1
+            return frame
+
+    def frames(self, product=None):
+        """Return a snapshot of the stored frames, optionally of one product."""
+        with self._lock:
+            frames = list(self._frames.values())
+        if product is None:
+            return frames
+        return [frame for frame in frames if frame_product(frame.name) == product]
+
+    def put(self, frame):
+        with self._lock:
+            previous = self._frames.pop(frame.name, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._frames[frame.name] = frame
+            self.nbytes += frame.nbytes
+            # The newest frame always stays, even when it alone exceeds the bound
+            while self.nbytes > self.max_bytes and len(self._frames) > 1:
+                _, evicted = self._frames.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+
+def get_frame_store(hass):
+    """Return the frame store shared by every radar consumer of ``hass``."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get(DATA_RADAR_FRAMES)
+    if store is None:
+        store = domain_data[DATA_RADAR_FRAMES] = RadarFrameStore()
+    return store
@@ -1,109 +1,434 @@
+import hashlib
+import heapq
 import logging
 import os
-from io import BytesIO
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 
 import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-from PIL import Image
 
 _LOGGER = logging.getLogger(__name__)
 REQUEST_TIMEOUT = 10
+# Upper bound on simultaneous frame requests sent to the radar server
+MAX_PARALLEL_DOWNLOADS = 4
+
+# Links to radar frames in the Apache-style directory listing
+_PNG_HREF_RE = re.compile(r"""(?i:href)\s*=\s*["']([^"'<>]+\.png)["']""")
+
+RADAR_UPDATED = "updated"
+RADAR_UNCHANGED = "unchanged"
+RADAR_FAILED = "failed"
 
 try:
     from .const import RADAR_BASE_URL
+    from .radar_encoder import FORMAT_GIF, get_encoder
+    from .radar_frames import RadarFrameStore, decode_frame, encode_png
+    from .radar_nowcast import forecast_frames
+    from .radar_overlay import apply_overlay
+    from .radar_region import apply_region, apply_variant
 except ImportError:  # pragma: no cover - standalone CLI usage
     from const import RADAR_BASE_URL
+    from radar_encoder import FORMAT_GIF, get_encoder
+    from radar_frames import RadarFrameStore, decode_frame, encode_png
+    from radar_nowcast import forecast_frames
+    from radar_overlay import apply_overlay
+    from radar_region import apply_region, apply_variant
+
+
+def frame_name(url):
+    return url.rsplit("/", 1)[-1]
+
+
+def parse_listing(html, count):
+    """
+    Return the ``count`` latest PNG names linked from a directory listing,
+    oldest first. Frame names sort chronologically, so only the top
+    ``count`` are selected instead of sorting the whole listing.
+    """
+    names = {match.group(1) for match in _PNG_HREF_RE.finditer(html)}
+    return sorted(heapq.nlargest(count, names))
 
 
-def get_latest_image_urls(base_url, count=12):
-    response = requests.get(base_url, timeout=REQUEST_TIMEOUT)
+def get_latest_image_urls(base_url, count=12, downloader=None):
+    # A shared RadarDownloader pools connections and bounds requests
+    http = downloader if downloader is not None else requests
+    response = http.get(base_url, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    png_files = []
-    for a in soup.find_all("a"):
-        if isinstance(a, Tag):
-            href = a.get("href")
-            if isinstance(href, str) and href.endswith(".png"):
-                png_files.append(href)
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_png_files = []
-    for fname in png_files:
-        if fname not in seen:
-            unique_png_files.append(fname)
-            seen.add(fname)
-    unique_png_files.sort(reverse=True)
-
-    latest_files = unique_png_files[:count]
-    latest_files.sort()
-    return [base_url + fname for fname in latest_files]
-
-
-def download_images(urls):
-    images = []
-    for url in urls:
-        try:
-            response = requests.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            img = Image.open(BytesIO(response.content))
-            images.append(img)
-        except requests.RequestException as err:
-            _LOGGER.error("Failed to download %s: %s", url, err)
-    return images
+    return [base_url + fname for fname in parse_listing(response.text, count)]
 
 
-def create_gif(images, output_path, duration=1000, end_delay=3000):
+@dataclass
+class RadarDownload:
+    """
+    Listed radar frames: those already decoded in the store and the PNG
+    bytes of the others, downloaded but not yet decoded.
+    """
+
+    urls: list
+    cached: dict = field(default_factory=dict)
+    downloaded: dict = field(default_factory=dict)
+
+    @property
+    def newest(self):
+        return frame_name(self.urls[-1])
+
+    def decode(self, store=None, decoder=decode_frame):
+        """
+        Decode the downloaded frames into ``store`` and return every frame
+        in the order of ``urls``; failed downloads are left out.
+        """
+        frames = dict(self.cached)
+        for url, content in self.downloaded.items():
+            frame = frames[url] = decoder(frame_name(url), content)
+            if store is not None:
+                store.put(frame)
+        return [frames[url] for url in self.urls if url in frames]
+
+
+def _download_frame(url, timeout=REQUEST_TIMEOUT, http=requests):
+    try:
+        response = http.get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as err:
+        _LOGGER.error("Failed to download %s: %s", url, err)
+        return None
+    return response.content
+
+
+def download_missing(
+    urls,
+    max_workers=MAX_PARALLEL_DOWNLOADS,
+    timeout=REQUEST_TIMEOUT,
+    store=None,
+    downloader=None,
+):
+    """
+    Download the radar frames not yet in ``store`` concurrently, at most
+    ``max_workers`` at a time, without decoding them, so the waiting and
+    the decoding can run on different pools. Requests go through
+    ``downloader`` when given, which also bounds them across products.
+    """
+    download = RadarDownload(list(urls))
+    missing = []
+    for url in download.urls:
+        frame = store.get(frame_name(url)) if store is not None else None
+        if frame is None:
+            missing.append(url)
+        else:
+            download.cached[url] = frame
+    if missing:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(missing))),
+            thread_name_prefix="hungaromet_radar",
+        ) as executor:
+            contents = executor.map(
+                partial(
+                    _download_frame,
+                    timeout=timeout,
+                    http=downloader if downloader is not None else requests,
+                ),
+                missing,
+            )
+            for url, content in zip(missing, contents):
+                if content is not None:
+                    download.downloaded[url] = content
+    return download
+
+
+def download_images(
+    urls,
+    max_workers=MAX_PARALLEL_DOWNLOADS,
+    timeout=REQUEST_TIMEOUT,
+    store=None,
+    decoder=decode_frame,
+    downloader=None,
+):
+    """
+    Download and decode radar frames, see ``download_missing``. Frames
+    already in ``store`` are reused and the others are added to it.
+    Returns RadarFrames in the order of ``urls``; failed downloads are
+    left out.
+    """
+    download = download_missing(urls, max_workers, timeout, store, downloader)
+    return download.decode(store, decoder)
+
+
+def fetch_download(store, count=6, downloader=None):
+    """
+    List the ``count`` latest radar frames and download those not yet in
+    ``store``. Returns None when the listing has no frames.
     """
-    Create a GIF from a list of PIL Images.
+    urls = get_latest_image_urls(RADAR_BASE_URL, count=count, downloader=downloader)
+    if not urls:
+        return None
+    return download_missing(urls, store=store, downloader=downloader)
+
+
+def create_animation(
+    images, output_path, image_format=FORMAT_GIF, duration=1000, end_delay=3000
+):
+    """
+    Create an animation in ``image_format`` from a list of PIL Images.
     The last frame will have a longer delay (end_delay).
+    Returns the encoded bytes, or None when nothing was written.
     """
     try:
         if not images:
-            _LOGGER.error("No images to create GIF.")
-            return
-        durations = [duration] * (len(images) - 1) + [end_delay]
-        images[0].save(
-            output_path,
-            save_all=True,
-            append_images=images[1:],
-            duration=durations,
-            loop=0,
-        )
+            _LOGGER.error("No images to create %s.", image_format)
+            return None
+        encoder = get_encoder(image_format)
+        data = encoder.encode(images, duration=duration, end_delay=end_delay)
+        write_animation(data, output_path)
         _LOGGER.info(
-            "GIF saved to %s (frames: %s, end delay: %s ms)",
+            "%s saved to %s (frames: %s, end delay: %s ms)",
+            encoder.content_type,
             output_path,
             len(images),
             end_delay,
         )
+        return data
     except Exception as err:  # pragma: no cover - defensive logging
-        _LOGGER.error("Error creating GIF: %s", err)
+        _LOGGER.error("Error creating %s: %s", image_format, err)
+        return None
 
 
-def update_radar_gif():
+def write_animation(data, output_path):
+    """
+    Write ``data`` to ``output_path`` through a temporary file in the same
+    directory, so readers see either the old or the new file, never a part.
+    """
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(output_path) or ".",
+        prefix=f".{os.path.basename(output_path)}.",
+        suffix=".tmp",
+    )
     try:
-        urls = get_latest_image_urls(RADAR_BASE_URL, count=6)
-        if not urls:
-            _LOGGER.error("No radar image URLs found. GIF not updated.")
-            return
-        images = download_images(urls)
-        if not images:
-            _LOGGER.error("No radar images downloaded. GIF not updated.")
-            return
-        www_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "www")
-        if not os.path.exists(www_dir):
-            os.makedirs(www_dir)
-        output_gif = os.path.join(www_dir, "radar_animation.gif")
-        create_gif(images, output_gif, duration=1000, end_delay=3000)
-        frame_count = len(images)
-        _LOGGER.info("Radar GIF updated at %s with %s frames.", output_gif, frame_count)
-        print(f"Radar GIF updated at {output_gif} with {frame_count} frames.")
-    except requests.RequestException as err:
-        _LOGGER.error("Network error updating radar GIF: %s", err)
-    except Exception as err:  # pragma: no cover - defensive logging
-        _LOGGER.error("Exception in update_radar_gif: %s", err)
+        with os.fdopen(descriptor, "wb") as animation_file:
+            animation_file.write(data)
+        # mkstemp creates the file readable by the owner only
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, output_path)
+    except OSError:
+        os.unlink(temp_path)
+        raise
+
+
+def content_etag(data):
+    """Return a short hash of ``data`` that changes whenever its bytes do."""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def create_gif(images, output_path, duration=1000, end_delay=3000):
+    """Create a GIF from a list of PIL Images, see ``create_animation``."""
+    return create_animation(images, output_path, FORMAT_GIF, duration, end_delay)
+
+
+class RadarGifUpdater:
+    """Rebuild the radar animation, skipping cycles without a new composite."""
+
+    def __init__(
+        self,
+        frame_count=6,
+        region=None,
+        image_format=FORMAT_GIF,
+        worker=None,
+        store=None,
+        nowcast=False,
+        archive=None,
+        overlay=None,
+        variants=(),
+        base_url=RADAR_BASE_URL,
+        output_name="radar_animation",
+        downloader=None,
+        output_dir=None,
+    ):
+        self.frame_count = frame_count
+        # Listing of the radar product this animation shows
+        self.base_url = base_url
+        # Optional RadarDownloader shared with the other radar products
+        self.downloader = downloader
+        # Optional RadarRegion the frames are cropped to before encoding
+        self.region = region
+        self.image_format = image_format
+        self.encoder = get_encoder(image_format)
+        # Home Assistant passes its configuration's www directory; the
+        # standalone CLI writes next to the package
+        if output_dir is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "www")
+        self.output_path = os.path.join(
+            output_dir, f"{output_name}.{self.encoder.extension}"
+        )
+        # Optional RadarEncodeWorker that decodes and encodes in its process
+        # from PNG bytes, keeping its own decoded frames
+        self.worker = worker
+        # Decoded frames, shared with the other radar consumers when given
+        self.frame_store = store if store is not None else RadarFrameStore()
+        # Append nowcast frames extrapolated from the downloaded ones
+        self.nowcast = nowcast
+        # Optional RadarArchive every downloaded frame is kept in
+        self.archive = archive
+        # Optional RadarOverlay drawn over every frame
+        self.overlay = overlay
+        # Names of the smaller animations built from the same frames
+        self.variants = tuple(variants)
+        # variant -> (bytes, etag) of the last smaller animations
+        self.variant_outputs = {}
+        self.last_frame = None
+        # name -> downloaded PNG bytes of the frames of the last build
+        self.pngs = {}
+        # Encoded bytes of the last animation, served without touching the disk
+        self.gif_bytes = None
+        # Content hash of gif_bytes, hashed here rather than in the event loop
+        self.etag = None
+
+    def update(self, force=False):
+        """
+        Return RADAR_UPDATED when a new GIF was written, RADAR_UNCHANGED when
+        the newest published frame is already in the last GIF and
+        RADAR_FAILED otherwise. ``force`` rebuilds even without a new frame.
+        """
+        status, download = self.fetch(force)
+        if status != RADAR_UPDATED:
+            return status
+        return self.build(download)
+
+    def fetch(self, force=False):
+        """
+        List and download the frames of the next animation, the network half
+        of ``update``. Returns ``(status, download)``; the download is only
+        given with RADAR_UPDATED and is handed to ``build``.
+        """
+        try:
+            urls = get_latest_image_urls(
+                self.base_url, count=self.frame_count, downloader=self.downloader
+            )
+            if not urls:
+                _LOGGER.error("No radar image URLs found. GIF not updated.")
+                return RADAR_FAILED, None
+            newest = frame_name(urls[-1])
+            if newest == self.last_frame and not force:
+                _LOGGER.debug("No new radar frame since %s. GIF not rebuilt.", newest)
+                return RADAR_UNCHANGED, None
+            return RADAR_UPDATED, download_missing(
+                urls, store=self.frame_store, downloader=self.downloader
+            )
+        except requests.RequestException as err:
+            _LOGGER.error("Network error updating radar GIF: %s", err)
+        except Exception as err:  # pragma: no cover - defensive logging
+            _LOGGER.error("Exception in update_radar_gif: %s", err)
+        return RADAR_FAILED, None
+
+    def build(self, download):
+        """
+        Decode ``download`` and encode and write the animations, the CPU
+        half of ``update``. Returns RADAR_UPDATED or RADAR_FAILED.
+        """
+        try:
+            frames = download.decode(self.frame_store)
+            if not frames:
+                _LOGGER.error("No radar images downloaded. GIF not updated.")
+                return RADAR_FAILED
+            downloaded = {
+                frame_name(url): content for url, content in download.downloaded.items()
+            }
+            # Frames decoded before this updater saw them are encoded once
+            self.pngs = {
+                frame.name: downloaded.get(frame.name)
+                or self.pngs.get(frame.name)
+                or encode_png(frame)
+                for frame in frames
+            }
+            if self.archive is not None:
+                self.archive.add(frames)
+            www_dir = os.path.dirname(self.output_path)
+            if not os.path.exists(www_dir):
+                os.makedirs(www_dir)
+            paths = [self.output_path] + [
+                self.variant_path(variant) for variant in self.variants
+            ]
+            animations = None
+            if self.worker is not None:
+                animations = self.worker.build_animations(
+                    self.pngs.items(),
+                    self.image_format,
+                    self.region,
+                    1000,
+                    3000,
+                    self.overlay,
+                    self.variants,
+                    self.nowcast,
+                )
+                if animations is None:
+                    _LOGGER.warning("Encoding the radar animation in process")
+                else:
+                    for data, path in zip(animations, paths):
+                        if data is not None:
+                            write_animation(data, path)
+            if animations is None:
+                if self.nowcast:
+                    frames = frames + forecast_frames(frames)
+                images = apply_overlay(
+                    apply_region([frame.image() for frame in frames], self.region),
+                    self.overlay,
+                    self.region,
+                    frames[0].size,
+                )
+                # Every size is reduced from the frames cropped once above
+                animations = [
+                    create_animation(
+                        scaled,
+                        path,
+                        self.image_format,
+                        duration=1000,
+                        end_delay=3000,
+                    )
+                    for scaled, path in zip(
+                        [images]
+                        + [apply_variant(images, name) for name in self.variants],
+                        paths,
+                    )
+                ]
+            gif_bytes = animations[0]
+            if gif_bytes is None:
+                return RADAR_FAILED
+            self.gif_bytes = gif_bytes
+            self.etag = content_etag(gif_bytes)
+            self.variant_outputs = {
+                variant: (data, content_etag(data))
+                for variant, data in zip(self.variants, animations[1:])
+                if data is not None
+            }
+            self.last_frame = download.newest
+            frame_count = len(frames)
+            _LOGGER.info(
+                "Radar animation updated at %s with %s frames.",
+                self.output_path,
+                frame_count,
+            )
+            return RADAR_UPDATED
+        except Exception as err:  # pragma: no cover - defensive logging
+            _LOGGER.error("Exception in update_radar_gif: %s", err)
+        return RADAR_FAILED
+
+    def variant_path(self, variant):
+        """Return the file the ``variant`` animation is written to."""
+        root, extension = os.path.splitext(self.output_path)
+        return f"{root}_{variant}{extension}"
+
+    def close(self):
+        """Stop the encode worker process, if any."""
+        if self.worker is not None:
+            self.worker.shutdown()
+
+
+def update_radar_gif():
+    status = RadarGifUpdater().update()
+    if status == RADAR_UPDATED:
+        print("Radar GIF updated.")
+    return status
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,42 +1,116 @@
 import logging
 import os
-from datetime import datetime
 
 from homeassistant.components.image import ImageEntity
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
 
-from .radar_gif_creator import update_radar_gif
+from .const import (
+    DATA_RADAR_IMAGES,
+    DEFAULT_RADAR_ARCHIVE_MAX_MB,
+    DOMAIN,
+    RADAR_DEVICE_ID,
+    RADAR_PRODUCT_DEFAULT,
+    SIGNAL_RADAR_FRAMES,
+    URL_RADAR,
+)
+from .executor import async_run_io
+from .radar_archive import get_radar_archive
+from .radar_downloader import get_radar_downloader
+from .radar_encoder import FORMAT_GIF
+from .radar_frames import get_frame_store, product_name
+from .radar_gif_creator import RADAR_UPDATED, RadarGifUpdater, content_etag
+from .radar_view import RADAR_VIEW_URL
+from .radar_worker import RadarEncodeWorker
+from .scheduler import COST_IO, PRIORITY_HIGH, async_run_cpu_job, get_scheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+# HungaroMet sometimes publishes a composite a few minutes late; probe again
+# shortly instead of waiting for the next five-minute slot
+REPROBE_DELAY_SECONDS = 60
+MAX_REPROBES = 3
+UPDATE_MINUTES = [1, 6, 11, 16, 21, 26, 31, 36, 41, 46, 51, 56]
+
 
 class HungarometRadarImage(ImageEntity):
     """ImageEntity for the HungaroMet radar GIF."""
 
-    def __init__(self, hass, name="HungaroMet Radar"):
+    _attr_content_type = "image/gif"
+
+    def __init__(
+        self,
+        hass,
+        name="HungaroMet Radar",
+        region=None,
+        image_format=FORMAT_GIF,
+        use_subprocess=False,
+        nowcast=False,
+        archive_hours=0,
+        archive_max_mb=DEFAULT_RADAR_ARCHIVE_MAX_MB,
+        overlay=None,
+        variants=(),
+        updater=None,
+        product=RADAR_PRODUCT_DEFAULT,
+        unique_id_prefix="",
+        file_prefix="",
+        output_dir=None,
+    ):
         super().__init__(hass)
         self.hass = hass
         self._name = name
-        self._device_id = "hungaromet_radar_gif"
+        # Config entries prefix their ids and jobs so several locations can
+        # coexist; only entries after the first prefix their files
+        self._unique_id_prefix = unique_id_prefix
+        self._device_id = f"{unique_id_prefix}{RADAR_DEVICE_ID}"
         normalized_name = self._name.lower().replace(" ", "_")
         self._unique_id = f"{self._device_id}_{normalized_name}"
         self._added = False
-        self._gif_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "www", "radar_animation.gif"
-        )
         self._update_counter = 0
         self._unsub_update = None
-        # Set last_updated to file mtime if exists, else None
-        if os.path.exists(self._gif_path):
-            mtime = os.path.getmtime(self._gif_path)
-            self._last_updated = datetime.fromtimestamp(mtime).isoformat()
-        else:
-            self._last_updated = None
-            _LOGGER.warning(
-                "Radar GIF file not found at %s. The image entity will be unavailable "
-                "until the file is created.",
-                self._gif_path,
-            )
+        self._unsub_reprobe = None
+        self._reprobes = 0
+        default_product = product == RADAR_PRODUCT_DEFAULT
+        output_name = (
+            "radar_animation" if default_product else f"radar_{product_name(product)}"
+        )
+        # Consecutive builds share all but the newest frame
+        self._updater = updater or RadarGifUpdater(
+            base_url=f"{URL_RADAR}/{product.strip('/')}/",
+            output_name=f"{file_prefix}{output_name}",
+            output_dir=output_dir,
+            # Every radar product shares one session and request limit
+            downloader=get_radar_downloader(hass),
+            region=region,
+            image_format=image_format,
+            # Decode and encode in a worker process instead of the executor
+            worker=RadarEncodeWorker() if use_subprocess else None,
+            store=get_frame_store(hass),
+            nowcast=nowcast,
+            # The archive and its time-lapses hold the default product only
+            archive=(
+                get_radar_archive(
+                    hass, archive_hours, region, archive_max_mb, file_prefix
+                )
+                if archive_hours and default_product
+                else None
+            ),
+            overlay=overlay,
+            variants=variants,
+        )
+        # Entities of the smaller animations, refreshed with every build
+        self._variants = []
+        # The radar camera of the device serves the default product's frames
+        self._frames_signal = (
+            SIGNAL_RADAR_FRAMES.format(self._device_id) if default_product else None
+        )
+        self._attr_content_type = self._updater.encoder.content_type
+        self._gif_path = self._updater.output_path
+        self._frame_store = self._updater.frame_store
+        # Served from memory; the file on disk is only read once when added
+        self._gif_bytes = None
+        self._etag = None
+        self._last_updated = None
 
     @property
     def name(self):
@@ -58,81 +132,224 @@ class HungarometRadarImage(ImageEntity):
 
     @property
     def available(self) -> bool:
-        """Return True if the radar GIF file exists."""
-        return os.path.exists(self._gif_path)
+        """Return True once a radar GIF has been loaded or built."""
+        return self._gif_bytes is not None
 
     @property
     def state(self) -> str:
         """Return the last updated time in ISO format, or 'unknown'."""
         return self._last_updated or "unknown"
 
+    def _read_gif_file(self):
+        """Return the bytes, content hash and mtime of the GIF on disk, or None."""
+        try:
+            with open(self._gif_path, "rb") as gif_file:
+                gif_bytes = gif_file.read()
+                mtime = os.fstat(gif_file.fileno()).st_mtime
+            return gif_bytes, content_etag(gif_bytes), mtime
+        except FileNotFoundError:
+            _LOGGER.warning(
+                "Radar GIF file not found at %s. The image entity will be unavailable "
+                "until the file is created.",
+                self._gif_path,
+            )
+        except OSError as err:
+            _LOGGER.error("Failed to read radar GIF: %s", err)
+        return None
+
+    @property
+    def file_name(self):
+        """Return the name the animation is written and served under."""
+        return os.path.basename(self._gif_path)
+
+    @property
+    def etag(self):
+        """Return the content hash of the served animation, or None."""
+        return self._etag
+
+    @property
+    def url(self):
+        """Return a URL of the animation that changes with its content."""
+        if self._etag is None:
+            return None
+        return f"{RADAR_VIEW_URL.format(file_name=self.file_name)}?v={self._etag}"
+
+    def _set_image(self, gif_bytes, etag, updated):
+        if etag == self._etag:
+            # Same bytes as served already; keep clients' cached copies valid
+            return
+        self._gif_bytes = gif_bytes
+        self._etag = etag
+        self._attr_image_last_updated = updated
+        self._last_updated = dt_util.as_local(updated).replace(tzinfo=None).isoformat()
+
     async def async_added_to_hass(self):
+        await self._async_load_and_register()
+        if self._unsub_update is None:
+            self._unsub_update = get_scheduler(self.hass).async_schedule(
+                self._unique_id,
+                self._handle_scheduled_update,
+                cost=COST_IO,
+                priority=PRIORITY_HIGH,
+                minute=UPDATE_MINUTES,
+                second=30,
+            )
+
+    async def _async_load_and_register(self):
         self._added = True
         _LOGGER.debug(
             "Image entity %s added to hass with unique_id %s",
             self._name,
             self._unique_id,
         )
-        if self._unsub_update is None:
-            self._unsub_update = async_track_time_change(
-                self.hass,
-                self._handle_scheduled_update,
-                minute=[1, 6, 11, 16, 21, 26, 31, 36, 41, 46, 51, 56],
-                second=30,
-            )
+        if self._gif_bytes is None:
+            loaded = await async_run_io(self.hass, self._read_gif_file)
+            if loaded is not None:
+                gif_bytes, etag, mtime = loaded
+                self._set_image(gif_bytes, etag, dt_util.utc_from_timestamp(mtime))
+        # Let the update service reach this entity for the radar dataset
+        radar_images = self.hass.data.setdefault(DOMAIN, {}).setdefault(
+            DATA_RADAR_IMAGES, []
+        )
+        if self not in radar_images:
+            radar_images.append(self)
 
     async def async_will_remove_from_hass(self):
-        self._added = False
+        self._unregister()
         if self._unsub_update:
             self._unsub_update()
             self._unsub_update = None
+        self._cancel_reprobe()
+        self._updater.close()
 
-    async def _handle_scheduled_update(self, now):
+    def _unregister(self):
+        self._added = False
+        radar_images = self.hass.data.get(DOMAIN, {}).get(DATA_RADAR_IMAGES, [])
+        if self in radar_images:
+            radar_images.remove(self)
+
+    def _cancel_reprobe(self):
+        if self._unsub_reprobe:
+            self._unsub_reprobe()
+            self._unsub_reprobe = None
+
+    async def _handle_scheduled_update(self):
         if not self._added:
             return
         _LOGGER.debug("HungaroMetRadarImage: scheduled update triggered")
+        self._cancel_reprobe()
+        self._reprobes = 0
         await self.async_update_data()
 
-    async def async_update_data(self):
+    async def _handle_reprobe(self):
+        self._unsub_reprobe = None
+        _LOGGER.debug("HungaroMetRadarImage: re-probing for a late radar frame")
+        await self.async_update_data()
+
+    def _schedule_reprobe(self):
+        if self._unsub_reprobe is not None or self._reprobes >= MAX_REPROBES:
+            return
+        self._reprobes += 1
+        self._unsub_reprobe = get_scheduler(self.hass).async_schedule_once(
+            f"{self._unique_id} reprobe",
+            REPROBE_DELAY_SECONDS,
+            self._handle_reprobe,
+            cost=COST_IO,
+            priority=PRIORITY_HIGH,
+        )
+
+    async def async_update_data(self, force=False):
         if not self._added:
             return
         _LOGGER.info("HungaroMetRadarImage: async_update_data called")
-        await self.hass.async_add_executor_job(update_radar_gif)
-        self._last_updated = datetime.now().isoformat()
+        # Wait for the listing and downloads on the I/O pool, so only the
+        # decoding and encoding hold a CPU worker and the CPU lane
+        status, download = await async_run_io(self.hass, self._updater.fetch, force)
+        if status == RADAR_UPDATED:
+            status = await async_run_cpu_job(
+                self.hass,
+                f"{self._unique_id} build",
+                self._updater.build,
+                download,
+                priority=PRIORITY_HIGH,
+            )
+        if status != RADAR_UPDATED:
+            self._schedule_reprobe()
+            return
+        self._cancel_reprobe()
+        self._set_image(
+            self._updater.gif_bytes, self._updater.etag, dt_util.utcnow()
+        )
         self._update_counter += 1
         self.async_write_ha_state()
+        for variant in self._variants:
+            variant.refresh_from_updater()
+        if self._frames_signal is not None:
+            async_dispatcher_send(
+                self.hass, self._frames_signal, list(self._updater.pngs.items())
+            )
 
     async def async_update(self):
         await self.async_update_data()
 
     async def async_image(self):
-        if not os.path.exists(self._gif_path):
-            _LOGGER.warning(
-                "Radar GIF file not found at %s. Returning None.",
-                self._gif_path,
-            )
-            return None
-        try:
-            with open(self._gif_path, "rb") as f:
-                return f.read()
-        except OSError as err:
-            _LOGGER.error("Failed to read radar GIF: %s", err)
-            return None
+        return self._gif_bytes
 
     def image(self):
         """Return the most recent radar image bytes synchronously."""
-        if not os.path.exists(self._gif_path):
-            return None
-        try:
-            with open(self._gif_path, "rb") as gif_file:
-                return gif_file.read()
-        except OSError as err:
-            _LOGGER.error("Failed to read radar GIF synchronously: %s", err)
-            return None
+        return self._gif_bytes
 
     @property
     def extra_state_attributes(self):
         return {
             "last_updated": self._last_updated,
             "update_counter": self._update_counter,
+            "frame_cache_hits": self._frame_store.hits,
+            "frame_cache_misses": self._frame_store.misses,
+            "frame_cache_size": len(self._frame_store),
+            "frame_cache_bytes": self._frame_store.nbytes,
+            "latest_frame": self._updater.last_frame,
+            "etag": self._etag,
+            "url": self.url,
         }
+
+
+class HungarometRadarVariantImage(HungarometRadarImage):
+    """
+    Smaller radar animation built by the updater of ``source``, so it shares
+    its downloads and decoded frames and never schedules a build itself.
+    """
+
+    def __init__(self, source, variant):
+        super().__init__(
+            source.hass,
+            name=f"{source.name} {variant}",
+            updater=source._updater,
+            unique_id_prefix=source._unique_id_prefix,
+        )
+        self._variant = variant
+        self._gif_path = self._updater.variant_path(variant)
+        source._variants.append(self)
+
+    async def async_added_to_hass(self):
+        await self._async_load_and_register()
+
+    async def async_will_remove_from_hass(self):
+        self._unregister()
+
+    def refresh_from_updater(self):
+        """Serve the updater's latest animation of this size, if built."""
+        output = self._updater.variant_outputs.get(self._variant)
+        if not self._added or output is None:
+            return
+        self._set_image(*output, dt_util.utcnow())
+        self._update_counter += 1
+        self.async_write_ha_state()
+
+    async def async_update_data(self, force=False):
+        # Built with the full-size animation; only pick up its result
+        self.refresh_from_updater()
+
+    @property
+    def extra_state_attributes(self):
+        return {**super().extra_state_attributes, "variant": self._variant}
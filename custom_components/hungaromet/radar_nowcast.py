@@ -0,0 +1,402 @@
+"""Short-term radar nowcast by advecting the latest frame along its motion."""
+
+import math
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+try:
+    from .radar_precipitation import palette_dbz
+    from .radar_region import RADAR_EXTENT, KM_PER_DEGREE, disk_pixels
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from radar_precipitation import palette_dbz
+    from radar_region import RADAR_EXTENT, KM_PER_DEGREE, disk_pixels
+
+# Motion is estimated on fields reduced by this factor, in square tiles
+MOTION_REDUCE = 2
+MOTION_TILE = 64
+# Tiles need this many echo pixels to give their own vector
+MIN_TILE_ECHOES = 64
+# Motion is measured against the oldest frame at most this far back, so a
+# one-pixel shift resolves slower movement than between consecutive frames
+MOTION_SPAN = timedelta(minutes=15)
+
+NOWCAST_HORIZON_MINUTES = 60
+NOWCAST_STEP_MINUTES = 5
+# Lead times of the forecast frames appended to the animation
+FORECAST_FRAME_MINUTES = (15, 30, 45, 60)
+# Reflectivity from which an echo counts as rain (about 0.6 mm/h)
+RAIN_DBZ = 20
+# The colour legend of the full composites as (left, top, right, bottom);
+# its boxes have echo colours but never move
+COMPOSITE_SIZE = (1024, 768)
+LEGEND_BOX = (709, 716, 1014, 736)
+# Echoes unchanged across at least this many frames are static, not rain
+STATIC_MIN_FRAMES = 6
+
+
+@dataclass(frozen=True, eq=False)
+class RadarMotion:
+    """Motion of the echoes in full-resolution pixels per minute."""
+
+    # (rows, columns, 2) grid of (dy, dx) per tile of ``tile`` pixels
+    vectors: np.ndarray
+    tile: int
+    size: tuple
+    speed_kmh: float
+    direction: Optional[float]
+    # Full-resolution mask of the static pixels left out of the estimate
+    static: Optional[np.ndarray] = None
+
+    def at(self, x, y):
+        """Return the ``(dy, dx)`` vector of the tile containing a pixel."""
+        rows, columns = self.vectors.shape[:2]
+        row = min(rows - 1, max(0, int(y) // self.tile))
+        column = min(columns - 1, max(0, int(x) // self.tile))
+        return self.vectors[row, column]
+
+    def field(self):
+        """Return per-pixel ``(dy, dx)`` arrays interpolated between tiles."""
+        width, height = self.size
+        rows, columns = self.vectors.shape[:2]
+        # Bilinear interpolation is separable: two small matrix products
+        weights_y = _interpolation_weights(height, rows, self.tile)
+        weights_x = _interpolation_weights(width, columns, self.tile)
+        return tuple(
+            (weights_y @ self.vectors[:, :, component] @ weights_x.T).astype(
+                np.float32
+            )
+            for component in range(2)
+        )
+
+
+def _interpolation_weights(length, count, tile):
+    """Return the ``(length, count)`` weights of the tiles around each pixel."""
+    position = np.clip((np.arange(length) + 0.5) / tile - 0.5, 0, count - 1)
+    before = np.floor(position).astype(np.intp)
+    after = np.minimum(before + 1, count - 1)
+    fraction = position - before
+    weights = np.zeros((length, count), dtype=np.float32)
+    pixels = np.arange(length)
+    np.add.at(weights, (pixels, before), 1 - fraction)
+    np.add.at(weights, (pixels, after), fraction)
+    return weights
+
+
+def _dbz_lookup(frame):
+    # Cleaning the 256-entry lookup is cheaper than cleaning whole fields
+    dbz = np.nan_to_num(palette_dbz(frame.palette, frame.transparency), nan=0.0)
+    return dbz.astype(np.float32)
+
+
+def echo_field(frame):
+    """Return the reflectivity of ``frame`` in dBZ with 0 for no echo."""
+    return _dbz_lookup(frame)[frame.indices]
+
+
+@lru_cache(maxsize=2)
+def static_echoes(frames):
+    """
+    Return a read-only mask of the pixels of the newest of ``frames``
+    (oldest first) that are not moving echoes: the legend, and echoes
+    unchanged across at least STATIC_MIN_FRAMES frames of its size.
+    """
+    latest = frames[-1]
+    mask = np.zeros(latest.size[::-1], dtype=bool)
+    if latest.size == COMPOSITE_SIZE:
+        left, top, right, bottom = LEGEND_BOX
+        mask[top:bottom, left:right] = True
+    history = [frame for frame in frames if frame.size == latest.size]
+    if len(history) >= STATIC_MIN_FRAMES:
+        # Only the echoes of the newest frame can be static: compare those
+        ys, xs = np.nonzero(echo_field(latest))
+        dbz = _dbz_lookup(latest)[latest.indices[ys, xs]]
+        unchanged = np.ones(ys.size, dtype=bool)
+        for frame in history[:-1]:
+            unchanged &= _dbz_lookup(frame)[frame.indices[ys, xs]] == dbz
+        mask[ys[unchanged], xs[unchanged]] = True
+    mask.setflags(write=False)
+    return mask
+
+
+def _moving_field(frame, static):
+    return np.where(static, np.float32(0), echo_field(frame))
+
+
+def _reduce(field, factor):
+    height = field.shape[0] // factor * factor
+    width = field.shape[1] // factor * factor
+    return (
+        field[:height, :width]
+        .reshape(height // factor, factor, width // factor, factor)
+        .mean(axis=(1, 3))
+    )
+
+
+def _tiles(field, tile):
+    rows, columns = field.shape[0] // tile, field.shape[1] // tile
+    return (
+        field[: rows * tile, : columns * tile]
+        .reshape(rows, tile, columns, tile)
+        .swapaxes(1, 2)
+        .reshape(rows, columns, tile, tile)
+    )
+
+
+def _peak_offsets(correlation):
+    """Return sub-pixel ``(dy, dx)`` of the correlation peak of each tile."""
+    count, size = correlation.shape[0], correlation.shape[1]
+    flat = correlation.reshape(count, -1).argmax(axis=1)
+    peak_y, peak_x = np.divmod(flat, size)
+    tiles = np.arange(count)
+
+    def _refine(before, centre, after):
+        # Vertex of the parabola through the peak and its neighbours
+        denominator = before - 2 * centre + after
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = np.where(
+                denominator < 0, 0.5 * (before - after) / denominator, 0.0
+            )
+        return np.clip(shift, -0.5, 0.5)
+
+    centre = correlation[tiles, peak_y, peak_x]
+    offset_y = peak_y + _refine(
+        correlation[tiles, (peak_y - 1) % size, peak_x],
+        centre,
+        correlation[tiles, (peak_y + 1) % size, peak_x],
+    )
+    offset_x = peak_x + _refine(
+        correlation[tiles, peak_y, (peak_x - 1) % size],
+        centre,
+        correlation[tiles, peak_y, (peak_x + 1) % size],
+    )
+    # Peaks past the middle are negative shifts that wrapped around
+    offset_y = np.where(offset_y > size / 2, offset_y - size, offset_y)
+    offset_x = np.where(offset_x > size / 2, offset_x - size, offset_x)
+    return offset_y, offset_x
+
+
+@lru_cache(maxsize=2)
+def estimate_motion(previous, latest, history=()):
+    """
+    Estimate the echo motion from ``previous`` to ``latest`` by phase
+    correlation of every tile at once. Static pixels found in ``history``,
+    the frames up to ``latest``, are left out since they would pull the
+    estimate to standstill. Tiles without enough echoes take the median
+    vector of the others. Returns None without any echo to track.
+    """
+    minutes = (latest.timestamp - previous.timestamp).total_seconds() / 60
+    if minutes <= 0 or previous.size != latest.size:
+        return None
+    static = static_echoes(history or (previous, latest))
+    tile = MOTION_TILE
+    before = _tiles(_reduce(_moving_field(previous, static), MOTION_REDUCE), tile)
+    after = _tiles(_reduce(_moving_field(latest, static), MOTION_REDUCE), tile)
+    rows, columns = before.shape[:2]
+    if not rows or not columns:
+        return None
+    before = before.reshape(-1, tile, tile)
+    after = after.reshape(-1, tile, tile)
+    valid = ((before > 0).sum(axis=(1, 2)) >= MIN_TILE_ECHOES) & (
+        (after > 0).sum(axis=(1, 2)) >= MIN_TILE_ECHOES
+    )
+    if not valid.any():
+        return None
+
+    window = np.outer(np.hanning(tile), np.hanning(tile)).astype(np.float32)
+    spectrum = np.fft.rfft2(after[valid] * window) * np.conj(
+        np.fft.rfft2(before[valid] * window)
+    )
+    spectrum /= np.maximum(np.abs(spectrum), 1e-9)
+    correlation = np.fft.irfft2(spectrum, s=(tile, tile))
+    offset_y, offset_x = _peak_offsets(correlation)
+
+    scale = MOTION_REDUCE / minutes
+    vectors = np.empty((rows * columns, 2), dtype=np.float32)
+    median = (np.median(offset_y) * scale, np.median(offset_x) * scale)
+    vectors[:] = median
+    vectors[valid, 0] = offset_y * scale
+    vectors[valid, 1] = offset_x * scale
+
+    width, height = latest.size
+    west, south, east, north = RADAR_EXTENT
+    centre_lat = math.radians((north + south) / 2)
+    km_x = KM_PER_DEGREE * math.cos(centre_lat) * (east - west) / width
+    km_y = KM_PER_DEGREE * (north - south) / height
+    dy, dx = median[0] * km_y * 60, median[1] * km_x * 60
+    speed = round(math.hypot(dx, dy), 1)
+    return RadarMotion(
+        vectors=vectors.reshape((rows, columns, 2)),
+        tile=tile * MOTION_REDUCE,
+        size=latest.size,
+        speed_kmh=speed,
+        # Direction the echoes come from, as for wind
+        direction=round(math.degrees(math.atan2(-dx, dy)) % 360) if speed else None,
+        static=static,
+    )
+
+
+def motion_pair(frames):
+    """Return the ``(previous, latest)`` frames to estimate motion from."""
+    frames = sorted(
+        (frame for frame in frames if frame.timestamp is not None),
+        key=lambda frame: frame.timestamp,
+    )
+    if len(frames) < 2:
+        return None
+    latest = frames[-1]
+    candidates = [
+        frame
+        for frame in frames[:-1]
+        if frame.size == latest.size
+        and latest.timestamp - frame.timestamp <= MOTION_SPAN
+    ]
+    if not candidates:
+        return None
+    return candidates[0], latest
+
+
+def _history(frames, latest):
+    return tuple(
+        sorted(
+            (
+                frame
+                for frame in frames
+                if frame.timestamp is not None and frame.size == latest.size
+            ),
+            key=lambda frame: frame.timestamp,
+        )
+    )
+
+
+def latest_motion(frames):
+    """
+    Return the newest of ``frames`` and the echo motion up to it, or None
+    without two frames to compare. Motion is None without echoes to track.
+    """
+    pair = motion_pair(frames)
+    if pair is None:
+        return None
+    return pair[1], estimate_motion(*pair, _history(frames, pair[1]))
+
+
+def advect_frames(frame, motion, lead_minutes):
+    """
+    Return copies of ``frame`` with its echoes moved each of
+    ``lead_minutes`` ahead along ``motion``. Map and static pixels such as
+    the legend stay in place; echoes that move away leave the frame's most
+    common background colour. Only the window the echoes can reach is
+    traced; every other pixel keeps the background.
+    """
+    dy, dx = motion.field()
+    width, height = frame.size
+    is_echo = ~np.isnan(palette_dbz(frame.palette, frame.transparency))
+    echoes = is_echo[frame.indices]
+    if motion.static is not None:
+        echoes &= ~motion.static
+    background = np.bincount(frame.indices[~echoes], minlength=256).argmax()
+    base = np.where(echoes, np.uint8(background), frame.indices)
+    base.setflags(write=False)
+    flat = frame.indices.ravel()
+    movable = echoes.ravel()
+    echo_rows = np.flatnonzero(echoes.any(axis=1))
+    echo_columns = np.flatnonzero(echoes.any(axis=0))
+
+    forecast = []
+    for minutes in lead_minutes:
+        indices = base
+        if echo_rows.size:
+            # Pixels further from every echo than it moves stay background
+            reach_y = int(np.ceil(np.abs(dy).max() * minutes)) + 1
+            reach_x = int(np.ceil(np.abs(dx).max() * minutes)) + 1
+            top = max(0, echo_rows[0] - reach_y)
+            bottom = min(height, echo_rows[-1] + reach_y + 1)
+            left = max(0, echo_columns[0] - reach_x)
+            right = min(width, echo_columns[-1] + reach_x + 1)
+            window = (slice(top, bottom), slice(left, right))
+            # Semi-Lagrangian: each pixel takes the echo upstream of it
+            source_y = np.rint(
+                np.arange(top, bottom, dtype=np.float32)[:, None]
+                - dy[window] * minutes
+            ).astype(np.int32)
+            source_x = np.rint(
+                np.arange(left, right, dtype=np.float32)[None, :]
+                - dx[window] * minutes
+            ).astype(np.int32)
+            inside = (source_y >= 0) & (source_y < height) & (source_x >= 0) & (
+                source_x < width
+            )
+            np.clip(source_y, 0, height - 1, out=source_y)
+            np.clip(source_x, 0, width - 1, out=source_x)
+            source = source_y * width + source_x
+            indices = base.copy()
+            indices[window] = np.where(
+                inside & movable.take(source), flat.take(source), base[window]
+            )
+            indices.setflags(write=False)
+        timestamp = frame.timestamp + timedelta(minutes=minutes)
+        forecast.append(
+            replace(
+                frame,
+                name=f"nowcast_{timestamp:%Y%m%d_%H%M}.png",
+                timestamp=timestamp,
+                indices=indices,
+            )
+        )
+    return forecast
+
+
+def forecast_frames(frames, lead_minutes=FORECAST_FRAME_MINUTES):
+    """Return frames forecast ``lead_minutes`` after the newest of ``frames``."""
+    result = latest_motion(frames)
+    if result is None or result[1] is None:
+        return []
+    return advect_frames(*result, lead_minutes)
+
+
+def rain_expected_in(
+    frames,
+    latitude,
+    longitude,
+    radius_km,
+    horizon=NOWCAST_HORIZON_MINUTES,
+    step=NOWCAST_STEP_MINUTES,
+):
+    """
+    Return in how many minutes rain of at least RAIN_DBZ is expected within
+    ``radius_km`` of a location, 0 when it is raining already, or None when
+    none is expected within ``horizon`` minutes. Only the pixels upstream
+    of the location are traced back, never whole frames.
+    """
+    result = latest_motion(frames)
+    if result is None:
+        return None
+    latest, motion = result
+    pixels = disk_pixels(latest.size, latitude, longitude, radius_km)
+    if pixels is None:
+        return None
+    ys, xs, centre = pixels
+    lookup = palette_dbz(latest.palette, latest.transparency)
+    static = static_echoes(_history(frames, latest))
+    dy, dx = motion.at(xs[centre], ys[centre]) if motion else (0.0, 0.0)
+
+    leads = np.arange(0, horizon + 1, step)
+    width, height = latest.size
+    source_y = np.rint(ys[None, :] - dy * leads[:, None]).astype(np.intp)
+    source_x = np.rint(xs[None, :] - dx * leads[:, None]).astype(np.intp)
+    inside = (source_y >= 0) & (source_y < height) & (source_x >= 0) & (
+        source_x < width
+    )
+    source_y, source_x = source_y.clip(0, height - 1), source_x.clip(0, width - 1)
+    dbz = lookup[latest.indices[source_y, source_x]]
+    raining = (
+        inside
+        & ~static[source_y, source_x]
+        & (np.nan_to_num(dbz, nan=0.0) >= RAIN_DBZ)
+    ).any(axis=1)
+    if not raining.any():
+        return None
+    return int(leads[raining.argmax()])
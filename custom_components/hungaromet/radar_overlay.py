@@ -0,0 +1,234 @@
+"""Town and home location overlay drawn over the radar frames."""
+
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from .radar_region import location_pixel
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from radar_region import location_pixel
+
+# County seats and larger towns labelled on the overlay as (name, lat, lon).
+# The composites already show the country borders.
+TOWNS = (
+    ("Budapest", 47.498, 19.040),
+    ("Debrecen", 47.532, 21.627),
+    ("Szeged", 46.253, 20.148),
+    ("Miskolc", 48.104, 20.791),
+    ("Pécs", 46.073, 18.233),
+    ("Győr", 47.687, 17.650),
+    ("Nyíregyháza", 47.956, 21.717),
+    ("Kecskemét", 46.907, 19.692),
+    ("Székesfehérvár", 47.186, 18.422),
+    ("Szombathely", 47.231, 16.622),
+    ("Szolnok", 47.175, 20.177),
+    ("Kaposvár", 46.359, 17.797),
+    ("Eger", 47.903, 20.377),
+    ("Veszprém", 47.093, 17.911),
+    ("Zalaegerszeg", 46.842, 16.844),
+    ("Békéscsaba", 46.679, 21.091),
+)
+TOWN_COLOR = (40, 40, 40, 255)
+LABEL_COLOR = (20, 20, 20, 230)
+HALO_COLOR = (255, 255, 255, 200)
+MARKER_OUTER = (0, 0, 0, 255)
+MARKER_INNER = (255, 255, 255, 255)
+MARKER_RADIUS = 6
+LABEL_FONT = "DejaVuSans.ttf"
+LABEL_SIZE = 10
+# Palettes whose blended indices a layer keeps; the composites share one
+PALETTE_TABLES = 4
+
+
+@dataclass(frozen=True)
+class RadarOverlay:
+    """Home marker at a location, optionally with the town labels."""
+
+    latitude: float
+    longitude: float
+    towns: bool = True
+
+
+@dataclass(frozen=True, eq=False)
+class OverlayLayer:
+    """
+    Premultiplied overlay restricted to the pixels it covers, so blending
+    touches only those instead of whole frames. Pixels of the same colour
+    and alpha share a style; palette frames look up the index each style
+    turns each palette index into, matched once per palette.
+    """
+
+    size: tuple
+    ys: np.ndarray
+    xs: np.ndarray
+    # Style of every covered pixel
+    styles: np.ndarray
+    # (styles, 3) colour times alpha, and (styles, 1) of 1 - alpha
+    premultiplied: np.ndarray
+    inverse_alpha: np.ndarray
+    # (palette, transparency) -> (styles, colours) blended index, -1 until used
+    tables: dict = field(default_factory=dict, repr=False)
+
+
+def _label_font():
+    """Return a font with the Hungarian accents and whether it has them."""
+    try:
+        return ImageFont.truetype(LABEL_FONT, LABEL_SIZE), True
+    except OSError:
+        # Pillow's built-in font has no glyphs for ő, é and the like
+        return ImageFont.load_default(), False
+
+
+def _ascii(name):
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _transform(region, source_size):
+    """Return the output size and a function mapping lat/lon to its pixels."""
+    box = region.crop_box(source_size) if region is not None else None
+    if box is None:
+        origin, scale = (0, 0), 1
+        size = tuple(source_size)
+    else:
+        origin, scale = box[:2], region.downscale
+        # Image.reduce rounds partial blocks up
+        size = (-(-(box[2] - box[0]) // scale), -(-(box[3] - box[1]) // scale))
+
+    def to_pixel(latitude, longitude):
+        x, y = location_pixel(source_size, latitude, longitude)
+        return (x - origin[0]) / scale, (y - origin[1]) / scale
+
+    return size, to_pixel
+
+
+@lru_cache(maxsize=4)
+def render_layer(overlay, region, source_size):
+    """
+    Render ``overlay`` once for frames of ``source_size`` cropped to
+    ``region``. Cached, so only a new location or crop renders it again.
+    """
+    size, to_pixel = _transform(region, source_size)
+    canvas = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+    if overlay.towns:
+        font, accents = _label_font()
+        for name, latitude, longitude in TOWNS:
+            x, y = to_pixel(latitude, longitude)
+            if not (0 <= x < size[0] and 0 <= y < size[1]):
+                continue
+            draw.ellipse((x - 2, y - 2, x + 2, y + 2), fill=TOWN_COLOR)
+            draw.text(
+                (x + 4, y - 6),
+                name if accents else _ascii(name),
+                fill=LABEL_COLOR,
+                font=font,
+                stroke_width=1,
+                stroke_fill=HALO_COLOR,
+            )
+    x, y = to_pixel(overlay.latitude, overlay.longitude)
+    box = (x - MARKER_RADIUS, y - MARKER_RADIUS, x + MARKER_RADIUS, y + MARKER_RADIUS)
+    # A dark ring with a light core stays visible over any echo colour
+    draw.ellipse(box, outline=MARKER_OUTER, width=3)
+    draw.ellipse(
+        (box[0] + 1, box[1] + 1, box[2] - 1, box[3] - 1), outline=MARKER_INNER, width=1
+    )
+
+    pixels = np.asarray(canvas)
+    ys, xs = np.nonzero(pixels[:, :, 3])
+    colors, styles = np.unique(pixels[ys, xs], axis=0, return_inverse=True)
+    rgba = colors.astype(np.float32) / 255
+    alpha = rgba[:, 3:]
+    return OverlayLayer(
+        size=size,
+        ys=ys,
+        xs=xs,
+        styles=styles.reshape(-1),
+        premultiplied=rgba[:, :3] * alpha * 255,
+        inverse_alpha=1 - alpha,
+    )
+
+
+def _nearest_indices(colors, palette, transparency):
+    """Return the palette index closest to each of ``colors``."""
+    distance = (
+        (colors[:, None, :] - palette[None, :, :].astype(np.float32)) ** 2
+    ).sum(axis=2)
+    if isinstance(transparency, int) and transparency < len(palette):
+        distance[:, transparency] = np.inf
+    return distance.argmin(axis=1).astype(np.uint8)
+
+
+def _palette_table(layer, palette, transparency):
+    """Return the blended index table of ``layer`` for ``palette``."""
+    key = (palette.tobytes(), transparency)
+    table = layer.tables.get(key)
+    if table is None:
+        if len(layer.tables) >= PALETTE_TABLES:
+            layer.tables.pop(next(iter(layer.tables)))
+        table = layer.tables[key] = np.full(
+            (len(layer.premultiplied), len(palette)), -1, np.int16
+        )
+    return table
+
+
+def _blend_indices(indices, layer, palette, transparency):
+    """Blend ``layer`` into palette ``indices`` in place, staying in index space."""
+    table = _palette_table(layer, palette, transparency)
+    under = indices[layer.ys, layer.xs]
+    blended = table[layer.styles, under]
+    missing = blended < 0
+    if missing.any():
+        # Match each new (style, index) pair once; later frames look it up
+        keys = np.unique(layer.styles[missing] * len(palette) + under[missing])
+        styles, unders = np.divmod(keys, len(palette))
+        blended = np.rint(
+            palette[unders].astype(np.float32) * layer.inverse_alpha[styles]
+            + layer.premultiplied[styles]
+        )
+        # Pairs often blend to the same colour; match each colour once
+        packed = blended.astype(np.int32) @ np.array([65536, 256, 1], np.int32)
+        colors, inverse = np.unique(packed, return_inverse=True)
+        colors = np.stack([colors >> 16, (colors >> 8) & 255, colors & 255], axis=1)
+        nearest = _nearest_indices(colors.astype(np.float32), palette, transparency)
+        table[styles, unders] = nearest[inverse]
+        blended = table[layer.styles, under]
+    indices[layer.ys, layer.xs] = blended
+
+
+def _blend(image, layer):
+    if image.mode == "P":
+        # Keep the frame's palette, so frames still share it for encoding
+        palette = np.frombuffer(bytes(image.getpalette()), np.uint8).reshape(-1, 3)
+        indices = np.array(image)
+        _blend_indices(indices, layer, palette, image.info.get("transparency"))
+        result = Image.fromarray(indices, "P")
+        result.putpalette(image.getpalette())
+        if "transparency" in image.info:
+            result.info["transparency"] = image.info["transparency"]
+        return result
+    pixels = np.array(image.convert("RGB"))
+    under = pixels[layer.ys, layer.xs].astype(np.float32)
+    pixels[layer.ys, layer.xs] = np.rint(
+        under * layer.inverse_alpha[layer.styles]
+        + layer.premultiplied[layer.styles]
+    ).astype(np.uint8)
+    return Image.fromarray(pixels, "RGB")
+
+
+def apply_overlay(images, overlay, region, source_size):
+    """
+    Blend ``overlay`` into ``images``, already cropped to ``region`` from
+    composites of ``source_size``. None keeps the images as they are.
+    """
+    if overlay is None or not images:
+        return images
+    layer = render_layer(overlay, region, tuple(source_size))
+    return [
+        _blend(image, layer) if image.size == layer.size else image
+        for image in images
+    ]
@@ -0,0 +1,129 @@
+"""Precipitation around a location derived from stored radar frames."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+try:
+    from .radar_region import disk_pixels
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from radar_region import disk_pixels
+
+# The 16 boxes of the refl2D_pscappi legend, left to right, as (lower dBZ
+# bound, RGB). Some neighbouring boxes share a colour; those pixels get the
+# lower box's bound.
+REFLECTIVITY_SCALE = (
+    (-10, (1, 1, 178)),
+    (-5, (1, 1, 178)),
+    (0, (12, 86, 195)),
+    (5, (32, 172, 198)),
+    (10, (0, 224, 135)),
+    (15, (0, 224, 135)),
+    (20, (0, 231, 0)),
+    (25, (109, 226, 54)),
+    (30, (192, 240, 0)),
+    (35, (245, 196, 0)),
+    (40, (208, 102, 32)),
+    (45, (236, 0, 0)),
+    (50, (236, 0, 0)),
+    (55, (178, 0, 0)),
+    (60, (121, 0, 0)),
+    (65, (121, 0, 0)),
+)
+# Palette colours further than this from every class (map background,
+# borders, labels) are not echoes
+COLOUR_TOLERANCE = 40
+
+# Marshall-Palmer Z-R relation, Z = a * R ** b
+MARSHALL_PALMER_A = 200.0
+MARSHALL_PALMER_B = 1.6
+
+
+@dataclass(frozen=True)
+class RadarPrecipitation:
+    """Rain rates in mm/h sampled from the stored frames."""
+
+    rain_rate: float
+    dbz: Optional[float]
+    max_rain_rate: float
+    max_dbz: Optional[float]
+    # Change of the mean rain rate in the disk, in mm/h per hour
+    trend: Optional[float]
+    frames: int
+    time: datetime
+
+
+def rain_rate(dbz):
+    """Return the rain rate in mm/h for reflectivities in dBZ; NaN is dry."""
+    dbz = np.asarray(dbz, dtype=float)
+    rate = (10 ** (dbz / 10) / MARSHALL_PALMER_A) ** (1 / MARSHALL_PALMER_B)
+    return np.where(np.isnan(dbz), 0.0, rate)
+
+
+@lru_cache(maxsize=8)
+def palette_dbz(palette, transparency=None):
+    """Return the dBZ of each of the 256 palette indices, NaN for no echo."""
+    colors = np.zeros((256, 3), dtype=float)
+    entries = np.frombuffer(palette, dtype=np.uint8)[: 256 * 3].reshape(-1, 3)
+    colors[: len(entries)] = entries
+    scale = np.array([rgb for _, rgb in REFLECTIVITY_SCALE], dtype=float)
+    distance = np.linalg.norm(colors[:, None, :] - scale[None, :, :], axis=2)
+    nearest = distance.argmin(axis=1)
+    dbz = np.array([value for value, _ in REFLECTIVITY_SCALE], dtype=float)[nearest]
+    dbz[distance.min(axis=1) > COLOUR_TOLERANCE] = np.nan
+    dbz[len(entries) :] = np.nan
+    if isinstance(transparency, int):
+        dbz[transparency] = np.nan
+    elif isinstance(transparency, bytes):
+        alpha = np.frombuffer(transparency, dtype=np.uint8)
+        dbz[: len(alpha)][alpha == 0] = np.nan
+    dbz.setflags(write=False)
+    return dbz
+
+
+def sample_precipitation(frames, latitude, longitude, radius_km):
+    """
+    Sample the disk of ``radius_km`` around a location in every timestamped
+    frame of the newest size at once. Returns None without usable frames.
+    """
+    frames = sorted(
+        (frame for frame in frames if frame.timestamp is not None),
+        key=lambda frame: frame.timestamp,
+    )
+    if not frames:
+        return None
+    size = frames[-1].size
+    frames = [frame for frame in frames if frame.size == size]
+    pixels = disk_pixels(size, latitude, longitude, radius_km)
+    if pixels is None:
+        return None
+    ys, xs, centre = pixels
+
+    indices = np.stack([frame.indices[ys, xs] for frame in frames])
+    lookup = np.stack([
+        palette_dbz(frame.palette, frame.transparency) for frame in frames
+    ])
+    dbz = np.take_along_axis(lookup, indices.astype(np.intp), axis=1)
+    rates = rain_rate(dbz)
+
+    trend = None
+    if len(frames) > 1:
+        hours = np.array([
+            (frame.timestamp - frames[-1].timestamp).total_seconds() / 3600
+            for frame in frames
+        ])
+        trend = round(float(np.polyfit(hours, rates.mean(axis=1), 1)[0]), 2)
+    latest = dbz[-1]
+    echoes = latest[~np.isnan(latest)]
+    return RadarPrecipitation(
+        rain_rate=round(float(rates[-1, centre]), 2),
+        dbz=None if np.isnan(latest[centre]) else float(latest[centre]),
+        max_rain_rate=round(float(rates[-1].max()), 2),
+        max_dbz=float(echoes.max()) if echoes.size else None,
+        trend=trend,
+        frames=len(frames),
+        time=frames[-1].timestamp,
+    )
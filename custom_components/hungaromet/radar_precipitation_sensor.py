@@ -0,0 +1,143 @@
+import logging
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfVolumetricFlux
+
+from .const import (
+    DEFAULT_RADAR_SENSOR_RADIUS_KM,
+    RADAR_DEVICE_ID,
+    RADAR_PRODUCT_DEFAULT,
+)
+from .radar_frames import get_frame_store, product_name
+from .radar_nowcast import latest_motion, rain_expected_in
+from .radar_precipitation import sample_precipitation
+from .scheduler import COST_IO, PRIORITY_LOW, async_run_cpu_job, get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shortly after the radar image has stored the newest composite
+UPDATE_MINUTES = [2, 7, 12, 17, 22, 27, 32, 37, 42, 47, 52, 57]
+
+
+class HungarometRadarPrecipitationSensor(SensorEntity):
+    """Rain rate at a location read from the already downloaded radar frames."""
+
+    _attr_device_class = SensorDeviceClass.PRECIPITATION_INTENSITY
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR
+
+    def __init__(
+        self,
+        hass,
+        location,
+        radius_km=DEFAULT_RADAR_SENSOR_RADIUS_KM,
+        name="HungaroMet Radar csapadék",
+    ):
+        self.hass = hass
+        self._name = name
+        self._location = location
+        self._radius_km = radius_km
+        self._store = get_frame_store(hass)
+        prefix = location.unique_id_prefix
+        # Grouped with the radar image and camera of the same entry
+        self._device_id = f"{prefix}{RADAR_DEVICE_ID}"
+        self._unique_id = f"{prefix}hungaromet_radar_precipitation"
+        self._attr_name = name
+        self._attr_unique_id = self._unique_id
+        self._attr_device_info = {
+            "identifiers": {(self._device_id,)},
+            "name": "HungaroMet Radar",
+            "manufacturer": "HungaroMet",
+            "model": "Radar Image",
+            "entry_type": "service",
+        }
+        self._precipitation = None
+        self._rain_expected_in = None
+        self._motion = None
+        self._added = False
+        self._unsub_update = None
+
+    @property
+    def available(self) -> bool:
+        return self._precipitation is not None
+
+    @property
+    def native_value(self):
+        if self._precipitation is None:
+            return None
+        return self._precipitation.rain_rate
+
+    @property
+    def extra_state_attributes(self):
+        precipitation = self._precipitation
+        if precipitation is None:
+            return {"radius_km": self._radius_km}
+        motion = self._motion
+        return {
+            "radius_km": self._radius_km,
+            "dbz": precipitation.dbz,
+            "max_rain_rate": precipitation.max_rain_rate,
+            "max_dbz": precipitation.max_dbz,
+            "trend": precipitation.trend,
+            "frames": precipitation.frames,
+            "radar_time": precipitation.time.isoformat(),
+            "rain_expected_in": self._rain_expected_in,
+            "motion_speed_kmh": motion.speed_kmh if motion else None,
+            "motion_direction": motion.direction if motion else None,
+        }
+
+    async def async_added_to_hass(self):
+        self._added = True
+        if self._unsub_update is None:
+            self._unsub_update = get_scheduler(self.hass).async_schedule(
+                self._unique_id,
+                self._handle_scheduled_update,
+                cost=COST_IO,
+                priority=PRIORITY_LOW,
+                minute=UPDATE_MINUTES,
+                second=0,
+            )
+
+    async def async_will_remove_from_hass(self):
+        self._added = False
+        if self._unsub_update:
+            self._unsub_update()
+            self._unsub_update = None
+
+    async def _handle_scheduled_update(self):
+        await self.async_update_data()
+
+    def _sample(self):
+        # The motion estimate runs FFTs over the whole frame, so this runs
+        # on the CPU pool; the image entity usually has it cached already.
+        # Other radar products share the store but not the rain rate scale.
+        frames = self._store.frames(product_name(RADAR_PRODUCT_DEFAULT))
+        location = (self._location.latitude, self._location.longitude)
+        motion = latest_motion(frames)
+        return (
+            sample_precipitation(frames, *location, self._radius_km),
+            rain_expected_in(frames, *location, self._radius_km),
+            motion[1] if motion else None,
+        )
+
+    async def _async_sample(self):
+        (
+            self._precipitation,
+            self._rain_expected_in,
+            self._motion,
+        ) = await async_run_cpu_job(
+            self.hass, f"{self._unique_id} sample", self._sample, priority=PRIORITY_LOW
+        )
+
+    async def async_update_data(self):
+        if not self._added:
+            return
+        await self._async_sample()
+        self.async_write_ha_state()
+
+    async def async_update(self):
+        await self._async_sample()
@@ -0,0 +1,134 @@
+"""Geographic crop window of the HungaroMet radar composite."""
+
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .const import RADAR_VARIANT_HALF
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from const import RADAR_VARIANT_HALF
+
+_LOGGER = logging.getLogger(__name__)
+
+# Approximate extent (west, south, east, north) of the refl2D_pscappi
+# composite, read off its country borders. The projection is close enough to
+# linear in latitude and longitude for a crop window with some margin.
+RADAR_EXTENT = (13.0, 43.9, 25.9, 50.3)
+KM_PER_DEGREE = 111.32
+# Thumbnails are reduced by whole factors until no wider than this
+THUMBNAIL_WIDTH = 240
+
+
+@dataclass(frozen=True)
+class RadarRegion:
+    """Area of ``radius_km`` around a location, optionally downscaled."""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+    downscale: int = 1
+
+    def crop_box(self, size):
+        """Return the pixel box of this region in a composite of ``size``."""
+        return _crop_box(
+            tuple(size), self.latitude, self.longitude, self.radius_km
+        )
+
+
+@lru_cache(maxsize=8)
+def _crop_box(size, latitude, longitude, radius_km):
+    width, height = size
+    west, south, east, north = RADAR_EXTENT
+    delta_lat = radius_km / KM_PER_DEGREE
+    delta_lon = radius_km / (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+    box = (
+        max(0, math.floor((longitude - delta_lon - west) / (east - west) * width)),
+        max(0, math.floor((north - latitude - delta_lat) / (north - south) * height)),
+        min(width, math.ceil((longitude + delta_lon - west) / (east - west) * width)),
+        min(
+            height, math.ceil((north - latitude + delta_lat) / (north - south) * height)
+        ),
+    )
+    if box[0] >= box[2] or box[1] >= box[3]:
+        _LOGGER.warning(
+            "Radar crop around %s, %s is outside the composite; using full frames",
+            latitude,
+            longitude,
+        )
+        return None
+    return box
+
+
+def location_pixel(size, latitude, longitude):
+    """Return the fractional ``(x, y)`` pixel of a location in a composite."""
+    width, height = size
+    west, south, east, north = RADAR_EXTENT
+    return (
+        (longitude - west) / (east - west) * width,
+        (north - latitude) / (north - south) * height,
+    )
+
+
+@lru_cache(maxsize=8)
+def disk_pixels(size, latitude, longitude, radius_km):
+    """
+    Return ``(ys, xs, centre)`` index arrays of the pixels within
+    ``radius_km`` of a location; ``centre`` is the position of the pixel
+    containing the location itself. Returns None outside the composite.
+    """
+    width, height = size
+    west, south, east, north = RADAR_EXTENT
+    x, y = location_pixel(size, latitude, longitude)
+    if not (0 <= x < width and 0 <= y < height):
+        return None
+    km_per_x = KM_PER_DEGREE * math.cos(math.radians(latitude)) * (east - west) / width
+    km_per_y = KM_PER_DEGREE * (north - south) / height
+    reach_x = int(radius_km / km_per_x) + 1
+    reach_y = int(radius_km / km_per_y) + 1
+    centre_x, centre_y = int(x), int(y)
+    ys, xs = np.mgrid[
+        max(0, centre_y - reach_y) : min(height, centre_y + reach_y + 1),
+        max(0, centre_x - reach_x) : min(width, centre_x + reach_x + 1),
+    ]
+    distance = np.hypot((xs + 0.5 - x) * km_per_x, (ys + 0.5 - y) * km_per_y)
+    # The location's own pixel always counts, even for a radius of zero
+    inside = (distance <= radius_km) | ((xs == centre_x) & (ys == centre_y))
+    ys, xs = ys[inside], xs[inside]
+    centre = int(np.flatnonzero((xs == centre_x) & (ys == centre_y))[0])
+    ys.setflags(write=False)
+    xs.setflags(write=False)
+    return ys, xs, centre
+
+
+def apply_region(images, region):
+    """Crop and downscale ``images`` to ``region``; None keeps them whole."""
+    if region is None or not images:
+        return images
+    box = region.crop_box(images[0].size)
+    if box is None:
+        return images
+    frames = [image.crop(box) for image in images]
+    if region.downscale > 1:
+        frames = [frame.convert("RGB").reduce(region.downscale) for frame in frames]
+    return frames
+
+
+def variant_factor(variant, width):
+    """Return the whole factor a frame of ``width`` is reduced by for ``variant``."""
+    if variant == RADAR_VARIANT_HALF:
+        return 2
+    return max(1, math.ceil(width / THUMBNAIL_WIDTH))
+
+
+def apply_variant(images, variant):
+    """Reduce the already cropped ``images`` to the size of ``variant``."""
+    if not images:
+        return images
+    factor = variant_factor(variant, images[0].size[0])
+    if factor == 1:
+        return images
+    return [image.convert("RGB").reduce(factor) for image in images]
@@ -0,0 +1,68 @@
+"""HTTP view serving the radar animations with cache validation."""
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import HomeAssistantView
+
+from .const import DATA_RADAR_IMAGES, DATA_RADAR_VIEW, DOMAIN
+
+RADAR_VIEW_URL = "/api/hungaromet/{file_name}"
+# A versioned URL always maps to the same bytes
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _matches(if_none_match, etag):
+    """Return True when an If-None-Match header value lists ``etag``."""
+    for value in if_none_match:
+        for tag in value.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == etag:
+                return True
+    return False
+
+
+class HungarometRadarView(HomeAssistantView):
+    """
+    Serve each radar image's animation from memory by its file name with
+    its content hash as ETag, answering revalidations with 304.
+    """
+
+    url = RADAR_VIEW_URL
+    name = "api:hungaromet:radar"
+    # Public HungaroMet data, like files served from /local/
+    requires_auth = False
+
+    def __init__(self, hass):
+        self.hass = hass
+
+    def _find_image(self, file_name):
+        for image in self.hass.data.get(DOMAIN, {}).get(DATA_RADAR_IMAGES, []):
+            if getattr(image, "file_name", None) == file_name and image.etag:
+                return image
+        return None
+
+    async def get(self, request, file_name):
+        """Return the animation, or 304 when the client's copy is current."""
+        image = self._find_image(file_name)
+        if image is None:
+            raise web.HTTPNotFound()
+        etag = f'"{image.etag}"'
+        headers = {
+            hdrs.ETAG: etag,
+            hdrs.CACHE_CONTROL: (
+                IMMUTABLE if request.query.get("v") == image.etag else "no-cache"
+            ),
+        }
+        if _matches(request.headers.getall(hdrs.IF_NONE_MATCH, []), etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=image.image(), content_type=image.content_type, headers=headers
+        )
+
+
+def async_register_radar_view(hass):
+    """Register the radar view once per Home Assistant instance."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_RADAR_VIEW):
+        return
+    hass.http.register_view(HungarometRadarView(hass))
+    domain_data[DATA_RADAR_VIEW] = True
@@ -0,0 +1,158 @@
+"""Subprocess that decodes and encodes radar frames off the Home Assistant process."""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from .radar_encoder import FORMAT_GIF, get_encoder
+    from .radar_frames import RadarFrameStore, decode_frame
+    from .radar_nowcast import forecast_frames
+    from .radar_overlay import apply_overlay
+    from .radar_region import apply_region, apply_variant
+except ImportError:  # pragma: no cover - standalone CLI usage
+    from radar_encoder import FORMAT_GIF, get_encoder
+    from radar_frames import RadarFrameStore, decode_frame
+    from radar_nowcast import forecast_frames
+    from radar_overlay import apply_overlay
+    from radar_region import apply_region, apply_variant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames decoded in the worker process, kept across builds there
+_FRAMES = RadarFrameStore()
+
+
+def encode_frames(
+    frames,
+    image_format=FORMAT_GIF,
+    region=None,
+    duration=1000,
+    end_delay=3000,
+    overlay=None,
+):
+    """
+    Crop the RadarFrames in ``frames`` to ``region``, draw ``overlay`` and
+    return the encoded animation. In the worker process, behind
+    ``build_animations``, the overlay layer stays cached between builds.
+    """
+    return encode_variants(
+        frames, image_format, region, duration, end_delay, overlay
+    )[0]
+
+
+def encode_variants(
+    frames,
+    image_format=FORMAT_GIF,
+    region=None,
+    duration=1000,
+    end_delay=3000,
+    overlay=None,
+    variants=(),
+):
+    """
+    Like ``encode_frames``, but return a list of the full animation followed
+    by one per size in ``variants``, all reduced from the same cropped frames.
+    """
+    images = apply_region([frame.image() for frame in frames], region)
+    if overlay is not None:
+        images = apply_overlay(images, overlay, region, frames[0].size)
+    encoder = get_encoder(image_format)
+    return [
+        encoder.encode(scaled, duration=duration, end_delay=end_delay)
+        for scaled in [images] + [apply_variant(images, name) for name in variants]
+    ]
+
+
+def build_animations(
+    pngs,
+    image_format=FORMAT_GIF,
+    region=None,
+    duration=1000,
+    end_delay=3000,
+    overlay=None,
+    variants=(),
+    nowcast=False,
+):
+    """
+    Decode the ``(name, PNG bytes)`` pairs of ``pngs`` not decoded in this
+    process yet, append the nowcast frames when asked and return the
+    animations of ``encode_variants``. Runs in the worker process, so only
+    bytes cross the process boundary, both ways.
+    """
+    frames = []
+    for name, data in pngs:
+        frame = _FRAMES.get(name)
+        if frame is None:
+            frame = decode_frame(name, data)
+            _FRAMES.put(frame)
+        frames.append(frame)
+    if nowcast:
+        frames = frames + forecast_frames(frames)
+    return encode_variants(
+        frames, image_format, region, duration, end_delay, overlay, variants
+    )
+
+
+class RadarEncodeWorker:
+    """
+    Single long-lived worker process for radar encoding. PIL work there
+    cannot hold the GIL of the event loop; the calling thread only waits.
+    It keeps its own decoded frames, so each build only sends PNG bytes.
+    """
+
+    def __init__(self):
+        self._executor = None
+        # Download threads decode through the worker concurrently
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Never fork a process running Home Assistant's threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _run(self, func, *args):
+        future = self._get_executor().submit(func, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool as err:
+            _LOGGER.error("Radar encode worker died: %s", err)
+            # Start a fresh worker on the next call
+            self.shutdown()
+            return None
+
+    def build_animations(
+        self,
+        pngs,
+        image_format=FORMAT_GIF,
+        region=None,
+        duration=1000,
+        end_delay=3000,
+        overlay=None,
+        variants=(),
+        nowcast=False,
+    ):
+        """Return the animations built by the worker, or None if it died."""
+        return self._run(
+            build_animations,
+            list(pngs),
+            image_format,
+            region,
+            duration,
+            end_delay,
+            overlay,
+            variants,
+            nowcast,
+        )
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,311 @@
+"""One scheduler for every recurring and retried job of the integration."""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SCHEDULER, DOMAIN
+from .executor import async_run_cpu
+
+_LOGGER = logging.getLogger(__name__)
+
+# Jobs costing CPU run one at a time; I/O jobs start as soon as they are due
+COST_CPU = "cpu"
+COST_IO = "io"
+
+# Lower runs first among jobs due together. The radar image fills the frame
+# store the precipitation sensor reads from.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+# Set while a CPU job holds the lane, so a CPU step it runs itself does not
+# queue behind it
+_IN_CPU_LANE = contextvars.ContextVar("hungaromet_in_cpu_lane", default=False)
+
+
+class ScheduledJob:
+    """An async action with its cadence, cost and run metrics."""
+
+    def __init__(self, name, action, cost, priority, times=None):
+        self.name = name
+        self.action = action
+        self.cost = cost
+        self.priority = priority
+        # (seconds, minutes, hours) matched in local time; None runs once
+        self.times = times
+        self.cancelled = False
+        self.ready = 0.0
+        self.runs = 0
+        self.coalesced = 0
+        self.last_duration_ms = None
+        self.max_wait_ms = 0.0
+
+    def next_due(self, after):
+        """Return the first matching UTC time after ``after``, or None."""
+        if self.times is None:
+            return None
+        start = dt_util.as_local(after.replace(microsecond=0) + timedelta(seconds=1))
+        return dt_util.as_utc(
+            dt_util.find_next_time_expression_time(start, *self.times)
+        )
+
+    def stats(self):
+        return {
+            "cost": self.cost,
+            "priority": self.priority,
+            "runs": self.runs,
+            "coalesced": self.coalesced,
+            "last_duration_ms": self.last_duration_ms,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+@dataclass(order=True)
+class _Entry:
+    due: datetime
+    priority: int
+    seq: int
+    job: ScheduledJob = field(compare=False)
+
+
+class HungarometScheduler:
+    """
+    Priority queue of the integration's jobs behind a single timer. Jobs due
+    together start in priority order and CPU-heavy ones are staggered, so
+    two of them never run at once; a job still queued or running when it is
+    due again is not queued a second time. Runs requested by a service go
+    through the same lane.
+    """
+
+    def __init__(self, hass):
+        self.hass = hass
+        self._jobs = {}
+        self._queue = []
+        self._seq = itertools.count()
+        self._timer = None
+        self._timer_due = None
+        # (priority, seq, job) of CPU jobs due but waiting for the lane
+        self._waiting = []
+        self._running = set()
+        # name -> future of the run of that name queued or running
+        self._runs = {}
+        self._cpu_job = None
+        self.peak_waiting = 0
+
+    def async_schedule(
+        self,
+        name,
+        action,
+        cost=COST_CPU,
+        priority=PRIORITY_NORMAL,
+        hour=None,
+        minute=None,
+        second=0,
+    ):
+        """
+        Run ``action()`` whenever the local time matches ``hour``, ``minute``
+        and ``second``, as ``async_track_time_change`` would. Returns a
+        callable removing the job.
+        """
+        times = (
+            dt_util.parse_time_expression(second, 0, 59),
+            dt_util.parse_time_expression(minute, 0, 59),
+            dt_util.parse_time_expression(hour, 0, 23),
+        )
+        job = ScheduledJob(name, action, cost, priority, times)
+        return self._add(job, job.next_due(dt_util.utcnow()))
+
+    def async_schedule_once(
+        self, name, delay, action, cost=COST_CPU, priority=PRIORITY_NORMAL
+    ):
+        """Run ``action()`` once in ``delay`` seconds; returns a cancel callable."""
+        job = ScheduledJob(name, action, cost, priority)
+        return self._add(job, dt_util.utcnow() + timedelta(seconds=delay))
+
+    async def async_run_now(self, name, action=None):
+        """
+        Run the job ``name`` now, or ``action()`` with its cost and priority,
+        and return the result. While a run of ``name`` is queued or running
+        the caller waits for that run instead of starting another.
+        """
+        job = self._jobs.get(name)
+        if action is None and job is not None:
+            return await asyncio.shield(self._dispatch(job))
+        return await self.async_run(
+            name,
+            action,
+            job.cost if job is not None else COST_CPU,
+            job.priority if job is not None else PRIORITY_NORMAL,
+        )
+
+    async def async_run(self, name, action, cost=COST_CPU, priority=PRIORITY_NORMAL):
+        """
+        Run ``action()`` once through the lane of ``cost`` and return the
+        result; runs of the same ``name`` coalesce as in ``async_run_now``.
+        """
+        if cost == COST_CPU and _IN_CPU_LANE.get():
+            return await action()
+        job = ScheduledJob(name, action, cost, priority)
+        return await asyncio.shield(self._dispatch(job))
+
+    def _add(self, job, due):
+        previous = self._jobs.get(job.name)
+        if previous is not None:
+            previous.cancelled = True
+        self._jobs[job.name] = job
+        self._push(job, due)
+        self._arm()
+
+        def remove():
+            job.cancelled = True
+            if self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+            self._arm()
+
+        return remove
+
+    def _push(self, job, due):
+        heapq.heappush(self._queue, _Entry(due, job.priority, next(self._seq), job))
+
+    def _arm(self):
+        """Point the timer at the earliest live entry."""
+        while self._queue and self._queue[0].job.cancelled:
+            heapq.heappop(self._queue)
+        due = self._queue[0].due if self._queue else None
+        if due == self._timer_due:
+            return
+        if self._timer is not None:
+            self._timer()
+        self._timer = self._timer_due = None
+        if due is not None:
+            self._timer = async_track_point_in_utc_time(
+                self.hass, self._handle_timer, due
+            )
+            self._timer_due = due
+
+    @callback
+    def _handle_timer(self, now):
+        self._timer = self._timer_due = None
+        self.async_run_due(now)
+
+    @callback
+    def async_run_due(self, now):
+        """Start the jobs due at ``now`` and queue their next runs."""
+        due = []
+        while self._queue and self._queue[0].due <= now:
+            entry = heapq.heappop(self._queue)
+            job = entry.job
+            if job.cancelled:
+                continue
+            due.append(entry)
+            next_due = job.next_due(now)
+            if next_due is not None:
+                self._push(job, next_due)
+            elif self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+        for entry in sorted(due, key=lambda entry: (entry.priority, entry.seq)):
+            self._dispatch(entry.job)
+        self._arm()
+
+    def _dispatch(self, job):
+        """Queue a run of ``job`` and return the future of its result."""
+        pending = self._runs.get(job.name)
+        if pending is not None:
+            # The pending run picks up whatever this one would have
+            job.coalesced += 1
+            return pending
+        future = self._runs[job.name] = self.hass.loop.create_future()
+        job.ready = time.monotonic()
+        if job.cost != COST_CPU:
+            self._start(job)
+            return future
+        heapq.heappush(self._waiting, (job.priority, next(self._seq), job))
+        self.peak_waiting = max(self.peak_waiting, len(self._waiting))
+        self._start_next_cpu()
+        return future
+
+    def _start_next_cpu(self):
+        while self._cpu_job is None and self._waiting:
+            _, _, job = heapq.heappop(self._waiting)
+            if job.cancelled:
+                self._runs.pop(job.name).set_result(None)
+                continue
+            self._cpu_job = job
+            self._start(job)
+
+    def _start(self, job):
+        self._running.add(job.name)
+        self.hass.async_create_task(self._async_run(job))
+
+    async def _async_run(self, job):
+        started = time.monotonic()
+        job.max_wait_ms = max(job.max_wait_ms, round((started - job.ready) * 1000, 1))
+        future = self._runs[job.name]
+        if job.cost == COST_CPU:
+            _IN_CPU_LANE.set(True)
+        try:
+            future.set_result(await job.action())
+        except Exception as err:
+            _LOGGER.exception("HungaroMet job %s failed", job.name)
+            future.set_exception(err)
+            # Logged above; a caller awaiting the run still gets the error
+            future.exception()
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._runs[job.name]
+            job.runs += 1
+            job.last_duration_ms = round((time.monotonic() - started) * 1000, 1)
+            self._running.discard(job.name)
+            if self._cpu_job is job:
+                self._cpu_job = None
+                self._start_next_cpu()
+
+    def stats(self):
+        """Return the queued runs in order, the CPU lane and per-job metrics."""
+        queue = sorted(entry for entry in self._queue if not entry.job.cancelled)
+        return {
+            "queue": [
+                {
+                    "job": entry.job.name,
+                    "due": entry.due.isoformat(),
+                    "cost": entry.job.cost,
+                    "priority": entry.priority,
+                }
+                for entry in queue
+            ],
+            "running": sorted(self._running),
+            "waiting": [job.name for _, _, job in sorted(self._waiting)],
+            "peak_waiting": self.peak_waiting,
+            "jobs": {name: job.stats() for name, job in sorted(self._jobs.items())},
+        }
+
+
+def get_scheduler(hass):
+    """Return the scheduler of ``hass``, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = domain_data[DATA_SCHEDULER] = HungarometScheduler(hass)
+    return scheduler
+
+
+async def async_run_cpu_job(hass, name, func, *args, priority=PRIORITY_NORMAL):
+    """
+    Run ``func(*args)`` on the CPU pool once the CPU lane of the scheduler
+    is free, so it never runs beside a scheduled CPU job.
+    """
+    return await get_scheduler(hass).async_run(
+        name, partial(async_run_cpu, hass, func, *args), COST_CPU, priority
+    )
@@ -2,28 +2,43 @@
 
 import logging
 from datetime import datetime, timedelta
+from functools import partial
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_call_later, async_track_time_change
-
-from .const import CONF_DISTANCE_KM, DEFAULT_DISTANCE_KM, DEFAULT_NAME, DOMAIN
-from .daily_sensor import HungarometWeatherDailySensor
-from .hourly_sensor import HungarometWeatherHourlySensor
-from .station_info_sensor import HungarometStationInfoSensor
-from .ten_minutes_sensor import HungarometWeatherTenMinutesSensor
-from .weather_data import (
-    process_daily_data,
-    process_hourly_data,
-    process_ten_minutes_data,
+from homeassistant.const import CONF_NAME, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    CONF_DISTANCE_KM,
+    CONF_RADAR_SENSOR_RADIUS_KM,
+    DATASET_DAILY,
+    DATASET_HOURLY,
+    DATASET_TEN_MINUTES,
+    DEFAULT_DISTANCE_KM,
+    DEFAULT_NAME,
+    DEFAULT_RADAR_SENSOR_RADIUS_KM,
+)
+from .hub import async_get_hub, async_release_hub
+from .radar_precipitation_sensor import HungarometRadarPrecipitationSensor
+from .scheduler import COST_IO, get_scheduler
+from .sensor_descriptions import SENSOR_DESCRIPTIONS, describe_key
+from .services import (
+    async_register_platform_service,
+    async_update_dataset,
+    dataset_job_name,
 )
+from .station_info_sensor import HungarometStationInfoSensor
+from .weather_sensor import HungarometWeatherSensor
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORM_LOCATION = "platform"
+# The daily feed is sometimes published late in the morning
+DAILY_RETRY_SECONDS = 1800
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
     vol.Optional(CONF_DISTANCE_KM, default=DEFAULT_DISTANCE_KM): vol.All(
@@ -66,164 +81,35 @@ WE_CODES = {
 }
 
 
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    distance_km = config.get(CONF_DISTANCE_KM, DEFAULT_DISTANCE_KM)
-    sensors = []
-    try:
-        daily_data, station_info = await hass.async_add_executor_job(
-            process_daily_data, hass, distance_km
-        )
-        hourly_data, _ = await hass.async_add_executor_job(process_hourly_data, hass)
-        ten_minutes_data, _ = await hass.async_add_executor_job(
-            process_ten_minutes_data, hass, distance_km
-        )
-
-        all_keys = set(
-            list(daily_data.keys())
-            + list(hourly_data.keys())
-            + list(ten_minutes_data.keys())
-        )
-        for key in all_keys:
-            unit = None
-            if key in [
-                "average_t",
-                "average_tn",
-                "average_tx",
-                "average_et5",
-                "average_et10",
-                "average_et20",
-                "average_et50",
-                "average_et100",
-                "average_tsn24",
-                "average_ta",
-                "average_tsn",
-                "average_tviz",
-            ]:
-                unit = "°C"
-            elif key in [
-                "average_rau",
-                "average_upe",
-                "average_water_balance",
-                "average_r",
-            ]:
-                unit = "mm"
-            elif key in ["average_sr"]:
-                unit = "J/cm²"
-            elif key in ["average_sr_mj"]:
-                unit = "MJ/m²"
-            elif key in ["average_u"]:
-                unit = "%"
-            elif key in ["average_f", "average_fs", "average_fx"]:
-                unit = "m/s"
-            elif key in ["average_fd", "average_fsd", "average_fxd"]:
-                unit = "°"
-            elif key in ["average_sg"]:
-                unit = "nSv/h"
-            elif key in ["average_suv"]:
-                unit = "MED"
-            if key in daily_data:
-                sensors.append(
-                    HungarometWeatherDailySensor(hass, key, daily_data[key], unit, key)
-                )
-            elif key in hourly_data:
-                sensors.append(
-                    HungarometWeatherHourlySensor(
-                        hass, key, hourly_data[key], unit, key
-                    )
-                )
-            elif key in ten_minutes_data:
-                sensors.append(
-                    HungarometWeatherTenMinutesSensor(
-                        hass, key, ten_minutes_data[key], unit, key
-                    )
-                )
-        sensors.append(
-            HungarometStationInfoSensor(
-                hass, "HungaroMet Állomások", station_info, "platform"
-            )
-        )
-    except Exception as err:  # pragma: no cover - defensive logging
-        _LOGGER.error("Failed to fetch/process weather data: %s", err)
-        return
-    async_add_entities(sensors, True)
-
-    # Register update service
-    async def handle_update_service(call):
-        for sensor in sensors:
-            if sensor.hass is None or not getattr(sensor, "_added", False):
-                continue
-            await sensor.async_update_data()
-
-    hass.services.async_register("hungaromet_weather", "update", handle_update_service)
-
-    sensor_class_map = {
-        "daily": HungarometWeatherDailySensor,
-        "hourly": HungarometWeatherHourlySensor,
-        "ten_minutes": HungarometWeatherTenMinutesSensor,
-    }
-
-    # Optimized scheduled updates - fetch once, update all sensors
-    async def update_sensors_by_type(data_type: str):
-        """Fetch data once and update all matching sensors."""
-        target_cls = sensor_class_map.get(data_type)
-        if target_cls is None:
-            _LOGGER.debug(
-                "HungaroMet: unsupported sensor type '%s' requested", data_type
-            )
-            return
-
-        active_sensors = [
+def _find_daily_time_sensor(sensors):
+    return next(
+        (
             sensor
             for sensor in sensors
-            if isinstance(sensor, target_cls)
-            and sensor.hass is not None
-            and getattr(sensor, "_added", False)
-            and hasattr(sensor, "_key")
-        ]
+            if isinstance(sensor, HungarometWeatherSensor)
+            and sensor._dataset == DATASET_DAILY
+            and sensor._key == "time"
+        ),
+        None,
+    )
 
-        if not active_sensors:
-            _LOGGER.debug(
-                "HungaroMet: skipping %s update because no active entities are enabled",
-                data_type,
-            )
-            return
 
-        try:
-            # Fetch data once
-            if data_type == "hourly":
-                data, _ = await hass.async_add_executor_job(
-                    process_hourly_data, hass, DEFAULT_DISTANCE_KM
-                )
-            elif data_type == "ten_minutes":
-                data, _ = await hass.async_add_executor_job(
-                    process_ten_minutes_data, hass, DEFAULT_DISTANCE_KM
-                )
-            elif data_type == "daily":
-                data, _ = await hass.async_add_executor_job(
-                    process_daily_data, hass, DEFAULT_DISTANCE_KM
-                )
-            else:
-                return
-
-            # Update all matching sensors with the fetched data
-            for sensor in active_sensors:
-                value = data.get(sensor._key) or data.get(f"average_{sensor._key}")
-                if value is None:
-                    continue
-                sensor._state = value
-                sensor.async_write_ha_state()
-        except Exception as err:  # pragma: no cover - defensive logging
-            _LOGGER.error("Error updating %s sensors: %s", data_type, err)
-
-    # Schedule daily update
-    async def check_and_reschedule_daily(now):
-        await update_sensors_by_type("daily")
-        time_sensor = next(
-            (s for s in sensors if getattr(s, "_key", None) == "time"), None
-        )
-        if time_sensor and time_sensor.state:
+def _async_schedule_updates(hass, location, sensors):
+    """
+    Refresh the datasets of ``location`` from the shared scheduler, which
+    staggers them with the radar jobs. Returns a callable removing them.
+    """
+    scheduler = get_scheduler(hass)
+    removers = []
+    retry = None
+
+    async def update_daily():
+        nonlocal retry
+        result = await async_update_dataset(location, DATASET_DAILY)
+        time_sensor = _find_daily_time_sensor(sensors)
+        if time_sensor and time_sensor.native_value:
             try:
-                data_date = datetime.strptime(time_sensor.state, "%Y-%m-%d").date()
+                data_date = time_sensor.native_value
                 yesterday = datetime.now().date() - timedelta(days=1)
                 if data_date != yesterday:
                     _LOGGER.warning(
@@ -232,515 +118,138 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
                         data_date,
                         yesterday,
                     )
-
-                    # Schedule a one-off retry using async_call_later
-                    async def retry_daily(_):
-                        await check_and_reschedule_daily(None)
-
-                    async_call_later(hass, 1800, retry_daily)
+                    # Replaces the previous retry instead of piling them up
+                    if retry is not None:
+                        retry()
+                    retry = scheduler.async_schedule_once(
+                        f"{location.key} daily retry",
+                        DAILY_RETRY_SECONDS,
+                        update_daily,
+                        cost=COST_IO,
+                    )
             except Exception as err:  # pragma: no cover - defensive logging
                 _LOGGER.error("Failed to parse date from time sensor: %s", err)
+        # Also answers an update service call coalesced into this run
+        return result
+
+    # Feed refreshes mostly wait on the network and parse on the CPU pool,
+    # so they need not hold the scheduler's CPU lane
+    removers.extend((
+        scheduler.async_schedule(
+            dataset_job_name(location, DATASET_DAILY),
+            update_daily,
+            cost=COST_IO,
+            hour=9,
+            minute=40,
+            second=0,
+        ),
+        scheduler.async_schedule(
+            dataset_job_name(location, DATASET_HOURLY),
+            partial(async_update_dataset, location, DATASET_HOURLY),
+            cost=COST_IO,
+            minute=20,
+            second=59,
+        ),
+        scheduler.async_schedule(
+            dataset_job_name(location, DATASET_TEN_MINUTES),
+            partial(async_update_dataset, location, DATASET_TEN_MINUTES),
+            cost=COST_IO,
+            minute=range(0, 60, 10),
+            second=59,
+        ),
+    ))
+
+    def remove():
+        for remover in removers:
+            remover()
+        if retry is not None:
+            retry()
+
+    return remove
 
-    async_track_time_change(
-        hass, check_and_reschedule_daily, hour=9, minute=40, second=0
-    )
-
-    # Schedule hourly update - optimized to fetch once
-    async def check_and_reschedule_hourly(now):
-        await update_sensors_by_type("hourly")
-
-    async_track_time_change(hass, check_and_reschedule_hourly, minute=20, second=59)
 
-    # Schedule ten minutes update - optimized to fetch once
-    async def check_and_reschedule_ten_minutes(now):
-        await update_sensors_by_type("ten_minutes")
-
-    async_track_time_change(
-        hass, check_and_reschedule_ten_minutes, minute=range(0, 60, 10), second=59
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    distance_km = config.get(CONF_DISTANCE_KM, DEFAULT_DISTANCE_KM)
+    location = async_get_hub(hass).register(
+        PLATFORM_LOCATION, hass.config.latitude, hass.config.longitude, distance_km
     )
-
-
-async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
-):
     sensors = []
     try:
-        data, station_info = await hass.async_add_executor_job(
-            process_daily_data, hass, DEFAULT_DISTANCE_KM
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi mérési időpont", data["time"], None, "time"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi párolgás", data["average_upe"], "mm", "average_upe"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi csapadékösszeg", data["average_rau"], "mm", "average_rau"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi vízegyenleg",
-                data["average_water_balance"],
-                "mm",
-                "average_water_balance",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi átlaghőmérséklet", data["average_t"], "°C", "t"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi minimumhőmérséklet", data["average_tn"], "°C", "tn"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi maximumhőmérséklet", data["average_tx"], "°C", "tx"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass, "Napi globálsugárzás összeg", data["average_sr"], "J/cm²", "sr"
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi globálsugárzás összeg (MJ/m²)",
-                data["average_sr_mj"],
-                "MJ/m²",
-                "sr_mj",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi átlagos 5 cm-es talajhőmérséklet",
-                data["average_et5"],
-                "°C",
-                "et5",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi átlagos 10 cm-es talajhőmérséklet",
-                data["average_et10"],
-                "°C",
-                "et10",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi átlagos 20 cm-es talajhőmérséklet",
-                data["average_et20"],
-                "°C",
-                "et20",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi átlagos 50 cm-es talajhőmérséklet",
-                data["average_et50"],
-                "°C",
-                "et50",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Napi átlagos 100 cm-es talajhőmérséklet",
-                data["average_et100"],
-                "°C",
-                "et100",
-            )
-        )
-        sensors.append(
-            HungarometWeatherDailySensor(
-                hass,
-                "Felszínközeli hőmérséklet napi minimuma",
-                data["average_tsn24"],
-                "°C",
-                "tsn24",
-            )
-        )
-        sensors.append(
-            HungarometStationInfoSensor(
-                hass, "HungaroMet Állomások", station_info, "daily"
-            )
-        )
-
-        data, station_info = await hass.async_add_executor_job(
-            process_hourly_data, hass, DEFAULT_DISTANCE_KM
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás mérési időpont", data["time"], None, "time"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás csapadékösszeg", data["average_r"], "mm", "r"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás pillanatnyi hőmérséklet", data["average_t"], "°C", "t"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás átlaghőmérséklet", data["average_ta"], "°C", "ta"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás minimumhőmérséklet", data["average_tn"], "°C", "tn"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás maximumhőmérséklet", data["average_tx"], "°C", "tx"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás pillanatnyi relatív nedvesség", data["average_u"], "%", "u"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás átlagos gammadózis", data["average_sg"], "nSv/h", "sg"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás globálsugárzás összeg", data["average_sr"], "J/cm²", "sr"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass,
-                "Órás globálsugárzás összeg (MJ/m²)",
-                data["average_sr_mj"],
-                "MJ/m²",
-                "sr_mj",
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás UV sugárzás összeg", data["average_suv"], "MED", "suv"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás szinoptikus szélsebesség", data["average_fs"], "m/s", "fs"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás szinoptikus szélirány", data["average_fsd"], "°", "fsd"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass,
-                "Órás maximális széllökés sebessége",
-                data["average_fx"],
-                "m/s",
-                "fx",
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás maximális széllökés iránya", data["average_fxd"], "°", "fxd"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás átlagos szélsebesség", data["average_f"], "m/s", "f"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás átlagos szélirány", data["average_fd"], "°", "fd"
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass,
-                "Órás felszínközeli hőmérséklet minimuma",
-                data["average_tsn"],
-                "C",
-                "tsn",
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass,
-                "Órás pillanatnyi vízhőmérséklet",
-                data["average_tviz"],
-                "C",
-                "tviz",
-            )
-        )
-        sensors.append(
-            HungarometWeatherHourlySensor(
-                hass, "Órás pillanatnyi időkép kódja", data["we"], None, "we"
-            )
-        )
-        sensors.append(
-            HungarometStationInfoSensor(
-                hass, "HungaroMet Állomások", station_info, "hourly"
-            )
-        )
-
-        data, station_info = await hass.async_add_executor_job(
-            process_ten_minutes_data, hass, DEFAULT_DISTANCE_KM
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces mérési időpont", data["time"], None, "time"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces csapadékösszeg", data["average_r"], "mm", "r"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces pillanatnyi hőmérséklet", data["average_t"], "°C", "t"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces átlaghőmérséklet", data["average_ta"], "°C", "ta"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces minimumhőmérséklet", data["average_tn"], "°C", "tn"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces maximumhőmérséklet", data["average_tx"], "°C", "tx"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces pillanatnyi relatív nedvesség",
-                data["average_u"],
-                "%",
-                "u",
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces átlagos gammadózis", data["average_sg"], "nSv/h", "sg"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces globálsugárzás összeg",
-                data["average_sr"],
-                "J/cm²",
-                "sr",
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces globálsugárzás összeg (MJ/m²)",
-                data["average_sr_mj"],
-                "MJ/m²",
-                "sr_mj",
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces UV sugárzás összeg", data["average_suv"], "MED", "suv"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces maximális széllökés sebessége",
-                data["average_fx"],
-                "m/s",
-                "fx",
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces maximális széllökés iránya",
-                data["average_fxd"],
-                "°",
-                "fxd",
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces átlagos szélsebesség", data["average_fs"], "m/s", "fs"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass, "Tízperces átlagos szélirány", data["average_fsd"], "°", "fsd"
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces felszínközeli hőmérséklet minimuma",
-                data["average_tsn"],
-                "C",
-                "tsn",
-            )
-        )
-        sensors.append(
-            HungarometWeatherTenMinutesSensor(
-                hass,
-                "Tízperces pillanatnyi vízhőmérséklet",
-                data["average_tviz"],
-                "C",
-                "tviz",
-            )
-        )
+        daily_data, station_info = await location.async_get_data(DATASET_DAILY)
+        hourly_data, _ = await location.async_get_data(DATASET_HOURLY)
+        ten_minutes_data, _ = await location.async_get_data(DATASET_TEN_MINUTES)
+
+        datasets = (
+            (DATASET_DAILY, daily_data),
+            (DATASET_HOURLY, hourly_data),
+            (DATASET_TEN_MINUTES, ten_minutes_data),
+        )
+        seen_keys = set()
+        for data_type, data in datasets:
+            for key in data:
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+                sensors.append(
+                    HungarometWeatherSensor(
+                        hass, describe_key(data_type, key), data, location
+                    )
+                )
         sensors.append(
             HungarometStationInfoSensor(
-                hass, "HungaroMet Állomások", station_info, "ten_minutes"
+                hass, "HungaroMet Állomások", station_info, "platform", location
             )
         )
-
     except Exception as err:  # pragma: no cover - defensive logging
         _LOGGER.error("Failed to fetch/process weather data: %s", err)
+        async_release_hub(hass, PLATFORM_LOCATION)
         return
+    location.entities = sensors
     async_add_entities(sensors, True)
 
-    async def handle_update_service(call):
-        for sensor in sensors:
-            if sensor.hass is None or not getattr(sensor, "_added", False):
-                continue
-            await sensor.async_update_data()
-
-    hass.services.async_register(DOMAIN, "update", handle_update_service)
-
-    sensor_class_map = {
-        "daily": HungarometWeatherDailySensor,
-        "hourly": HungarometWeatherHourlySensor,
-        "ten_minutes": HungarometWeatherTenMinutesSensor,
-    }
+    async_register_platform_service(hass, "hungaromet_weather", location)
+    remove_updates = _async_schedule_updates(hass, location, sensors)
 
-    # Optimized scheduled updates - fetch once, update all sensors
-    async def update_sensors_by_type(data_type: str):
-        """Fetch data once and update all matching sensors."""
-        target_cls = sensor_class_map.get(data_type)
-        if target_cls is None:
-            _LOGGER.debug(
-                "HungaroMet: unsupported sensor type '%s' requested", data_type
-            )
-            return
+    # YAML platforms are never unloaded; release the location when Home
+    # Assistant stops, as config entries do on unload
+    @callback
+    def _async_handle_stop(event: Event) -> None:
+        remove_updates()
+        async_release_hub(hass, PLATFORM_LOCATION)
 
-        active_sensors = [
-            sensor
-            for sensor in sensors
-            if isinstance(sensor, target_cls)
-            and sensor.hass is not None
-            and getattr(sensor, "_added", False)
-            and hasattr(sensor, "_key")
-        ]
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_handle_stop)
 
-        if not active_sensors:
-            _LOGGER.debug(
-                "HungaroMet: skipping %s update because no active entities are enabled",
-                data_type,
-            )
-            return
 
-        try:
-            # Fetch data once
-            if data_type == "hourly":
-                data, _ = await hass.async_add_executor_job(
-                    process_hourly_data, hass, DEFAULT_DISTANCE_KM
-                )
-            elif data_type == "ten_minutes":
-                data, _ = await hass.async_add_executor_job(
-                    process_ten_minutes_data, hass, DEFAULT_DISTANCE_KM
-                )
-            elif data_type == "daily":
-                data, _ = await hass.async_add_executor_job(
-                    process_daily_data, hass, DEFAULT_DISTANCE_KM
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
+):
+    location = async_get_hub(hass).locations[entry.entry_id]
+    sensors = []
+    try:
+        for data_type, descriptions in SENSOR_DESCRIPTIONS.items():
+            data, station_info = await location.async_get_data(data_type)
+            sensors.extend(
+                HungarometWeatherSensor(hass, description, data, location)
+                for description in descriptions
+            )
+            sensors.append(
+                HungarometStationInfoSensor(
+                    hass, "HungaroMet Állomások", station_info, data_type, location
                 )
-            else:
-                return
-
-            # Update all matching sensors with the fetched data
-            for sensor in active_sensors:
-                value = data.get(sensor._key) or data.get(f"average_{sensor._key}")
-                if value is None:
-                    continue
-                sensor._state = value
-                sensor.async_write_ha_state()
-        except Exception as err:  # pragma: no cover - defensive logging
-            _LOGGER.error("Error updating %s sensors: %s", data_type, err)
-
-    def schedule_update(now):
-        async def check_and_reschedule():
-            await update_sensors_by_type("daily")
-            time_sensor = next(
-                (s for s in sensors if getattr(s, "_key", None) == "time"), None
             )
-            if time_sensor and time_sensor.state:
-                try:
-                    data_date = datetime.strptime(time_sensor.state, "%Y-%m-%d").date()
-                    yesterday = datetime.now().date() - timedelta(days=1)
-                    if data_date != yesterday:
-                        _LOGGER.warning(
-                            "HungaroMet data not updated yet (got %s, expected %s), "
-                            "will retry in 30 minutes.",
-                            data_date,
-                            yesterday,
-                        )
-                        async_call_later(
-                            hass, 1800, lambda _: hass.add_job(check_and_reschedule)
-                        )
-                except Exception as err:  # pragma: no cover - defensive logging
-                    _LOGGER.error("Failed to parse date from time sensor: %s", err)
-
-        hass.add_job(check_and_reschedule)
-
-    async_track_time_change(hass, schedule_update, hour=9, minute=40, second=0)
-
-    def schedule_hourly_update(now):
-        async def check_and_reschedule_hourly():
-            await update_sensors_by_type("hourly")
-
-        hass.add_job(check_and_reschedule_hourly)
-
-    async_track_time_change(hass, schedule_hourly_update, minute=20, second=59)
-
-    def schedule_ten_minutes_update(now):
-        async def check_and_reschedule_ten_minutes():
-            await update_sensors_by_type("ten_minutes")
-
-        hass.add_job(check_and_reschedule_ten_minutes)
-
-    async_track_time_change(
-        hass, schedule_ten_minutes_update, minute=range(0, 60, 10), second=59
+    except Exception as err:  # pragma: no cover - defensive logging
+        _LOGGER.error("Failed to fetch/process weather data: %s", err)
+        return
+    config = {**entry.data, **entry.options}
+    # Reads the frames the radar image already downloaded; no extra requests
+    sensors.append(
+        HungarometRadarPrecipitationSensor(
+            hass,
+            location,
+            config.get(CONF_RADAR_SENSOR_RADIUS_KM, DEFAULT_RADAR_SENSOR_RADIUS_KM),
+        )
     )
+    location.entities = sensors
+    async_add_entities(sensors, True)
+
+    entry.async_on_unload(_async_schedule_updates(hass, location, sensors))
@@ -0,0 +1,310 @@
+"""Declarative description table for the HungaroMet weather sensors."""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import DATASET_DAILY, DATASET_HOURLY, DATASET_TEN_MINUTES
+
+_LOGGER = logging.getLogger(__name__)
+
+DISPLAY_PRECISION = 2
+
+DATASET_PERIODS = {
+    DATASET_DAILY: timedelta(days=1),
+    DATASET_HOURLY: timedelta(hours=1),
+    DATASET_TEN_MINUTES: timedelta(minutes=10),
+}
+
+_TEMPERATURE = (SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT)
+_WIND_SPEED = (SensorDeviceClass.WIND_SPEED, SensorStateClass.MEASUREMENT)
+_PRECIPITATION_TOTAL = (SensorDeviceClass.PRECIPITATION, SensorStateClass.TOTAL)
+_MEASUREMENT = (None, SensorStateClass.MEASUREMENT)
+_TOTAL = (None, SensorStateClass.TOTAL)
+# Bearings wrap at 360°, so their mean and min/max statistics would be
+# wrong; this Home Assistant has no angle state class to use instead
+_WIND_DIRECTION = (None, None)
+
+# Device and state class of every measured column aggregated by weather_data.
+# Sums over the reporting period are totals whose last_reset marks the period
+# start; everything else is an instantaneous or averaged measurement.
+KEY_CLASSES = {
+    **dict.fromkeys(
+        [
+            "t",
+            "ta",
+            "tn",
+            "tx",
+            "et5",
+            "et10",
+            "et20",
+            "et50",
+            "et100",
+            "tsn",
+            "tsn24",
+            "tviz",
+        ],
+        _TEMPERATURE,
+    ),
+    "u": (SensorDeviceClass.HUMIDITY, SensorStateClass.MEASUREMENT),
+    "r": _PRECIPITATION_TOTAL,
+    "rau": _PRECIPITATION_TOTAL,
+    "upe": _TOTAL,
+    "water_balance": _TOTAL,
+    "sr": _TOTAL,
+    "sr_mj": _TOTAL,
+    "suv": _TOTAL,
+    "sg": _MEASUREMENT,
+    **dict.fromkeys(["f", "fs", "fx"], _WIND_SPEED),
+    **dict.fromkeys(["fd", "fsd", "fxd"], _WIND_DIRECTION),
+}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def parse_date(value: Any) -> date | None:
+    """Convert the ISO date of the daily dataset into a ``date``."""
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError as err:
+        _LOGGER.warning("Failed to convert daily measurement date: %s", err)
+        return None
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """Convert an ISO measurement time into a timezone-aware ``datetime``."""
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError as err:
+        _LOGGER.warning("Failed to convert measurement time: %s", err)
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.UTC)
+    return parsed
+
+
+def period_start(dataset: str, measured: Any) -> datetime | None:
+    """Return the start of the accumulation period ending at ``measured``.
+
+    Daily totals cover the whole reported day, hourly and ten-minute totals
+    the period that ends at the measurement time.
+    """
+    if measured is None:
+        return None
+    if dataset == DATASET_DAILY:
+        day = parse_date(measured)
+        if day is None:
+            return None
+        return datetime.combine(day, time.min, tzinfo=dt_util.UTC)
+    end = parse_timestamp(measured)
+    if end is None:
+        return None
+    return end - DATASET_PERIODS[dataset]
+
+
+@dataclass(frozen=True, kw_only=True)
+class HungarometSensorEntityDescription(SensorEntityDescription):
+    """Describes a HungaroMet sensor and the dataset feeding it.
+
+    ``value_fn`` turns the raw dataset value into the native sensor value
+    when data is ingested, so state reads never have to convert it again.
+    """
+
+    dataset: str
+    value_fn: Callable[[Any], Any] = _identity
+
+
+DATASET_DEVICES = {
+    DATASET_DAILY: {
+        "id": "hungaromet_weather",
+        "name": "HungaroMet",
+        "model": "Weather Sensors",
+    },
+    DATASET_HOURLY: {
+        "id": "hungaromet_weather_hourly",
+        "name": "HungaroMet órás",
+        "model": "Órás időjárás szenzorok",
+    },
+    DATASET_TEN_MINUTES: {
+        "id": "hungaromet_weather_ten_minutes",
+        "name": "HungaroMet 10 perces",
+        "model": "10 perces időjárás szenzorok",
+    },
+}
+
+# Units of the aggregated ``average_*`` keys produced by ``weather_data``
+UNITS_BY_KEY = {
+    **dict.fromkeys(
+        [
+            "average_t",
+            "average_tn",
+            "average_tx",
+            "average_et5",
+            "average_et10",
+            "average_et20",
+            "average_et50",
+            "average_et100",
+            "average_tsn24",
+            "average_ta",
+            "average_tsn",
+            "average_tviz",
+        ],
+        "°C",
+    ),
+    **dict.fromkeys(
+        ["average_rau", "average_upe", "average_water_balance", "average_r"], "mm"
+    ),
+    "average_sr": "J/cm²",
+    "average_sr_mj": "MJ/m²",
+    "average_u": "%",
+    **dict.fromkeys(["average_f", "average_fs", "average_fx"], "m/s"),
+    **dict.fromkeys(["average_fd", "average_fsd", "average_fxd"], "°"),
+    "average_sg": "nSv/h",
+    "average_suv": "MED",
+}
+
+
+TIME_OPTIONS = {
+    DATASET_DAILY: {"device_class": SensorDeviceClass.DATE, "value_fn": parse_date},
+    DATASET_HOURLY: {
+        "device_class": SensorDeviceClass.TIMESTAMP,
+        "value_fn": parse_timestamp,
+    },
+    DATASET_TEN_MINUTES: {
+        "device_class": SensorDeviceClass.TIMESTAMP,
+        "value_fn": parse_timestamp,
+    },
+}
+
+
+def _default_options(dataset, key, unit):
+    if key == "time":
+        return TIME_OPTIONS[dataset]
+    options = {}
+    if unit is not None:
+        options["suggested_display_precision"] = DISPLAY_PRECISION
+        device_class, state_class = KEY_CLASSES.get(
+            key.removeprefix("average_"), (None, None)
+        )
+        options["device_class"] = device_class
+        options["state_class"] = state_class
+    return options
+
+
+def describe(dataset, key, name, unit, **options):
+    """Build one description, filling in the defaults for its kind of key."""
+    return HungarometSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement=unit,
+        dataset=dataset,
+        **{**_default_options(dataset, key, unit), **options},
+    )
+
+
+def describe_key(dataset, key):
+    """Build a description for a raw data key of the YAML platform."""
+    return describe(dataset, key, key, UNITS_BY_KEY.get(key))
+
+
+def _describe(dataset, entries):
+    return tuple(
+        describe(dataset, key, name, unit, **options)
+        for key, name, unit, options in entries
+    )
+
+
+DAILY_SENSORS = _describe(
+    DATASET_DAILY,
+    [
+        ("time", "Napi mérési időpont", None, {}),
+        ("average_upe", "Napi párolgás", "mm", {}),
+        ("average_rau", "Napi csapadékösszeg", "mm", {}),
+        ("average_water_balance", "Napi vízegyenleg", "mm", {}),
+        ("t", "Napi átlaghőmérséklet", "°C", {}),
+        ("tn", "Napi minimumhőmérséklet", "°C", {}),
+        ("tx", "Napi maximumhőmérséklet", "°C", {}),
+        ("sr", "Napi globálsugárzás összeg", "J/cm²", {}),
+        ("sr_mj", "Napi globálsugárzás összeg (MJ/m²)", "MJ/m²", {}),
+        *(
+            (
+                f"et{depth}",
+                f"Napi átlagos {depth} cm-es talajhőmérséklet",
+                "°C",
+                {"entity_registry_enabled_default": False},
+            )
+            for depth in (5, 10, 20, 50, 100)
+        ),
+        (
+            "tsn24",
+            "Felszínközeli hőmérséklet napi minimuma",
+            "°C",
+            {"entity_registry_enabled_default": False},
+        ),
+    ],
+)
+
+HOURLY_SENSORS = _describe(
+    DATASET_HOURLY,
+    [
+        ("time", "Órás mérési időpont", None, {}),
+        ("r", "Órás csapadékösszeg", "mm", {}),
+        ("t", "Órás pillanatnyi hőmérséklet", "°C", {}),
+        ("ta", "Órás átlaghőmérséklet", "°C", {}),
+        ("tn", "Órás minimumhőmérséklet", "°C", {}),
+        ("tx", "Órás maximumhőmérséklet", "°C", {}),
+        ("u", "Órás pillanatnyi relatív nedvesség", "%", {}),
+        ("sg", "Órás átlagos gammadózis", "nSv/h", {}),
+        ("sr", "Órás globálsugárzás összeg", "J/cm²", {}),
+        ("sr_mj", "Órás globálsugárzás összeg (MJ/m²)", "MJ/m²", {}),
+        ("suv", "Órás UV sugárzás összeg", "MED", {}),
+        ("fs", "Órás szinoptikus szélsebesség", "m/s", {}),
+        ("fsd", "Órás szinoptikus szélirány", "°", {}),
+        ("fx", "Órás maximális széllökés sebessége", "m/s", {}),
+        ("fxd", "Órás maximális széllökés iránya", "°", {}),
+        ("f", "Órás átlagos szélsebesség", "m/s", {}),
+        ("fd", "Órás átlagos szélirány", "°", {}),
+        ("tsn", "Órás felszínközeli hőmérséklet minimuma", "°C", {}),
+        ("tviz", "Órás pillanatnyi vízhőmérséklet", "°C", {}),
+        ("we", "Órás pillanatnyi időkép kódja", None, {}),
+    ],
+)
+
+TEN_MINUTES_SENSORS = _describe(
+    DATASET_TEN_MINUTES,
+    [
+        ("time", "Tízperces mérési időpont", None, {}),
+        ("r", "Tízperces csapadékösszeg", "mm", {}),
+        ("t", "Tízperces pillanatnyi hőmérséklet", "°C", {}),
+        ("ta", "Tízperces átlaghőmérséklet", "°C", {}),
+        ("tn", "Tízperces minimumhőmérséklet", "°C", {}),
+        ("tx", "Tízperces maximumhőmérséklet", "°C", {}),
+        ("u", "Tízperces pillanatnyi relatív nedvesség", "%", {}),
+        ("sg", "Tízperces átlagos gammadózis", "nSv/h", {}),
+        ("sr", "Tízperces globálsugárzás összeg", "J/cm²", {}),
+        ("sr_mj", "Tízperces globálsugárzás összeg (MJ/m²)", "MJ/m²", {}),
+        ("suv", "Tízperces UV sugárzás összeg", "MED", {}),
+        ("fx", "Tízperces maximális széllökés sebessége", "m/s", {}),
+        ("fxd", "Tízperces maximális széllökés iránya", "°", {}),
+        ("fs", "Tízperces átlagos szélsebesség", "m/s", {}),
+        ("fsd", "Tízperces átlagos szélirány", "°", {}),
+        ("tsn", "Tízperces felszínközeli hőmérséklet minimuma", "°C", {}),
+        ("tviz", "Tízperces pillanatnyi vízhőmérséklet", "°C", {}),
+    ],
+)
+
+SENSOR_DESCRIPTIONS = {
+    DATASET_DAILY: DAILY_SENSORS,
+    DATASET_HOURLY: HOURLY_SENSORS,
+    DATASET_TEN_MINUTES: TEN_MINUTES_SENSORS,
+}
@@ -0,0 +1,335 @@
+"""Update service shared by the HungaroMet config entries and YAML platform."""
+
+import asyncio
+import logging
+import os
+import time
+from functools import partial
+from typing import Any, Dict, Iterable
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+
+from .const import (
+    ATTR_DATASET,
+    ATTR_ENTRY_ID,
+    ATTR_FORCE,
+    ATTR_FORMAT,
+    ATTR_HOURS,
+    DATA_EXECUTORS,
+    DATA_HUB,
+    DATA_RADAR_ARCHIVE,
+    DATA_RADAR_IMAGES,
+    DATA_SCHEDULER,
+    DATASET_DAILY,
+    DATASET_RADAR,
+    DATASETS,
+    DEFAULT_RADAR_FORMAT,
+    DOMAIN,
+    RADAR_FORMATS,
+    SERVICE_RADAR_TIMELAPSE,
+    SERVICE_UPDATE,
+)
+from .executor import async_run_io
+from .hub import FEED_FETCHERS, HungarometLocation
+from .radar_encoder import get_encoder
+from .radar_gif_creator import write_animation
+from .radar_precipitation_sensor import HungarometRadarPrecipitationSensor
+from .scheduler import async_run_cpu_job, get_scheduler
+from .station_info_sensor import HungarometStationInfoSensor
+from .weather_sensor import HungarometWeatherSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_SERVICE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DATASET): vol.All(cv.ensure_list, [vol.In(DATASETS)]),
+    vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+})
+
+TIMELAPSE_SERVICE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_HOURS): vol.All(
+        vol.Coerce(float), vol.Range(min=0.25, max=168)
+    ),
+    vol.Optional(ATTR_FORMAT, default=DEFAULT_RADAR_FORMAT): vol.In(RADAR_FORMATS),
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+})
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.monotonic() - started) * 1000, 1)
+
+
+def _is_active(entity) -> bool:
+    return entity.hass is not None and getattr(entity, "_added", False)
+
+
+def dataset_job_name(location: HungarometLocation, data_type: str) -> str:
+    """Return the scheduler job refreshing ``data_type`` for ``location``."""
+    return f"{location.key} {data_type}"
+
+
+async def _async_run_job(hass: HomeAssistant, name: str, action) -> Any:
+    """Run ``action()`` in the scheduler's lane as the job ``name``."""
+    if DATA_SCHEDULER not in hass.data.get(DOMAIN, {}):
+        # No job has been scheduled yet, so there is no lane to share
+        return await action()
+    return await get_scheduler(hass).async_run_now(name, action)
+
+
+def _station_sensor_matches(sensor, data_type: str) -> bool:
+    # The YAML platform only creates a single station sensor fed by daily data.
+    sensor_type = sensor._sensor_type
+    return sensor_type == data_type or (
+        sensor_type == "platform" and data_type == DATASET_DAILY
+    )
+
+
+async def _async_update_radar(
+    hass: HomeAssistant, locations: Iterable[HungarometLocation], force: bool
+) -> Dict[str, Any]:
+    started = time.monotonic()
+    images = [
+        image
+        for image in hass.data.get(DOMAIN, {}).get(DATA_RADAR_IMAGES, [])
+        if _is_active(image)
+    ]
+    # Radar sensors only read the frames the images download
+    sensors = [
+        sensor
+        for location in locations
+        for sensor in location.entities
+        if isinstance(sensor, HungarometRadarPrecipitationSensor)
+        and _is_active(sensor)
+    ]
+    if not images and not sensors:
+        return {"status": "skipped", "entities": 0, "duration_ms": 0.0}
+    # Queued with the scheduled radar jobs instead of running beside them
+    await asyncio.gather(*(
+        _async_run_job(hass, image.unique_id, partial(image.async_update_data, force))
+        for image in images
+    ))
+    for sensor in sensors:
+        await _async_run_job(hass, sensor.unique_id, sensor.async_update_data)
+    return {
+        "status": "updated",
+        "entities": len(images) + len(sensors),
+        "duration_ms": _elapsed_ms(started),
+    }
+
+
+async def async_update_dataset(
+    location: HungarometLocation, data_type: str, force: bool = False
+) -> Dict[str, Any]:
+    """Refresh one dataset of a location and fan it out to all its entities.
+
+    Returns a summary with the outcome and timings in milliseconds. Unless
+    ``force`` is set, nothing is fetched when no entity of the dataset is
+    currently added to Home Assistant; ``force`` also bypasses the hub cache.
+    """
+    if data_type not in FEED_FETCHERS:
+        _LOGGER.debug("HungaroMet: unsupported sensor type '%s' requested", data_type)
+        return {"status": "unsupported", "entities": 0, "duration_ms": 0.0}
+
+    active_sensors = [
+        sensor
+        for sensor in location.entities
+        if isinstance(sensor, HungarometWeatherSensor)
+        and sensor._dataset == data_type
+        and _is_active(sensor)
+    ]
+    station_sensors = [
+        sensor
+        for sensor in location.entities
+        if isinstance(sensor, HungarometStationInfoSensor)
+        and _is_active(sensor)
+        and _station_sensor_matches(sensor, data_type)
+    ]
+
+    if not active_sensors and not station_sensors and not force:
+        _LOGGER.debug(
+            "HungaroMet: skipping %s update because no active entities are enabled",
+            data_type,
+        )
+        return {"status": "skipped", "entities": 0, "duration_ms": 0.0}
+
+    started = time.monotonic()
+    try:
+        data, station_info = await location.async_get_data(data_type, force)
+    except Exception as err:
+        _LOGGER.error("Error updating %s sensors: %s", data_type, err)
+        return {
+            "status": "failed",
+            "error": str(err),
+            "entities": 0,
+            "duration_ms": _elapsed_ms(started),
+        }
+    fetch_ms = _elapsed_ms(started)
+
+    # Fan out without yielding to the event loop so all states land together
+    updated = 0
+    for sensor in active_sensors:
+        if not sensor.ingest(data):
+            continue
+        sensor.async_write_ha_state()
+        updated += 1
+    for sensor in station_sensors:
+        sensor._station_info = station_info
+        sensor.async_write_ha_state()
+        updated += 1
+
+    return {
+        "status": "updated",
+        "entities": updated,
+        "fetch_ms": fetch_ms,
+        "duration_ms": _elapsed_ms(started),
+    }
+
+
+def _merge_results(results: list) -> Dict[str, Any]:
+    statuses = [result["status"] for result in results]
+    merged = {
+        "status": next(
+            (
+                status
+                for status in ("updated", "failed", "skipped")
+                if status in statuses
+            ),
+            statuses[0] if statuses else "skipped",
+        ),
+        "entities": sum(result["entities"] for result in results),
+    }
+    fetch_times = [result["fetch_ms"] for result in results if "fetch_ms" in result]
+    if fetch_times:
+        merged["fetch_ms"] = max(fetch_times)
+    return merged
+
+
+async def async_handle_update(
+    hass: HomeAssistant, locations: Iterable[HungarometLocation], call: ServiceCall
+) -> Dict[str, Any]:
+    """Refresh the datasets requested by ``call`` for all ``locations``."""
+    locations = list(locations)
+    datasets = list(dict.fromkeys(call.data.get(ATTR_DATASET) or DATASETS))
+    force = call.data.get(ATTR_FORCE, False)
+
+    async def _async_update(data_type: str) -> Dict[str, Any]:
+        if data_type == DATASET_RADAR:
+            return await _async_update_radar(hass, locations, force)
+        started = time.monotonic()
+        results = await asyncio.gather(*(
+            _async_run_job(
+                hass,
+                dataset_job_name(location, data_type),
+                partial(async_update_dataset, location, data_type, force),
+            )
+            for location in locations
+        ))
+        return {**_merge_results(results), "duration_ms": _elapsed_ms(started)}
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(_async_update(dataset) for dataset in datasets))
+    response = {
+        "datasets": dict(zip(datasets, results)),
+        "duration_ms": _elapsed_ms(started),
+    }
+    executors = hass.data.get(DOMAIN, {}).get(DATA_EXECUTORS)
+    if executors is not None:
+        response["executors"] = executors.stats()
+    scheduler = hass.data.get(DOMAIN, {}).get(DATA_SCHEDULER)
+    if scheduler is not None:
+        response["scheduler"] = scheduler.stats()
+    return response
+
+
+def _timelapse_archive(hass: HomeAssistant, entry_id: str | None):
+    domain_data = hass.data.get(DOMAIN, {})
+    archives = domain_data.get(DATA_RADAR_ARCHIVE, {})
+    if entry_id is None:
+        return next(iter(archives.values()), None)
+    hub = domain_data.get(DATA_HUB)
+    location = hub.locations.get(entry_id) if hub is not None else None
+    return archives.get(location.file_prefix) if location is not None else None
+
+
+async def async_handle_timelapse(
+    hass: HomeAssistant, call: ServiceCall
+) -> Dict[str, Any]:
+    """
+    Write a time-lapse of the last ``hours`` of the radar archive of the
+    given entry, or of the archive enabled first.
+    """
+    started = time.monotonic()
+    archive = _timelapse_archive(hass, call.data.get(ATTR_ENTRY_ID))
+    if archive is None:
+        return {"status": "unavailable", "frames": 0, "duration_ms": 0.0}
+    hours = call.data[ATTR_HOURS]
+    image_format = call.data.get(ATTR_FORMAT, DEFAULT_RADAR_FORMAT)
+    path = archive.timelapse_path(hours, image_format)
+    result = await async_run_cpu_job(
+        hass,
+        f"{SERVICE_RADAR_TIMELAPSE} {os.path.basename(path)}",
+        archive.timelapse,
+        hours,
+        image_format,
+    )
+    if result is None:
+        return {"status": "empty", "frames": 0, "duration_ms": _elapsed_ms(started)}
+    data, frames = result
+    await async_run_io(hass, write_animation, data, path)
+    return {
+        "status": "updated",
+        "frames": frames,
+        "path": path,
+        "duration_ms": _elapsed_ms(started),
+    }
+
+
+def async_register_platform_service(
+    hass: HomeAssistant, domain: str, location: HungarometLocation
+) -> None:
+    """Register the update service of the YAML platform for its location."""
+
+    async def handle_update_service(call: ServiceCall) -> ServiceResponse:
+        return await async_handle_update(hass, [location], call)
+
+    hass.services.async_register(
+        domain,
+        SERVICE_UPDATE,
+        handle_update_service,
+        schema=UPDATE_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain update service covering every config entry."""
+
+    async def handle_update_service(call: ServiceCall) -> ServiceResponse:
+        hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+        locations = hub.locations.values() if hub is not None else []
+        return await async_handle_update(hass, locations, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE,
+        handle_update_service,
+        schema=UPDATE_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_timelapse_service(call: ServiceCall) -> ServiceResponse:
+        return await async_handle_timelapse(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RADAR_TIMELAPSE,
+        handle_timelapse_service,
+        schema=TIMELAPSE_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -2,17 +2,19 @@ import logging
 
 from homeassistant.components.sensor import SensorEntity
 
-from .weather_data import process_daily_data
+from .const import DATASET_DAILY, DATASETS
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class HungarometStationInfoSensor(SensorEntity):
-    def __init__(self, hass, name, station_info, sensor_type="daily"):
+    def __init__(self, hass, name, station_info, sensor_type="daily", location=None):
         self.hass = hass
         self._name = name
         self._station_info = station_info
-        self._device_id = "hungaromet_weather"
+        self._location = location
+        prefix = location.unique_id_prefix if location is not None else ""
+        self._device_id = f"{prefix}hungaromet_weather"
         self._sensor_type = sensor_type
         self._unique_id = f"{self._device_id}_station_info_{sensor_type}"
         self._added = False
@@ -59,11 +61,10 @@ class HungarometStationInfoSensor(SensorEntity):
         )
 
     async def async_update_data(self):
-        if not self._added:
+        if not self._added or self._location is None:
             return
-        _, stations = await self.hass.async_add_executor_job(
-            process_daily_data, self.hass
-        )
+        dataset = self._sensor_type if self._sensor_type in DATASETS else DATASET_DAILY
+        _, stations = await self._location.async_get_data(dataset)
         self._station_info = stations
         self.async_write_ha_state()
 
@@ -23,7 +23,7 @@ except ImportError:  # pragma: no cover - standalone CLI usage
     )
 
 try:  # Optional local fallback for CLI usage
-    from . import local_config as _local_config  # type: ignore
+    from . import local_config as _local_config  # type: ignore # pylint: disable=cyclic-import
 except ImportError:  # pragma: no cover - optional helper
     try:
         import local_config as _local_config  # type: ignore
@@ -103,9 +103,21 @@ def haversine(lat1, lon1, lat2, lon2):
     return R * c
 
 
+def fetch_daily_frame() -> pd.DataFrame:
+    """Download and clean the national daily feed."""
+    return clean_data(fetch_data(URL_DAILY))
+
+
 def process_daily_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
-    df = fetch_data(URL_DAILY)
-    df = clean_data(df)
+    df = fetch_daily_frame()
+    ref_lat, ref_lon = _get_reference_coords(hass)
+    return aggregate_daily_data(df, ref_lat, ref_lon, distance_km)
+
+
+def aggregate_daily_data(
+    df: pd.DataFrame, ref_lat: float, ref_lon: float, distance_km: float
+):
+    """Average the stations of ``df`` within ``distance_km`` of the reference."""
     columns = [
         "Time",
         "StationNumber",
@@ -126,10 +138,7 @@ def process_daily_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
         "et100",
         "tsn24",
     ]
-    df = df[columns]
-
-    ref_lat, ref_lon = _get_reference_coords(hass)
-
+    df = df[columns].copy()
     df = add_distance_column(df, ref_lat, ref_lon)
     df = df.sort_values(by="Distance_km")
     df = df[df["Distance_km"] <= distance_km]
@@ -173,9 +182,21 @@ def process_daily_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
     return result, station_info_list
 
 
+def fetch_hourly_frame() -> pd.DataFrame:
+    """Download and clean the national hourly feed."""
+    return clean_data(fetch_data(URL_HOURLY))
+
+
 def process_hourly_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
-    df = fetch_data(URL_HOURLY)
-    df = clean_data(df)
+    df = fetch_hourly_frame()
+    ref_lat, ref_lon = _get_reference_coords(hass)
+    return aggregate_hourly_data(df, ref_lat, ref_lon, distance_km)
+
+
+def aggregate_hourly_data(
+    df: pd.DataFrame, ref_lat: float, ref_lon: float, distance_km: float
+):
+    """Average the stations of ``df`` within ``distance_km`` of the reference."""
     columns = [
         "Time",
         "StationNumber",
@@ -207,10 +228,7 @@ def process_hourly_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
         "tsn",
         "tviz",
     ]
-    df = df[columns]
-
-    ref_lat, ref_lon = _get_reference_coords(hass)
-
+    df = df[columns].copy()
     df = add_distance_column(df, ref_lat, ref_lon)
     df = df.sort_values(by="Distance_km")
     df = df[df["Distance_km"] <= distance_km]
@@ -266,9 +284,21 @@ def process_hourly_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
     return result, station_info_list
 
 
+def fetch_ten_minutes_frame() -> pd.DataFrame:
+    """Download and clean the national ten-minutes feed."""
+    return clean_data(fetch_data(URL_TEN_MINUTES))
+
+
 def process_ten_minutes_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
-    df = fetch_data(URL_TEN_MINUTES)
-    df = clean_data(df)
+    df = fetch_ten_minutes_frame()
+    ref_lat, ref_lon = _get_reference_coords(hass)
+    return aggregate_ten_minutes_data(df, ref_lat, ref_lon, distance_km)
+
+
+def aggregate_ten_minutes_data(
+    df: pd.DataFrame, ref_lat: float, ref_lon: float, distance_km: float
+):
+    """Average the stations of ``df`` within ``distance_km`` of the reference."""
     columns = [
         "Time",
         "StationNumber",
@@ -297,10 +327,7 @@ def process_ten_minutes_data(hass=None, distance_km=DEFAULT_DISTANCE_KM):
         "tsn",
         "tviz",
     ]
-    df = df[columns]
-
-    ref_lat, ref_lon = _get_reference_coords(hass)
-
+    df = df[columns].copy()
     df = add_distance_column(df, ref_lat, ref_lon)
     df = df.sort_values(by="Distance_km")
     df = df[df["Distance_km"] <= distance_km]
@@ -0,0 +1,104 @@
+import logging
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+
+from .sensor_descriptions import (
+    DATASET_DEVICES,
+    HungarometSensorEntityDescription,
+    period_start,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def lookup_value(data, key):
+    """Return ``key`` from processed data, falling back to ``average_<key>``."""
+    value = data.get(key)
+    if value is None:
+        value = data.get(f"average_{key}")
+    return value
+
+
+class HungarometWeatherSensor(SensorEntity):
+    """Sensor for one aggregated value of a HungaroMet dataset."""
+
+    entity_description: HungarometSensorEntityDescription
+
+    def __init__(self, hass, description, data, location=None, coordinator=None):
+        self.hass = hass
+        self.entity_description = description
+        self._name = description.name
+        self._key = description.key
+        self._dataset = description.dataset
+        self._location = location
+        # Config entries prefix their ids so several locations can coexist
+        prefix = location.unique_id_prefix if location is not None else ""
+        device = DATASET_DEVICES[self._dataset]
+        self._device_id = f"{prefix}{device['id']}"
+        self._unique_id = (
+            f"{prefix}{device['id']}_{self._name.lower().replace(' ', '_')}"
+        )
+        self._attr_name = self._name
+        self._attr_unique_id = self._unique_id
+        self._attr_device_info = {
+            "identifiers": {(self._device_id,)},
+            "name": device["name"],
+            "manufacturer": "HungaroMet",
+            "model": device["model"],
+            "entry_type": "service",
+        }
+        self._attr_native_value = None
+        self._attr_last_reset = None
+        self._added = False
+        self.coordinator = coordinator
+        self.ingest(data)
+
+    def ingest(self, data):
+        """Store this sensor's value from processed ``data`` in native form.
+
+        Returns ``False`` and keeps the previous value when ``data`` has none.
+        """
+        value = lookup_value(data, self._key)
+        if value is None:
+            return False
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(value)
+        if description.state_class == SensorStateClass.TOTAL:
+            self._attr_last_reset = period_start(self._dataset, data.get("time"))
+        return True
+
+    async def async_added_to_hass(self):
+        self._added = True
+        _LOGGER.debug(
+            "Entity %s added to hass with unique_id %s",
+            self._name,
+            self._unique_id,
+        )
+
+    async def async_will_remove_from_hass(self):
+        self._added = False
+        _LOGGER.debug(
+            "Entity %s removed from hass; skipping scheduled updates",
+            self._name,
+        )
+
+    async def async_update_data(self):
+        if not self._added:
+            return
+
+        # Use coordinator data if available, otherwise ask the shared hub
+        if self.coordinator and self.coordinator.data:
+            data = self.coordinator.data.get("data", {})
+        elif self._location is not None:
+            data, _ = await self._location.async_get_data(self._dataset)
+        else:
+            return
+
+        self.ingest(data)
+        self.async_write_ha_state()
+
+    async def async_update(self):
+        await self.async_update_data()
+
+    def update(self):
+        pass
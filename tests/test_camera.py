@@ -0,0 +1,39 @@
+"""Tests for camera.py"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.hungaromet.camera import async_setup_entry
+from custom_components.hungaromet.hub import async_get_hub
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_without_radar_camera():
+    """Test no camera is added unless enabled."""
+    entry = SimpleNamespace(data={}, options={})
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(MagicMock(), entry, async_add_entities)
+
+    async_add_entities.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_camera():
+    """Test the radar camera option adds the frame camera."""
+    hass = MagicMock()
+    hass.data = {}
+    async_get_hub(hass).register("abc", 47.0, 19.0, 10, "abc_")
+    entry = SimpleNamespace(entry_id="abc", data={}, options={"radar_camera": True})
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    (entities,), _ = async_add_entities.call_args
+    assert entities[0].unique_id == "abc_hungaromet_radar_camera"
+    assert entities[0].device_info["identifiers"] == {("abc_hungaromet_radar_gif",)}
+    assert entities[0].content_type == "image/png"
+    # Nothing to fetch; the frames come with the radar image's next build
+    assert entities[0].should_poll is False
@@ -0,0 +1,113 @@
+"""Tests for executor.py"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.hungaromet.executor import (
+    HungarometExecutor,
+    async_run_cpu,
+    async_run_io,
+    async_setup_executors,
+)
+
+
+@pytest.mark.asyncio
+async def test_executor_counts_queued_jobs():
+    """Test jobs waiting for the single worker show up as queue depth."""
+    executor = HungarometExecutor("cpu", 1)
+    release = threading.Event()
+    first = asyncio.ensure_future(executor.async_run(release.wait, 5))
+    second = asyncio.ensure_future(executor.async_run(lambda: "done"))
+    while executor.running == 0:
+        await asyncio.sleep(0.001)
+
+    assert executor.stats()["queued"] == 1
+    assert executor.stats()["running"] == 1
+    release.set()
+
+    assert await first is True
+    assert await second == "done"
+    stats = executor.stats()
+    assert stats == {
+        "workers": 1,
+        "queued": 0,
+        "running": 0,
+        "peak_queued": 1,
+        "completed": 2,
+        "max_wait_ms": stats["max_wait_ms"],
+    }
+    assert stats["max_wait_ms"] > 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_forgets_cancelled_jobs():
+    """Test a job cancelled while queued leaves the queue and never runs."""
+    executor = HungarometExecutor("cpu", 1)
+    release = threading.Event()
+    ran = []
+    first = asyncio.ensure_future(executor.async_run(release.wait, 5))
+    second = asyncio.ensure_future(executor.async_run(ran.append, True))
+    while executor.running == 0:
+        await asyncio.sleep(0.001)
+
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    assert executor.stats()["queued"] == 0
+    release.set()
+    await first
+
+    assert ran == []
+    assert executor.stats()["queued"] == 0
+    # A worker reaching a job its cancelled caller already counted out
+    assert executor._call([True], 0.0, ran.append, (True,)) is None
+    assert ran == [] and executor.completed == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_counts_failed_jobs():
+    """Test a raising job is passed on and still frees its worker."""
+    executor = HungarometExecutor("io", 1)
+
+    def fail():
+        raise OSError("boom")
+
+    with pytest.raises(OSError):
+        await executor.async_run(fail)
+
+    assert (executor.running, executor.completed) == (0, 1)
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_on_their_own_pools():
+    """Test I/O and CPU jobs use separate pools once they are set up."""
+    hass = SimpleNamespace(
+        data={}, bus=MagicMock(), async_add_executor_job=AsyncMock(return_value="ha")
+    )
+
+    # Before async_setup the shared executor is still used
+    assert await async_run_io(hass, threading.current_thread) == "ha"
+    executors = async_setup_executors(hass, 2, 1)
+    assert async_setup_executors(hass, 8, 8) is executors
+
+    io_thread = await async_run_io(hass, threading.current_thread)
+    cpu_thread = await async_run_cpu(hass, threading.current_thread)
+
+    assert io_thread.name.startswith("hungaromet_io")
+    assert cpu_thread.name.startswith("hungaromet_cpu")
+    assert executors.stats()["io"]["completed"] == 1
+    assert executors.stats()["cpu"]["workers"] == 1
+    hass.async_add_executor_job.assert_awaited_once()
+
+    # Shut down together with Home Assistant
+    _, shutdown = hass.bus.async_listen_once.call_args[0]
+    shutdown(None)
+    with pytest.raises(RuntimeError):
+        await async_run_cpu(hass, threading.current_thread)
@@ -0,0 +1,119 @@
+"""Tests for the shared download hub in hub.py"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.hungaromet import hub as hub_module
+from custom_components.hungaromet.hub import (
+    HungarometHub,
+    async_get_hub,
+    async_release_hub,
+)
+
+
+class DummyHass:
+    def __init__(self):
+        self.data = {}
+        self.jobs = []
+
+    async def async_add_executor_job(self, func, *args):
+        self.jobs.append(func)
+        await asyncio.sleep(0)
+        return func(*args)
+
+
+@pytest.fixture
+def feeds(monkeypatch):
+    fetch = MagicMock(return_value="frame")
+    aggregate = MagicMock(
+        side_effect=lambda frame, lat, lon, distance: ({"lat": lat}, [distance])
+    )
+    monkeypatch.setattr(hub_module, "FEED_FETCHERS", {"daily": fetch})
+    monkeypatch.setattr(hub_module, "FEED_AGGREGATORS", {"daily": aggregate})
+    return SimpleNamespace(fetch=fetch, aggregate=aggregate)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_locations_share_one_download(feeds):
+    hub = HungarometHub(DummyHass())
+    north = hub.register("north", 47.5, 19.0, 20, "north_")
+    south = hub.register("south", 46.2, 20.1, 30, "south_")
+
+    results = await asyncio.gather(
+        north.async_get_data("daily"),
+        south.async_get_data("daily"),
+        north.async_get_data("daily"),
+    )
+
+    feeds.fetch.assert_called_once()
+    assert feeds.aggregate.call_count == 2
+    assert results[0] == ({"lat": 47.5}, [20])
+    assert results[1] == ({"lat": 46.2}, [30])
+    assert results[2] is results[0]
+    assert hub.refcount == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_or_forced_feed_is_downloaded_again(feeds, monkeypatch):
+    hub = HungarometHub(DummyHass())
+    location = hub.register("home", 47.5, 19.0, 20)
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(
+        hub_module, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+
+    await location.async_get_data("daily")
+    clock.now = 10.0
+    await location.async_get_data("daily")
+    assert feeds.fetch.call_count == 1
+
+    clock.now = 500.0
+    await location.async_get_data("daily")
+    assert feeds.fetch.call_count == 2
+    assert feeds.aggregate.call_count == 2
+
+    await location.async_get_data("daily", force=True)
+    assert feeds.fetch.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_reregistering_a_location_drops_its_views(feeds):
+    hub = HungarometHub(DummyHass())
+    location = hub.register("home", 47.5, 19.0, 20)
+    await location.async_get_data("daily")
+
+    location = hub.register("home", 47.5, 19.0, 50)
+    data = await location.async_get_data("daily")
+
+    feeds.fetch.assert_called_once()
+    assert data == ({"lat": 47.5}, [50])
+
+
+def test_hub_is_created_once_and_released_with_last_location():
+    hass = DummyHass()
+    hub = async_get_hub(hass)
+    assert async_get_hub(hass) is hub
+
+    hub.register("a", 0, 0, 20)
+    hub.register("b", 0, 0, 20)
+    async_release_hub(hass, "a")
+    assert hass.data["hungaromet"]["hub"] is hub
+    assert hub.refcount == 1
+
+    downloader = hass.data["hungaromet"]["radar_downloader"] = MagicMock()
+    hass.data["hungaromet"]["radar_frames"] = MagicMock()
+    hass.data["hungaromet"]["radar_archive"] = {"": MagicMock()}
+    async_release_hub(hass, "b")
+    assert "hub" not in hass.data["hungaromet"]
+    assert hub.locations == {}
+    # The radar session goes with the last location
+    downloader.close.assert_called_once()
+    assert "radar_downloader" not in hass.data["hungaromet"]
+    # So do the frames and archives, for the next entry to start over
+    assert "radar_frames" not in hass.data["hungaromet"]
+    assert "radar_archive" not in hass.data["hungaromet"]
+
+    async_release_hub(hass, "b")
@@ -1,9 +1,12 @@
 """Tests for image.py platform setup"""
 
+import os
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 
+from custom_components.hungaromet.hub import async_get_hub
 from custom_components.hungaromet.image import (
     async_setup_platform,
     async_setup_entry,
@@ -11,10 +14,25 @@ from custom_components.hungaromet.image import (
 )
 
 
+def _hass():
+    """Return a hass mock whose configuration lives in /config."""
+    hass = MagicMock()
+    hass.config.path = lambda *parts: os.path.join("/config", *parts)
+    return hass
+
+
+def _entry(hass, data, options, file_prefix="abc_"):
+    """Return a config entry whose location is registered with the hub."""
+    if not isinstance(hass.data, dict):
+        hass.data = {}
+    async_get_hub(hass).register("abc", 47.0, 19.0, 10, "abc_", file_prefix)
+    return SimpleNamespace(entry_id="abc", data=data, options=options)
+
+
 @pytest.mark.asyncio
 async def test_async_setup_platform():
     """Test deprecated platform setup."""
-    hass = MagicMock()
+    hass = _hass()
     config = {}
     async_add_entities = MagicMock()
 
@@ -29,8 +47,9 @@ async def test_async_setup_platform():
 @pytest.mark.asyncio
 async def test_async_setup_entry():
     """Test config entry setup."""
-    hass = MagicMock()
-    entry = MagicMock()
+    hass = _hass()
+    hass.data = {}
+    entry = _entry(hass, data={"name": "HungaroMet"}, options={})
     async_add_entities = MagicMock()
 
     await async_setup_entry(hass, entry, async_add_entities)
@@ -39,11 +58,170 @@ async def test_async_setup_entry():
     args = async_add_entities.call_args[0]
     assert len(args[0]) == 1
     assert args[1] is True
+    assert args[0][0]._updater.region is None
+    hass.http.register_view.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_region():
+    """Test the configured crop radius and location reach the updater."""
+    hass = _hass()
+    hass.config.latitude = 47.0
+    hass.config.longitude = 19.0
+    entry = _entry(
+        hass,
+        data={"radar_radius_km": 100, "latitude": 46.5},
+        options={"radar_downscale": 2},
+    )
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    region = async_add_entities.call_args[0][0][0]._updater.region
+    assert (region.latitude, region.longitude) == (46.5, 19.0)
+    assert (region.radius_km, region.downscale) == (100, 2)
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_format():
+    """Test the configured animation format selects the entity content type."""
+    hass = _hass()
+    # The first entry keeps the file names from before entries were prefixed
+    entry = _entry(
+        hass, {"radar_format": "gif"}, {"radar_format": "webp"}, file_prefix=""
+    )
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    entity = async_add_entities.call_args[0][0][0]
+    assert entity.content_type == "image/webp"
+    assert entity.file_name == "radar_animation.webp"
+    assert entity._updater.output_path == "/config/www/radar_animation.webp"
+    assert entity.unique_id == "abc_hungaromet_radar_gif_hungaromet_radar"
+    assert entity._updater.worker is None
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_subprocess():
+    """Test the subprocess option gives the updater an encode worker."""
+    hass = _hass()
+    entry = _entry(hass, data={}, options={"radar_subprocess": True})
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    assert async_add_entities.call_args[0][0][0]._updater.worker is not None
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_nowcast():
+    """Test the nowcast option makes the updater append forecast frames."""
+    hass = _hass()
+    entry = _entry(hass, data={"radar_nowcast": True}, options={})
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    assert async_add_entities.call_args[0][0][0]._updater.nowcast is True
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_archive():
+    """Test the archive hours give the updater the entry's radar archive."""
+    hass = _hass()
+    hass.data = {}
+    entry = _entry(
+        hass, data={}, options={"radar_archive_hours": 6, "radar_archive_max_mb": 64}
+    )
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    archive = async_add_entities.call_args[0][0][0]._updater.archive
+    assert archive is hass.data["hungaromet"]["radar_archive"]["abc_"]
+    assert archive.directory == "/config/www/abc_hungaromet_radar_archive"
+    assert archive.retention.total_seconds() == 6 * 3600
+    assert archive.max_bytes == 64 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_variants():
+    """Test each size variant gets an entity sharing the full-size updater."""
+    hass = _hass()
+    entry = _entry(
+        hass, data={}, options={"radar_variants": ["half", "thumbnail"]}
+    )
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    full, half, thumbnail = async_add_entities.call_args[0][0]
+    assert full._updater.variants == ("half", "thumbnail")
+    assert half._updater is thumbnail._updater is full._updater
+    assert full._variants == [half, thumbnail]
+    assert thumbnail.file_name == "abc_radar_animation_thumbnail.gif"
+    assert thumbnail.unique_id == "abc_hungaromet_radar_gif_hungaromet_radar_thumbnail"
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_products():
+    """Test each extra product gets an entity sharing one downloader."""
+    hass = _hass()
+    hass.data = {}
+    entry = _entry(
+        hass,
+        data={"radar_archive_hours": 6},
+        options={
+            "radar_products": (
+                " composite/png/refl2D/, composite/png/refl2D_pscappi,"
+                " ../secret, composite/png/refl2D,,"
+            ),
+            "radar_variants": ["thumbnail"],
+        },
+    )
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    entities = async_add_entities.call_args[0][0]
+    assert [entity.name for entity in entities] == [
+        "HungaroMet Radar",
+        "HungaroMet Radar thumbnail",
+        "HungaroMet Radar refl2D",
+        "HungaroMet Radar refl2D thumbnail",
+    ]
+    default, _, other, other_thumbnail = entities
+    assert other._updater.base_url.endswith("/weather/radar/composite/png/refl2D/")
+    assert other.file_name == "abc_radar_refl2D.gif"
+    assert other_thumbnail.file_name == "abc_radar_refl2D_thumbnail.gif"
+    assert other._updater.downloader is default._updater.downloader
+    assert other._updater.frame_store is default._updater.frame_store
+    # Time-lapses are of the default product only
+    assert default._updater.archive is not None
+    assert other._updater.archive is None
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_radar_overlay():
+    """Test the overlay option marks the entry's location on the frames."""
+    hass = _hass()
+    hass.config.latitude, hass.config.longitude = 47.5, 19.0
+    entry = _entry(hass, data={"latitude": 46.1}, options={"radar_overlay": True})
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    overlay = async_add_entities.call_args[0][0][0]._updater.overlay
+    assert (overlay.latitude, overlay.longitude) == (46.1, 19.0)
+
+    await async_setup_entry(hass, _entry(hass, {}, {}), async_add_entities)
+    assert async_add_entities.call_args[0][0][0]._updater.overlay is None
 
 
 def test_setup_image_entities():
     """Test _setup_image_entities helper."""
-    hass = MagicMock()
+    hass = _hass()
     async_add_entities = MagicMock()
 
     _setup_image_entities(hass, async_add_entities)
@@ -1,37 +1,177 @@
 """Tests for __init__.py"""
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
 
+from custom_components import hungaromet
 from custom_components.hungaromet import (
     async_setup,
     async_setup_entry,
+    async_unload_entry,
 )
 
 
+def _hass():
+    hass = MagicMock()
+    hass.data = {}
+    hass.config.latitude = 47.0
+    hass.config.longitude = 19.0
+    hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    hass.config_entries.async_entries.return_value = []
+    return hass
+
+
+def _entry(entry_id="abc", data=None, options=None):
+    return SimpleNamespace(
+        entry_id=entry_id, data=data or {}, options=options or {}
+    )
+
+
+@pytest.fixture
+def registries(monkeypatch):
+    migrated = {}
+
+    async def _migrate(hass, entry_id, migrate):
+        for unique_id, domain in (
+            ("hungaromet_weather_napi_átlaghőmérséklet", "sensor"),
+            ("abc_hungaromet_weather_hourly_órás", "sensor"),
+            ("hungaromet_radar_gif_hungaromet_radar", "image"),
+            ("hungaromet_radar_camera", "camera"),
+            ("other_integration_id", "weather"),
+        ):
+            migrated[unique_id] = migrate(
+                SimpleNamespace(unique_id=unique_id, domain=domain)
+            )
+
+    devices = MagicMock()
+    devices.async_get_device.side_effect = lambda identifiers: {
+        ("hungaromet_weather",): SimpleNamespace(id="d1", config_entries={"abc"}),
+        ("hungaromet_weather_hourly",): SimpleNamespace(
+            id="d2", config_entries={"other"}
+        ),
+        ("hungaromet_radar_gif",): SimpleNamespace(id="d3", config_entries={"abc"}),
+    }.get(next(iter(identifiers)))
+    monkeypatch.setattr(hungaromet.er, "async_migrate_entries", _migrate)
+    monkeypatch.setattr(hungaromet.dr, "async_get", lambda hass: devices)
+    return SimpleNamespace(migrated=migrated, devices=devices)
+
+
 @pytest.mark.asyncio
 async def test_async_setup():
-    """Test async_setup returns True."""
+    """Test async_setup registers the update service."""
     hass = MagicMock()
     config = {}
 
     result = await async_setup(hass, config)
 
     assert result is True
+    assert [call[0][:2] for call in hass.services.async_register.call_args_list] == [
+        ("hungaromet", "update"),
+        ("hungaromet", "radar_timelapse"),
+    ]
 
 
 @pytest.mark.asyncio
-async def test_async_setup_entry():
-    """Test async_setup_entry forwards to platforms."""
-    hass = MagicMock()
-    entry = MagicMock()
+async def test_async_setup_creates_executors():
+    """Test the YAML section sizes the integration's thread pools."""
+    hass = _hass()
+    config = hungaromet.CONFIG_SCHEMA({"hungaromet": {"cpu_workers": 1}})
 
-    hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
+    await async_setup(hass, config)
+
+    executors = hass.data["hungaromet"]["executors"]
+    assert (executors.io.max_workers, executors.cpu.max_workers) == (4, 1)
+    # The pools and the radar session are closed when Home Assistant stops
+    assert [
+        event for (event, _), _ in hass.bus.async_listen_once.call_args_list
+    ] == ["homeassistant_stop", "homeassistant_stop"]
+    executors.shutdown()
+
+    await async_setup(hass, {})
+    assert hass.data["hungaromet"]["executors"] is executors
+    assert hass.bus.async_listen_once.call_count == 3
+    assert hungaromet.CONFIG_SCHEMA({"other": {}}) == {"other": {}}
+
+
+@pytest.mark.asyncio
+async def test_stop_closes_the_radar_session():
+    """Test the radar downloader is closed when Home Assistant stops."""
+    hass = _hass()
+    await async_setup(hass, {})
+    downloader = MagicMock()
+    hass.data["hungaromet"]["radar_downloader"] = downloader
+
+    (_, handle_stop), _ = hass.bus.async_listen_once.call_args
+    handle_stop(None)
+
+    downloader.close.assert_called_once()
+    assert "radar_downloader" not in hass.data["hungaromet"]
+    handle_stop(None)
+    hass.data["hungaromet"]["executors"].shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry(registries):
+    """Test async_setup_entry registers the location and forwards to platforms."""
+    hass = _hass()
+    entry = _entry(data={"distance_km": 30}, options={"distance_km": 40})
 
     result = await async_setup_entry(hass, entry)
 
     assert result is True
     hass.config_entries.async_forward_entry_setups.assert_awaited_once_with(
-        entry, ["sensor", "image"]
+        entry, ["sensor", "image", "camera"]
     )
+    location = hass.data["hungaromet"]["hub"].locations["abc"]
+    assert (location.latitude, location.longitude) == (47.0, 19.0)
+    assert location.distance_km == 40
+    assert location.unique_id_prefix == "abc_"
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_migrates_legacy_ids(registries):
+    await async_setup_entry(_hass(), _entry())
+
+    assert registries.migrated == {
+        "hungaromet_weather_napi_átlaghőmérséklet": {
+            "new_unique_id": "abc_hungaromet_weather_napi_átlaghőmérséklet"
+        },
+        "abc_hungaromet_weather_hourly_órás": None,
+        "hungaromet_radar_gif_hungaromet_radar": {
+            "new_unique_id": "abc_hungaromet_radar_gif_hungaromet_radar"
+        },
+        "hungaromet_radar_camera": {"new_unique_id": "abc_hungaromet_radar_camera"},
+        "other_integration_id": None,
+    }
+    assert registries.devices.async_update_device.call_args_list == [
+        call("d1", new_identifiers={("abc_hungaromet_weather",)}),
+        call("d3", new_identifiers={("abc_hungaromet_radar_gif",)}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_unload_entry_releases_hub(registries):
+    hass = _hass()
+    first, second = _entry("abc", {"latitude": 46.0}), _entry("def")
+    hass.config_entries.async_entries.return_value = [first, second]
+    await async_setup_entry(hass, first)
+    await async_setup_entry(hass, second)
+    hub = hass.data["hungaromet"]["hub"]
+    assert hub.locations["abc"].latitude == 46.0
+    # Only entries after the first prefix their file names
+    assert hub.locations["abc"].file_prefix == ""
+    assert hub.locations["def"].file_prefix == "def_"
+
+    assert await async_unload_entry(hass, first) is True
+    assert hub.refcount == 1
+
+    hass.config_entries.async_unload_platforms.return_value = False
+    assert await async_unload_entry(hass, second) is False
+    assert hub.refcount == 1
+
+    hass.config_entries.async_unload_platforms.return_value = True
+    assert await async_unload_entry(hass, second) is True
+    assert "hub" not in hass.data["hungaromet"]
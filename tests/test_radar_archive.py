@@ -0,0 +1,169 @@
+"""Tests for radar_archive.py"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from custom_components.hungaromet.radar_archive import RadarArchive, get_radar_archive
+from custom_components.hungaromet.radar_frames import RadarFrame, RadarFrameStore
+from custom_components.hungaromet.radar_region import RadarRegion
+
+PALETTE = bytes([0, 0, 0, 200, 30, 30, 30, 200, 30])
+
+
+def _frame(minutes, value=1, size=(16, 12)):
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minutes)
+    indices = np.zeros(size[::-1], np.uint8)
+    indices[: size[1] // 2] = value
+    return RadarFrame(
+        f"refl2D_pscappi_{timestamp:%Y%m%d_%H%M}.png", timestamp, indices, PALETTE
+    )
+
+
+def test_add_writes_new_frames_once(tmp_path):
+    """Test frames are written as PNGs named like the composites."""
+    archive = RadarArchive(directory=str(tmp_path))
+    untimed = RadarFrame("legend.png", None, np.zeros((2, 2), np.uint8), PALETTE)
+
+    assert archive.add([_frame(0), _frame(5), untimed]) == 2
+    assert archive.add([_frame(5)]) == 0
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == archive.names()
+    assert archive.names()[0] == "refl2D_pscappi_20240101_0000.png"
+    assert archive.nbytes == sum(path.stat().st_size for path in tmp_path.iterdir())
+    with Image.open(tmp_path / archive.names()[1]) as image:
+        assert image.mode == "P"
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    """Test a new archive picks up the frames already on disk."""
+    RadarArchive(directory=str(tmp_path)).add([_frame(0), _frame(5)])
+    (tmp_path / "notes.txt").write_text("x")
+
+    archive = RadarArchive(directory=str(tmp_path))
+
+    assert len(archive) == 2
+    assert len(RadarArchive(directory=str(tmp_path / "missing"))) == 0
+
+
+def test_eviction_by_retention_and_size(tmp_path):
+    """Test frames past the retention and beyond the byte cap go oldest first."""
+    archive = RadarArchive(retention=timedelta(minutes=30), directory=str(tmp_path))
+    archive.add([_frame(minutes) for minutes in range(0, 60, 5)])
+
+    assert [name[-8:-4] for name in archive.names()][0] == "0025"
+    assert len(list(tmp_path.iterdir())) == 7
+
+    archive.max_bytes = archive.nbytes // 2
+    (tmp_path / archive.names()[0]).unlink()
+    archive.add([_frame(60)])
+
+    assert archive.nbytes <= archive.max_bytes
+    assert archive.names()[-1].endswith("0100.png")
+    assert len(list(tmp_path.iterdir())) == len(archive)
+
+    archive.max_bytes = 0
+    archive.add([_frame(65)])
+    assert archive.names() == ["refl2D_pscappi_20240101_0105.png"]
+
+
+def test_window_samples_evenly(tmp_path):
+    """Test long windows are thinned to evenly spaced frames ending newest."""
+    archive = RadarArchive(directory=str(tmp_path))
+    assert archive.window(1) == []
+    archive.add([_frame(minutes) for minutes in range(0, 185, 5)])
+
+    hour = archive.window(1)
+    sampled = archive.window(3, max_frames=10)
+
+    assert [name[-8:-4] for name in hour][:2] == ["0205", "0210"]
+    assert len(hour) == 12
+    assert len(sampled) == 10
+    assert sampled[0].endswith("0005.png")
+    assert sampled[-1].endswith("0300.png")
+
+
+def test_timelapse_is_cached_until_new_frame(tmp_path, monkeypatch):
+    """Test time-lapses come from disk and are rebuilt only for new frames."""
+    store = RadarFrameStore()
+    region = RadarRegion(47.5, 19.04, 300)
+    archive = RadarArchive(directory=str(tmp_path), store=store)
+    assert archive.timelapse(1) is None
+    archive.add([_frame(minutes, value=minutes // 5 % 2 + 1) for minutes in (0, 5)])
+    store.put(_frame(5, value=2))
+
+    data, frames = archive.timelapse(1)
+
+    assert data.startswith(b"GIF89a")
+    assert frames == 2
+    assert store.hits == 1
+    assert archive.timelapse(1) == (data, frames)
+    assert archive.timelapse(1, "apng")[0].startswith(b"\x89PNG")
+
+    archive.add([_frame(10)])
+    assert archive.timelapse(1)[1] == 3
+
+    # A frame arriving while encoding leaves the result uncached
+    archive.region = region
+    original = archive.window
+
+    def window_then_add(hours):
+        names = original(hours)
+        archive.add([_frame(15)])
+        return names
+
+    monkeypatch.setattr(archive, "window", window_then_add)
+    assert archive.timelapse(2)[1] == 3
+    monkeypatch.setattr(archive, "window", original)
+    assert archive.timelapse(2)[1] == 4
+
+
+def test_timelapse_skips_frames_evicted_meanwhile(tmp_path, monkeypatch):
+    """Test frames removed after the window was listed are left out."""
+    archive = RadarArchive(directory=str(tmp_path))
+    archive.add([_frame(minutes) for minutes in (0, 5, 10)])
+    original = archive.window
+
+    def window_then_evict(hours):
+        names = original(hours)
+        for name in names[:2]:
+            (tmp_path / name).unlink()
+        return names
+
+    monkeypatch.setattr(archive, "window", window_then_evict)
+    assert archive.timelapse(1)[1] == 1
+
+    archive.add([_frame(15)])
+    monkeypatch.setattr(
+        archive, "window", lambda hours: ["refl2D_pscappi_20240101_0000.png"]
+    )
+    assert archive.timelapse(1) is None
+
+
+def test_get_radar_archive_is_per_entry(tmp_path):
+    """Test each entry's archive is created once with the shared store."""
+    hass = SimpleNamespace(
+        data={},
+        config=SimpleNamespace(path=lambda *parts: str(tmp_path.joinpath(*parts))),
+    )
+
+    archive = get_radar_archive(hass, 12, max_mb=64)
+
+    assert get_radar_archive(hass, 24) is archive
+    assert archive.retention == timedelta(hours=12)
+    assert archive.max_bytes == 64 * 1024 * 1024
+    assert archive.directory == str(tmp_path / "www" / "hungaromet_radar_archive")
+    assert archive.store is hass.data["hungaromet"]["radar_frames"]
+    assert archive.timelapse_path(3, "webp") == str(
+        tmp_path / "www" / "radar_timelapse_3h.webp"
+    )
+
+    other = get_radar_archive(hass, 6, file_prefix="b_")
+    assert other is not archive
+    assert other.retention == timedelta(hours=6)
+    assert other.directory == str(tmp_path / "www" / "b_hungaromet_radar_archive")
+    assert other.timelapse_path(1.5) == str(
+        tmp_path / "www" / "b_radar_timelapse_1.5h.gif"
+    )
@@ -0,0 +1,76 @@
+"""Tests for radar_downloader.py"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from custom_components.hungaromet.radar_downloader import (
+    RadarDownloader,
+    get_radar_downloader,
+)
+from custom_components.hungaromet.radar_gif_creator import download_images
+
+
+def test_requests_are_bounded_across_callers():
+    """Test concurrent downloads of two products share one request limit."""
+    downloader = RadarDownloader(max_parallel=2)
+    active = []
+    lock = threading.Lock()
+
+    def fake_get(url, timeout=None):
+        with lock:
+            active.append(url)
+        time.sleep(0.02)
+        with lock:
+            active.remove(url)
+        return SimpleNamespace(content=url.encode(), raise_for_status=lambda: None)
+
+    downloader.session.get = fake_get
+    products = (
+        [f"http://example.com/a/a{index}.png" for index in range(4)],
+        [f"http://example.com/b/b{index}.png" for index in range(4)],
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            executor.map(
+                lambda urls: download_images(
+                    urls,
+                    decoder=lambda name, data: name,
+                    downloader=downloader,
+                ),
+                products,
+            )
+        )
+
+    assert results == [
+        [f"a{index}.png" for index in range(4)],
+        [f"b{index}.png" for index in range(4)],
+    ]
+    assert downloader.peak_in_flight == 2
+    assert downloader.request_count == 8
+    assert downloader.in_flight == 0
+
+
+def test_session_pools_connections():
+    """Test the session keeps as many connections as requests may run."""
+    downloader = RadarDownloader(max_parallel=3)
+
+    adapter = downloader.session.get_adapter("https://odp.met.hu/")
+
+    assert adapter._pool_maxsize == 3
+    downloader.session = Mock()
+    downloader.close()
+    downloader.session.close.assert_called_once()
+
+
+def test_get_radar_downloader_is_shared():
+    """Test every radar entity of one hass gets the same downloader."""
+    hass = SimpleNamespace(data={})
+
+    downloader = get_radar_downloader(hass)
+
+    assert get_radar_downloader(hass) is downloader
+    assert hass.data["hungaromet"]["radar_downloader"] is downloader
@@ -0,0 +1,173 @@
+"""Tests for radar_encoder.py"""
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from custom_components.hungaromet import radar_encoder
+from custom_components.hungaromet.radar_encoder import (
+    ENCODERS,
+    TRANSPARENT_INDEX,
+    build_shared_palette,
+    diff_frames,
+    encode_apng,
+    encode_gif,
+    encode_webp,
+    get_encoder,
+    quantize_frames,
+)
+
+
+def _radar_frames():
+    frames = []
+    for step in range(4):
+        frame = Image.new("RGB", (64, 48), color=(20, 40, 60))
+        frame.paste((200, 30, 30), (4 + 8 * step, 10, 14 + 8 * step, 20))
+        frame.paste((30, 200, 30), (40, 30, 50, 40))
+        frames.append(frame)
+    return frames
+
+
+def test_shared_palette_leaves_transparent_index_free():
+    """Test quantized frames share one palette and never use the spare index."""
+    frames = quantize_frames(_radar_frames())
+
+    assert len({tuple(frame.getpalette()) for frame in frames}) == 1
+    assert max(int(np.asarray(frame).max()) for frame in frames) < TRANSPARENT_INDEX
+    assert build_shared_palette(_radar_frames()).mode == "P"
+
+
+def test_quantize_frames_reuses_common_palette(monkeypatch):
+    """Test frames decoded from one palette product are not re-quantized."""
+    frames = [frame.copy() for frame in quantize_frames(_radar_frames())]
+    monkeypatch.setattr(radar_encoder, "build_shared_palette", None)
+
+    reused = quantize_frames(frames)
+
+    assert [np.asarray(frame).tolist() for frame in reused] == [
+        np.asarray(frame).tolist() for frame in frames
+    ]
+    assert all(frame is not source for frame, source in zip(reused, frames))
+
+
+def test_quantize_frames_requantizes_mismatched_palettes():
+    """Test differing palettes or a used spare index fall back to quantizing."""
+    first, second = quantize_frames(_radar_frames()[:2])
+    second.putpalette([9, 9, 9] * 256)
+    full = Image.new("P", (4, 4), color=TRANSPARENT_INDEX)
+
+    assert radar_encoder._common_palette([first, second]) is None
+    assert radar_encoder._common_palette([full]) is None
+    assert radar_encoder._common_palette([Image.new("RGB", (4, 4))]) is None
+
+
+def test_diff_frames_marks_unchanged_pixels_transparent():
+    """Test diff_frames keeps only pixels that changed since the last frame."""
+    frames = quantize_frames(_radar_frames())
+
+    diffed = diff_frames(frames)
+
+    assert diffed[0] is frames[0]
+    changed = np.asarray(diffed[1]) != TRANSPARENT_INDEX
+    assert changed.any()
+    assert not changed[30:40, 40:50].any()
+    assert diff_frames([]) == []
+
+
+def test_diff_frames_keeps_frames_of_different_size():
+    """Test a frame with a different size is kept whole."""
+    frames = quantize_frames([Image.new("RGB", (8, 8)), Image.new("RGB", (4, 4))])
+
+    assert diff_frames(frames)[1] is frames[1]
+
+
+@pytest.mark.parametrize("encode", [encode_gif, encode_apng, encode_webp])
+def test_encoders_round_trip_quantized_frames(encode):
+    """Test every encoded animation decodes back to the quantized frames."""
+    source = _radar_frames()
+    expected = quantize_frames(source)
+
+    data = encode(source, duration=500, end_delay=2000)
+
+    with Image.open(BytesIO(data)) as animation:
+        decoded = [
+            frame.convert("RGB") for frame in ImageSequence.Iterator(animation)
+        ]
+        assert animation.info["loop"] == 0
+    assert len(decoded) == len(expected)
+    for frame, reference in zip(decoded, expected):
+        assert np.array_equal(np.asarray(frame), np.asarray(reference.convert("RGB")))
+
+
+def _many_color_frames(count, colors):
+    rng = np.random.default_rng(7)
+    palette = rng.integers(0, 256, size=(colors, 3), dtype=np.uint8)
+    palette[:4] = [(236, 0, 0), (121, 0, 0), (1, 1, 178), (0, 224, 134)]
+    return [
+        Image.fromarray(palette[rng.integers(0, colors, size=(48, 64))], "RGB")
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("encode", [encode_gif, encode_apng, encode_webp])
+def test_encoders_keep_exact_colors(encode):
+    """Test frames using at most 255 colours decode back pixel for pixel."""
+    source = _many_color_frames(2, 197)
+
+    data = encode(source)
+
+    with Image.open(BytesIO(data)) as animation:
+        decoded = [
+            np.asarray(frame.convert("RGB"))
+            for frame in ImageSequence.Iterator(animation)
+        ]
+    assert len(decoded) == len(source)
+    for frame, reference in zip(decoded, source):
+        assert np.array_equal(frame, np.asarray(reference))
+
+
+def test_shared_palette_beyond_palette_size_keeps_solid_areas():
+    """Test frames with too many colours still share a close fitting palette."""
+    source = _many_color_frames(2, 400)
+    for frame in source:
+        frame.paste((236, 0, 0), (0, 0, 32, 48))
+
+    frames = quantize_frames(source)
+    # Each frame fits the palette alone but not together with the other
+    halves = [
+        Image.fromarray(np.arange(200, dtype=np.uint8).reshape(10, 20) + offset, "L")
+        for offset in (0, 56)
+    ]
+
+    assert radar_encoder._exact_colors(halves) is None
+    assert build_shared_palette(source).mode == "P"
+    assert len({tuple(frame.getpalette()) for frame in frames}) == 1
+    assert max(int(np.asarray(frame).max()) for frame in frames) < TRANSPARENT_INDEX
+    solid = np.asarray(frames[0].convert("RGB"))[:, :32].astype(int)
+    assert np.abs(solid - (236, 0, 0)).max() <= 8
+
+
+def test_encode_gif_single_frame():
+    """Test a single frame is encoded as a still GIF."""
+    data = encode_gif([Image.new("RGB", (8, 8), color="red")])
+
+    with Image.open(BytesIO(data)) as gif:
+        assert gif.n_frames == 1
+
+
+def test_get_encoder_selects_format():
+    """Test formats map to their content type and file extension."""
+    assert get_encoder("webp").content_type == "image/webp"
+    assert get_encoder("apng").extension == "png"
+    assert get_encoder("gif") is ENCODERS["gif"]
+
+
+def test_get_encoder_falls_back_to_gif(monkeypatch):
+    """Test unknown formats and a Pillow without WebP fall back to GIF."""
+    assert get_encoder("bmp") is ENCODERS["gif"]
+
+    monkeypatch.setattr(radar_encoder.features, "check", lambda feature: False)
+
+    assert get_encoder("webp") is ENCODERS["gif"]
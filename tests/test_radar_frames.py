@@ -0,0 +1,162 @@
+"""Tests for radar_frames.py"""
+
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from custom_components.hungaromet.radar_frames import (
+    RadarFrame,
+    RadarFrameStore,
+    decode_frame,
+    encode_png,
+    frame_product,
+    frame_timestamp,
+    get_frame_store,
+    product_name,
+)
+
+
+def _palette_png(size=(8, 6), transparency=0):
+    image = Image.new("P", size)
+    image.putpalette([0, 0, 0, 200, 30, 30, 30, 200, 30])
+    image.paste(1, (0, 0, 4, 3))
+    image.paste(2, (4, 3, 8, 6))
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", transparency=transparency)
+    return buffer.getvalue()
+
+
+def _frame(name, size=(10, 10)):
+    return RadarFrame(name, None, np.zeros(size[::-1], dtype=np.uint8), b"\0" * 6)
+
+
+def test_frame_timestamp_parses_file_names():
+    """Test the UTC time is read from composite file names."""
+    assert frame_timestamp("refl2D_pscappi_20240101_1205.png") == datetime(
+        2024, 1, 1, 12, 5, tzinfo=timezone.utc
+    )
+    assert frame_timestamp("radar_202401011205.PNG").minute == 5
+    assert frame_timestamp("legend.png") is None
+    assert frame_timestamp("refl2D_pscappi_20241301_1205.png") is None
+
+
+def test_decode_frame_keeps_palette_indices():
+    """Test palette PNGs are stored as their index array and palette."""
+    frame = decode_frame("refl2D_pscappi_20240101_1205.png", _palette_png())
+
+    assert frame.indices.dtype == np.uint8
+    assert frame.indices.shape == (6, 8)
+    assert not frame.indices.flags.writeable
+    assert (frame.indices[0, 0], frame.indices[5, 7], frame.indices[0, 7]) == (1, 2, 0)
+    assert frame.palette[3:6] == bytes((200, 30, 30))
+    assert frame.transparency == 0
+    assert frame.timestamp.hour == 12
+    assert frame.size == (8, 6)
+    assert frame.nbytes == 48 + len(frame.palette)
+
+    image = frame.image()
+    assert image.mode == "P"
+    assert image.info["transparency"] == 0
+    assert image.convert("RGB").getpixel((7, 5)) == (30, 200, 30)
+
+
+def test_decode_frame_quantizes_rgb_images():
+    """Test true-colour PNGs are mapped onto a palette once."""
+    source = Image.new("RGB", (8, 6), color=(20, 40, 60))
+    source.paste((200, 30, 30), (0, 0, 4, 3))
+    buffer = BytesIO()
+    source.save(buffer, format="PNG")
+
+    frame = decode_frame("img.png", buffer.getvalue())
+
+    assert frame.transparency is None
+    assert frame.image().convert("RGB").getpixel((0, 0)) == (200, 30, 30)
+    assert frame.image().convert("RGB").getpixel((7, 5)) == (20, 40, 60)
+
+
+def test_encode_png_round_trips():
+    """Test frames encode to PNGs that decode to the same indices."""
+    frame = decode_frame("a_20240101_1205.png", _palette_png())
+
+    for level in (1, 9):
+        again = decode_frame(frame.name, encode_png(frame, level))
+        assert (again.indices == frame.indices).all()
+        assert again.transparency == 0
+
+
+def test_store_evicts_least_recently_used_beyond_byte_bound():
+    """Test RadarFrameStore keeps its decoded frames under ``max_bytes``."""
+    store = RadarFrameStore(max_bytes=250)
+    store.put(_frame("a.png"))
+    store.put(_frame("b.png"))
+    assert store.get("a.png").name == "a.png"
+
+    store.put(_frame("c.png"))
+
+    assert "b.png" not in store
+    assert store.get("b.png") is None
+    assert ("a.png" in store, "c.png" in store) == (True, True)
+    assert (len(store), store.nbytes) == (2, 212)
+    assert (store.hits, store.misses) == (1, 1)
+    assert [frame.name for frame in store.frames()] == ["a.png", "c.png"]
+
+    store.put(_frame("c.png"))
+    assert store.nbytes == 212
+
+    store.put(_frame("big.png", (20, 20)))
+    assert (len(store), store.nbytes) == (1, 406)
+
+
+def test_store_frames_of_one_product():
+    """Test frames of other radar products sharing the store are left out."""
+    store = RadarFrameStore()
+    for name in (
+        "refl2D_pscappi_20240101_1200.png",
+        "refl2D_20240101_1200.png",
+        "legend.png",
+    ):
+        store.put(_frame(name))
+
+    assert frame_product("refl2D_pscappi_20240101_1200.png") == "refl2D_pscappi"
+    assert frame_product("legend.png") is None
+    assert product_name("composite/png/refl2D/") == "refl2D"
+    assert [frame.name for frame in store.frames("refl2D")] == [
+        "refl2D_20240101_1200.png"
+    ]
+    assert len(store.frames()) == 3
+
+
+def test_store_is_consistent_under_concurrent_use():
+    """Test puts, gets and snapshots from pool threads keep the counters exact."""
+    store = RadarFrameStore(max_bytes=10 * 106)
+
+    def work(worker):
+        for index in range(200):
+            name = f"refl2D_20240101_{worker}{index:03}.png"
+            store.put(_frame(name))
+            store.get(name)
+            store.get("missing.png")
+            assert all(frame is not None for frame in store.frames("refl2D"))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(work, range(4)))
+
+    frames = store.frames()
+    assert len(frames) == 10
+    assert store.nbytes == sum(frame.nbytes for frame in frames)
+    assert store.hits + store.misses == 1600
+    assert store.misses >= 800
+
+
+def test_get_frame_store_is_shared():
+    """Test every radar consumer of one hass gets the same store."""
+    hass = SimpleNamespace(data={})
+
+    store = get_frame_store(hass)
+
+    assert get_frame_store(hass) is store
+    assert hass.data["hungaromet"]["radar_frames"] is store
@@ -1,17 +1,51 @@
 """Tests for radar_gif_creator.py"""
 
+import threading
+import time
 from io import BytesIO
 from unittest.mock import Mock, patch
 
 from PIL import Image
+import pytest
 import requests
 
+from custom_components.hungaromet.radar_frames import (
+    RadarFrame,
+    RadarFrameStore,
+    decode_frame,
+    encode_png,
+)
 from custom_components.hungaromet.radar_gif_creator import (
+    RadarGifUpdater,
     get_latest_image_urls,
+    parse_listing,
+    RadarDownload,
     download_images,
+    download_missing,
+    fetch_download,
+    create_animation,
     create_gif,
+    content_etag,
     update_radar_gif,
+    write_animation,
 )
+from custom_components.hungaromet.radar_overlay import RadarOverlay
+from custom_components.hungaromet.radar_region import RadarRegion
+
+
+def _frame(size=(10, 10), color="red", name="img1.png"):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="PNG")
+    return decode_frame(name, buffer.getvalue())
+
+
+def _listed(frames):
+    """Fake ``download_missing`` finding ``frames`` decoded for the listed URLs."""
+
+    def download(urls, **kwargs):
+        return RadarDownload(urls, cached=dict(zip(urls, frames)))
+
+    return download
 
 
 @patch("custom_components.hungaromet.radar_gif_creator.requests.get")
@@ -115,6 +149,25 @@ def test_get_latest_image_urls_non_tag_elements(mock_get):
     assert "image_001.png" in result[0]
 
 
+def test_parse_listing_handles_apache_markup():
+    """Test parse_listing extracts PNG links from an Apache-style listing."""
+    html_content = """
+    <tr><td><a href="?C=N;O=D">Name</a></td></tr>
+    <tr><td><a href="refl2D_pscappi_20240101_0010.png">x</a></td></tr>
+    <tr><td><A HREF='refl2D_pscappi_20240101_0000.png'>x</A></td></tr>
+    <tr><td><a href = "refl2D_pscappi_20240101_0020.png">x</a></td></tr>
+    <tr><td><a href="refl2D_pscappi_20240101_0020.png">again</a></td></tr>
+    <tr><td><a href="legend.png.txt">legend</a></td></tr>
+    """
+
+    assert parse_listing(html_content, 2) == [
+        "refl2D_pscappi_20240101_0010.png",
+        "refl2D_pscappi_20240101_0020.png",
+    ]
+    assert parse_listing(html_content, 10)[0] == "refl2D_pscappi_20240101_0000.png"
+    assert parse_listing("<html></html>", 6) == []
+
+
 @patch("custom_components.hungaromet.radar_gif_creator.requests.get")
 def test_download_images_success(mock_get):
     """Test download_images successfully downloads images."""
@@ -135,7 +188,20 @@ def test_download_images_success(mock_get):
     ])
 
     assert len(result) == 2
-    assert all(isinstance(img, Image.Image) for img in result)
+    assert all(isinstance(frame, RadarFrame) for frame in result)
+    assert [frame.name for frame in result] == ["img1.png", "img2.png"]
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.requests.get")
+def test_download_images_uses_decoder(mock_get):
+    """Test download_images hands the PNG bytes to the given decoder."""
+    mock_get.return_value = Mock(content=b"\x89PNG data")
+
+    result = download_images(
+        ["http://example.com/img1.png"], decoder=lambda name, data: (name, data)
+    )
+
+    assert result == [("img1.png", b"\x89PNG data")]
 
 
 @patch("custom_components.hungaromet.radar_gif_creator.requests.get")
@@ -171,6 +237,121 @@ def test_download_images_partial_success(mock_get):
     assert len(result) == 1
 
 
+@patch("custom_components.hungaromet.radar_gif_creator.requests.get")
+def test_download_images_keeps_order_and_bounds_concurrency(mock_get):
+    """Test download_images returns frames in URL order with limited workers."""
+    colors = ["red", "green", "blue", "white", "black"]
+    payloads = {}
+    for color in colors:
+        img_bytes = BytesIO()
+        Image.new("RGB", (4, 4), color=color).save(img_bytes, format="PNG")
+        payloads[f"http://example.com/{color}.png"] = img_bytes.getvalue()
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def _get(url, timeout):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        # Earlier URLs finish last
+        time.sleep(0.01 * (len(colors) - colors.index(url[19:-4])))
+        with lock:
+            running["now"] -= 1
+        return Mock(content=payloads[url], raise_for_status=Mock())
+
+    mock_get.side_effect = _get
+
+    result = download_images(list(payloads), max_workers=2, timeout=3)
+
+    assert [frame.image().convert("RGB").getpixel((0, 0)) for frame in result] == [
+        (255, 0, 0),
+        (0, 128, 0),
+        (0, 0, 255),
+        (255, 255, 255),
+        (0, 0, 0),
+    ]
+    assert running["peak"] == 2
+    assert {call.kwargs["timeout"] for call in mock_get.call_args_list} == {3}
+
+
+def test_download_images_empty_list():
+    """Test download_images without URLs returns no frames."""
+    assert download_images([]) == []
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.requests.get")
+def test_download_images_fetches_only_uncached_frames(mock_get):
+    """Test download_images reuses stored frames and stores new ones."""
+    img_bytes = BytesIO()
+    Image.new("RGB", (4, 4), color="red").save(img_bytes, format="PNG")
+    mock_get.return_value = Mock(
+        content=img_bytes.getvalue(), raise_for_status=Mock()
+    )
+    store = RadarFrameStore()
+    stored = _frame((4, 4), "blue", "b.png")
+    store.put(stored)
+
+    result = download_images(
+        ["http://example.com/a.png", "http://example.com/b.png"], store=store
+    )
+
+    mock_get.assert_called_once()
+    assert mock_get.call_args[0][0] == "http://example.com/a.png"
+    assert result[1] is stored
+    assert (store.hits, store.misses, len(store)) == (1, 1, 2)
+
+    mock_get.reset_mock()
+    again = download_images(
+        ["http://example.com/a.png", "http://example.com/b.png"], store=store
+    )
+
+    mock_get.assert_not_called()
+    assert again == result
+    assert store.hits == 3
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+def test_fetch_download_lists_latest_frames(mock_download, mock_get_urls):
+    """Test fetch_download lists the newest frames and downloads missing ones."""
+    store = RadarFrameStore()
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    downloader = Mock()
+
+    assert fetch_download(store, 3, downloader) == mock_download.return_value
+    assert mock_get_urls.call_args.kwargs == {"count": 3, "downloader": downloader}
+    mock_download.assert_called_once_with(
+        mock_get_urls.return_value, store=store, downloader=downloader
+    )
+
+    mock_get_urls.return_value = []
+    assert fetch_download(store) is None
+    mock_download.assert_called_once()
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.requests.get")
+def test_download_missing_leaves_decoding_to_the_caller(mock_get):
+    """Test frames are downloaded as bytes and only decoded on request."""
+    mock_get.return_value = Mock(content=b"\x89PNG data")
+    store = RadarFrameStore()
+    stored = _frame(name="b.png")
+    store.put(stored)
+    decoder = Mock(return_value=_frame(name="a.png"))
+
+    download = download_missing(
+        ["http://example.com/a.png", "http://example.com/b.png"], store=store
+    )
+
+    assert download.downloaded == {"http://example.com/a.png": b"\x89PNG data"}
+    assert download.cached == {"http://example.com/b.png": stored}
+    assert download.newest == "b.png"
+    assert len(store) == 1
+    frames = download.decode(store, decoder)
+    decoder.assert_called_once_with("a.png", b"\x89PNG data")
+    assert frames == [decoder.return_value, stored]
+    assert "a.png" in store
+
+
 def test_create_gif_success(tmp_path):
     """Test create_gif successfully creates a GIF."""
     # Create test images
@@ -182,49 +363,119 @@ def test_create_gif_success(tmp_path):
 
     output_path = tmp_path / "test.gif"
 
-    create_gif(images, str(output_path), duration=500, end_delay=2000)
+    data = create_gif(images, str(output_path), duration=500, end_delay=2000)
 
     assert output_path.exists()
+    assert output_path.read_bytes() == data
     # Verify it's a valid GIF
     with Image.open(output_path) as img:
         assert img.format == "GIF"
         assert img.n_frames == 3
 
 
+def test_write_animation_replaces_file_atomically(tmp_path, monkeypatch):
+    """Test the output is swapped in whole and no temporary file is left."""
+    output_path = tmp_path / "radar_animation.gif"
+    output_path.write_bytes(b"old")
+
+    write_animation(b"new", str(output_path))
+
+    assert output_path.read_bytes() == b"new"
+    assert output_path.stat().st_mode & 0o777 == 0o644
+    assert [path.name for path in tmp_path.iterdir()] == ["radar_animation.gif"]
+
+    def fail(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(
+        "custom_components.hungaromet.radar_gif_creator.os.replace", fail
+    )
+    with pytest.raises(OSError):
+        write_animation(b"newer", str(output_path))
+    assert output_path.read_bytes() == b"new"
+    assert [path.name for path in tmp_path.iterdir()] == ["radar_animation.gif"]
+
+
+def test_content_etag_follows_bytes():
+    """Test the ETag is stable for equal bytes and differs otherwise."""
+    assert content_etag(b"GIF89a") == content_etag(b"GIF89a")
+    assert content_etag(b"GIF89a") != content_etag(b"GIF89b")
+    assert len(content_etag(b"")) == 16
+
+
 def test_create_gif_empty_images_list(tmp_path):
     """Test create_gif handles empty image list."""
     output_path = tmp_path / "test.gif"
 
-    create_gif([], str(output_path))
+    assert create_gif([], str(output_path)) is None
 
     # Should not create the file
     assert not output_path.exists()
 
 
 @patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
-@patch("custom_components.hungaromet.radar_gif_creator.download_images")
-@patch("custom_components.hungaromet.radar_gif_creator.create_gif")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
 @patch("custom_components.hungaromet.radar_gif_creator.os.path.exists")
 @patch("custom_components.hungaromet.radar_gif_creator.os.makedirs")
 def test_update_radar_gif_success(
-    mock_makedirs, mock_exists, mock_create_gif, mock_download, mock_get_urls
+    mock_makedirs, mock_exists, mock_create_animation, mock_download, mock_get_urls
 ):
     """Test update_radar_gif successfully updates GIF."""
     mock_get_urls.return_value = [
         "http://example.com/img1.png",
         "http://example.com/img2.png",
     ]
-    mock_download.return_value = [
-        Image.new("RGB", (100, 100), color="red"),
-        Image.new("RGB", (100, 100), color="green"),
-    ]
+    mock_download.side_effect = _listed(
+        [_frame((100, 100), "red"), _frame((100, 100), "green", "img2.png")]
+    )
     mock_exists.return_value = True
+    mock_create_animation.return_value = b"GIF89a"
 
-    update_radar_gif()
+    assert update_radar_gif() == "updated"
 
     mock_get_urls.assert_called_once()
     mock_download.assert_called_once()
-    mock_create_gif.assert_called_once()
+    mock_create_animation.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("image_format", "magic"),
+    [("gif", b"GIF89a"), ("webp", b"RIFF"), ("apng", b"\x89PNG")],
+)
+def test_create_animation_formats(tmp_path, image_format, magic):
+    """Test create_animation writes the requested format."""
+    images = [
+        Image.new("RGB", (20, 20), color="red"),
+        Image.new("RGB", (20, 20), color="blue"),
+    ]
+    output_path = tmp_path / "radar"
+
+    data = create_animation(images, str(output_path), image_format)
+
+    assert data.startswith(magic)
+    assert output_path.read_bytes() == data
+    with Image.open(output_path) as img:
+        assert img.n_frames == 2
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
+def test_updater_writes_selected_format(
+    mock_create_animation, mock_download, mock_get_urls
+):
+    """Test RadarGifUpdater encodes and names its output after the format."""
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    frames = [_frame()]
+    mock_download.side_effect = _listed(frames)
+    mock_create_animation.return_value = b"RIFF"
+    updater = RadarGifUpdater(image_format="webp")
+
+    assert updater.update() == "updated"
+
+    assert updater.output_path.endswith("radar_animation.webp")
+    assert mock_create_animation.call_args[0][1:3] == (updater.output_path, "webp")
 
 
 @patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
@@ -238,11 +489,12 @@ def test_update_radar_gif_no_urls(mock_get_urls):
 
 
 @patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
-@patch("custom_components.hungaromet.radar_gif_creator.download_images")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
 def test_update_radar_gif_no_images_downloaded(mock_download, mock_get_urls):
     """Test update_radar_gif handles no images downloaded."""
     mock_get_urls.return_value = ["http://example.com/img1.png"]
-    mock_download.return_value = []
+    frames = []
+    mock_download.side_effect = _listed(frames)
 
     update_radar_gif()
 
@@ -250,16 +502,17 @@ def test_update_radar_gif_no_images_downloaded(mock_download, mock_get_urls):
 
 
 @patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
-@patch("custom_components.hungaromet.radar_gif_creator.download_images")
-@patch("custom_components.hungaromet.radar_gif_creator.create_gif")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
 @patch("custom_components.hungaromet.radar_gif_creator.os.path.exists")
 @patch("custom_components.hungaromet.radar_gif_creator.os.makedirs")
 def test_update_radar_gif_creates_www_dir(
-    mock_makedirs, mock_exists, mock_create_gif, mock_download, mock_get_urls
+    mock_makedirs, mock_exists, mock_create_animation, mock_download, mock_get_urls
 ):
     """Test update_radar_gif creates www directory if it doesn't exist."""
     mock_get_urls.return_value = ["http://example.com/img1.png"]
-    mock_download.return_value = [Image.new("RGB", (100, 100), color="red")]
+    frames = [_frame((100, 100))]
+    mock_download.side_effect = _listed(frames)
     mock_exists.return_value = False
 
     update_radar_gif()
@@ -276,3 +529,226 @@ def test_update_radar_gif_handles_network_error(mock_get_urls):
     update_radar_gif()
 
     mock_get_urls.assert_called_once()
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
+def test_updater_skips_rebuild_without_new_frame(
+    mock_create_animation, mock_download, mock_get_urls
+):
+    """Test RadarGifUpdater only rebuilds when a newer frame is listed."""
+    mock_get_urls.return_value = [
+        "http://example.com/img1.png",
+        "http://example.com/img2.png",
+    ]
+    frames = [_frame()]
+    mock_download.side_effect = _listed(frames)
+    mock_create_animation.return_value = b"GIF89a"
+    updater = RadarGifUpdater()
+
+    assert updater.update() == "updated"
+    assert updater.last_frame == "img2.png"
+    assert updater.gif_bytes == b"GIF89a"
+    assert updater.etag == content_etag(b"GIF89a")
+    (image,) = mock_create_animation.call_args[0][0]
+    assert image.convert("RGB").getpixel((0, 0)) == (255, 0, 0)
+    assert mock_download.call_args.kwargs["store"] is updater.frame_store
+
+    assert updater.update() == "unchanged"
+    assert mock_create_animation.call_count == 1
+
+    assert updater.update(force=True) == "updated"
+    assert mock_create_animation.call_count == 2
+
+    mock_get_urls.return_value = ["http://example.com/img3.png"]
+    mock_create_animation.return_value = None
+    assert updater.update() == "failed"
+    assert updater.last_frame == "img2.png"
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
+def test_updater_crops_frames_to_region(mock_create_animation, mock_download, mock_get_urls):
+    """Test RadarGifUpdater encodes only the configured region."""
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    frames = [_frame((1024, 768))]
+    mock_download.side_effect = _listed(frames)
+    mock_create_animation.return_value = b"GIF89a"
+    updater = RadarGifUpdater(region=RadarRegion(47.5, 19.04, 100, downscale=2))
+
+    assert updater.update() == "updated"
+
+    (frame,) = mock_create_animation.call_args[0][0]
+    assert frame.size[0] < 150
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
+@patch("custom_components.hungaromet.radar_gif_creator.apply_overlay")
+def test_updater_draws_overlay(
+    mock_overlay, mock_create_animation, mock_download, mock_get_urls
+):
+    """Test RadarGifUpdater draws its overlay over the cropped frames."""
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    frames = [_frame((1024, 768))]
+    mock_download.side_effect = _listed(frames)
+    mock_overlay.return_value = ["overlaid"]
+    mock_create_animation.return_value = b"GIF89a"
+    region = RadarRegion(47.5, 19.04, 100)
+    overlay = RadarOverlay(47.5, 19.04)
+
+    assert RadarGifUpdater(region=region, overlay=overlay).update() == "updated"
+
+    images, drawn, drawn_region, source_size = mock_overlay.call_args[0]
+    assert images[0].size[0] < 300
+    assert (drawn, drawn_region, source_size) == (overlay, region, (1024, 768))
+    assert mock_create_animation.call_args[0][0] == ["overlaid"]
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+def test_updater_builds_size_variants(mock_download, mock_get_urls, tmp_path):
+    """Test every size is reduced from the frames decoded and cropped once."""
+    mock_get_urls.return_value = [
+        "http://example.com/img1.png",
+        "http://example.com/img2.png",
+    ]
+    frames = [_frame((1024, 768)), _frame((1024, 768), "blue")]
+    pngs = [encode_png(frame) for frame in frames]
+    mock_download.side_effect = lambda urls, **kwargs: RadarDownload(
+        urls, downloaded=dict(zip(urls, pngs))
+    )
+    updater = RadarGifUpdater(variants=("half", "thumbnail"))
+    updater.output_path = str(tmp_path / "radar_animation.gif")
+
+    with patch(
+        "custom_components.hungaromet.radar_frames.RadarFrame.image",
+        autospec=True,
+        side_effect=RadarFrame.image,
+    ) as mock_image:
+        assert updater.update() == "updated"
+    assert mock_image.call_count == 2
+
+    sizes = {}
+    for path in tmp_path.iterdir():
+        with Image.open(path) as animation:
+            sizes[path.name] = (animation.size, animation.n_frames)
+    assert sizes == {
+        "radar_animation.gif": ((1024, 768), 2),
+        "radar_animation_half.gif": ((512, 384), 2),
+        "radar_animation_thumbnail.gif": ((205, 154), 2),
+    }
+    data, etag = updater.variant_outputs["thumbnail"]
+    assert (tmp_path / "radar_animation_thumbnail.gif").read_bytes() == data
+    assert etag == content_etag(data)
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+@patch("custom_components.hungaromet.radar_gif_creator.create_animation")
+@patch("custom_components.hungaromet.radar_gif_creator.forecast_frames")
+def test_updater_appends_nowcast_frames(
+    mock_forecast, mock_create_animation, mock_download, mock_get_urls
+):
+    """Test RadarGifUpdater encodes forecast frames after the observed ones."""
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    frames = [_frame()]
+    mock_download.side_effect = _listed(frames)
+    mock_forecast.return_value = [_frame(color="blue")]
+    mock_create_animation.return_value = None
+
+    assert RadarGifUpdater().update() == "failed"
+    mock_forecast.assert_not_called()
+    assert len(mock_create_animation.call_args[0][0]) == 1
+
+    assert RadarGifUpdater(nowcast=True).update() == "failed"
+    mock_forecast.assert_called_once_with(frames)
+    assert len(mock_create_animation.call_args[0][0]) == 2
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+def test_updater_archives_downloaded_frames(mock_download, mock_get_urls):
+    """Test RadarGifUpdater hands every downloaded frame to its archive."""
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    frames = [_frame()]
+    mock_download.side_effect = _listed(frames)
+    worker = Mock()
+    worker.build_animations.return_value = [None]
+    archive = Mock()
+
+    RadarGifUpdater(worker=worker, archive=archive).update()
+
+    archive.add.assert_called_once_with(frames)
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+def test_updater_encodes_in_worker(mock_download, mock_get_urls, tmp_path):
+    """Test RadarGifUpdater sends PNG bytes to its worker and writes its output."""
+    mock_get_urls.return_value = [
+        "http://example.com/img1.png",
+        "http://example.com/img2.png",
+    ]
+    png = encode_png(_frame(name="img2.png"))
+    cached = _frame()
+    mock_download.side_effect = lambda urls, **kwargs: RadarDownload(
+        urls, cached={urls[0]: cached}, downloaded={urls[1]: png}
+    )
+    worker = Mock()
+    worker.build_animations.return_value = [b"GIF89a", b"small", None]
+    region = RadarRegion(47.5, 19.04, 100)
+    updater = RadarGifUpdater(
+        region=region, worker=worker, variants=("half", "thumbnail"), nowcast=True
+    )
+    updater.output_path = str(tmp_path / "radar_animation.gif")
+
+    assert updater.update() == "updated"
+
+    # Downloaded bytes go as they are; a frame only known decoded is encoded
+    assert updater.pngs == {"img1.png": encode_png(cached), "img2.png": png}
+    worker.build_animations.assert_called_once_with(
+        updater.pngs.items(),
+        "gif",
+        region,
+        1000,
+        3000,
+        None,
+        ("half", "thumbnail"),
+        True,
+    )
+    assert updater.frame_store.get("img2.png") is not None
+    assert (tmp_path / "radar_animation.gif").read_bytes() == b"GIF89a"
+    assert (tmp_path / "radar_animation_half.gif").read_bytes() == b"small"
+    assert not (tmp_path / "radar_animation_thumbnail.gif").exists()
+    assert updater.variant_outputs == {"half": (b"small", content_etag(b"small"))}
+
+    worker.build_animations.return_value = [None]
+    assert updater.update(force=True) == "failed"
+
+    updater.close()
+    worker.shutdown.assert_called_once()
+    RadarGifUpdater().close()
+
+
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+def test_updater_encodes_in_process_when_worker_died(
+    mock_download, mock_get_urls, tmp_path, caplog
+):
+    """Test a build whose worker died is encoded in process instead."""
+    mock_get_urls.return_value = ["http://example.com/img1.png"]
+    mock_download.side_effect = _listed([_frame()])
+    worker = Mock()
+    worker.build_animations.return_value = None
+    updater = RadarGifUpdater(worker=worker)
+    updater.output_path = str(tmp_path / "radar_animation.gif")
+
+    assert updater.update() == "updated"
+
+    assert "Encoding the radar animation in process" in caplog.text
+    with Image.open(tmp_path / "radar_animation.gif") as gif:
+        assert gif.size == (10, 10)
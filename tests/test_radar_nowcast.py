@@ -0,0 +1,219 @@
+"""Tests for radar_nowcast.py"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from custom_components.hungaromet.radar_frames import RadarFrame
+from custom_components.hungaromet.radar_nowcast import (
+    FORECAST_FRAME_MINUTES,
+    LEGEND_BOX,
+    STATIC_MIN_FRAMES,
+    RadarMotion,
+    estimate_motion,
+    forecast_frames,
+    latest_motion,
+    motion_pair,
+    rain_expected_in,
+)
+from custom_components.hungaromet.radar_precipitation import REFLECTIVITY_SCALE
+from custom_components.hungaromet.radar_region import location_pixel
+
+SIZE = (1024, 768)
+BUDAPEST = (47.5, 19.04)
+PALETTE = bytes([200, 200, 200] + [c for _, rgb in REFLECTIVITY_SCALE for c in rgb])
+# Pixels per five minutes, north-east bound
+VELOCITY = (-3, 6)
+MARGIN = 100
+# A real composite: its map, legend boxes (16 of 19 pixels from x 709 on
+# row 725) and a few specks of clutter that never move
+RADAR_GIF = Path(__file__).resolve().parents[1] / "radar_animation.gif"
+LEGEND_CENTRES = range(709 + 19 // 2, 1013, 19)
+
+
+def _field(seed=1):
+    rng = np.random.default_rng(seed)
+    height, width = SIZE[1] + 2 * MARGIN, SIZE[0] + 2 * MARGIN
+    field = np.zeros((height, width), dtype=np.uint8)
+    yy, xx = np.ogrid[:height, :width]
+    for _ in range(60):
+        y, x = rng.integers(0, height), rng.integers(0, width)
+        radius = rng.integers(5, 40)
+        field[(yy - y) ** 2 + (xx - x) ** 2 < radius**2] = rng.integers(1, 12)
+    return field
+
+
+FIELD = _field()
+
+
+def _time(step):
+    return datetime(2024, 1, 1, 12, tzinfo=timezone.utc) + timedelta(minutes=5 * step)
+
+
+def _frame(step, field=FIELD, velocity=VELOCITY):
+    top = MARGIN - velocity[0] * step
+    left = MARGIN - velocity[1] * step
+    indices = np.ascontiguousarray(field[top : top + SIZE[1], left : left + SIZE[0]])
+    return RadarFrame(f"f{step}.png", _time(step), indices, PALETTE)
+
+
+def _storm(step, distance, velocity=(0, -6)):
+    """A band of rain ``distance`` pixels east of Budapest at step 0."""
+    field = np.zeros((SIZE[1] + 2 * MARGIN, SIZE[0] + 2 * MARGIN), np.uint8)
+    x, y = (int(value) + MARGIN for value in location_pixel(SIZE, *BUDAPEST))
+    # Textured like real echoes, every class heavy enough to count as rain
+    band = np.random.default_rng(2).integers(4, 12, (300, 120), dtype=np.uint8)
+    field[y - 150 : y + 150, x + distance : x + distance + 120] = band
+    return _frame(step, field, velocity)
+
+
+def test_estimate_motion_recovers_shift():
+    """Test phase correlation finds the shift between frames to sub-pixel."""
+    motion = estimate_motion(_frame(0), _frame(3))
+
+    dy, dx = np.median(motion.vectors.reshape(-1, 2), axis=0) * 5
+    assert dy == pytest.approx(VELOCITY[0], abs=0.1)
+    assert dx == pytest.approx(VELOCITY[1], abs=0.1)
+    assert motion.speed_kmh > 0
+    # Moving east-north-east means coming from the west-south-west
+    assert 225 < motion.direction < 270
+    assert motion.at(-5, 10**6) is not None
+
+
+def test_estimate_motion_without_echoes_or_time():
+    """Test motion is None without echoes, elapsed time or equal sizes."""
+    empty = np.zeros(SIZE[::-1], np.uint8)
+    dry = [RadarFrame(f"d{step}.png", _time(step), empty, PALETTE) for step in (0, 1)]
+    small = RadarFrame("s.png", _time(0), np.zeros((10, 10), np.uint8), PALETTE)
+    tiny = [
+        RadarFrame(f"t{step}.png", _time(step), np.ones((10, 10), np.uint8), PALETTE)
+        for step in (0, 1)
+    ]
+
+    assert estimate_motion(*dry) is None
+    assert estimate_motion(_frame(1), _frame(0)) is None
+    assert estimate_motion(small, _frame(1)) is None
+    assert estimate_motion(*tiny) is None
+
+
+def test_motion_pair_uses_oldest_frame_within_span():
+    """Test the pair spans up to 15 minutes of same-size timestamped frames."""
+    untimed = RadarFrame("legend.png", None, FIELD, PALETTE)
+    frames = [_frame(step) for step in (4, 0, 1, 2)] + [untimed]
+
+    previous, latest = motion_pair(frames)
+
+    assert (previous.name, latest.name) == ("f1.png", "f4.png")
+    assert motion_pair([_frame(0)]) is None
+    assert motion_pair([_frame(0), _frame(4)]) is None
+
+
+def test_motion_field_interpolates_between_tiles():
+    """Test the per-pixel field blends neighbouring tile vectors."""
+    vectors = np.zeros((2, 2, 2), np.float32)
+    vectors[:, 1, 1] = 4.0
+    motion = RadarMotion(vectors, 10, (20, 20), 0.0, None)
+
+    dy, dx = motion.field()
+
+    assert dy.shape == (20, 20)
+    assert not dy.any()
+    assert (dx[:, 0] == 0.0).all()
+    assert (dx[:, 19] == 4.0).all()
+    assert dx[0, 10] == pytest.approx(2.2)
+
+
+def test_forecast_frames_extrapolate_latest_frame():
+    """Test forecast frames follow the motion and are named by valid time."""
+    frames = [_frame(step) for step in range(4)]
+
+    forecast = forecast_frames(frames)
+
+    assert [frame.timestamp for frame in forecast] == [
+        _time(3) + timedelta(minutes=minutes) for minutes in FORECAST_FRAME_MINUTES
+    ]
+    assert forecast[0].name == "nowcast_20240101_1230.png"
+    assert forecast[0].palette == PALETTE
+    assert not forecast[0].indices.flags.writeable
+    truth = _frame(6).indices
+    echoes = truth > 0
+    assert (forecast[0].indices == truth).mean() > 0.95
+    assert (forecast[0].indices[echoes] == truth[echoes]).mean() > 0.85
+    assert forecast_frames(frames[:1]) == []
+
+
+def test_rain_expected_in_traces_upstream_pixels():
+    """Test rain arrives after the minutes the band needs to reach home."""
+    # 1.2 px per minute, so 36 px away after two steps arrive in 30 minutes
+    arriving = [_storm(step, 48) for step in range(3)]
+    leaving = [_storm(step, 48, (0, 6)) for step in range(3)]
+    overhead = [_storm(step, -60) for step in range(3)]
+
+    minutes = rain_expected_in(arriving, *BUDAPEST, radius_km=1)
+
+    assert 25 <= minutes <= 35
+    assert rain_expected_in(leaving, *BUDAPEST, radius_km=1) is None
+    assert rain_expected_in(overhead, *BUDAPEST, radius_km=1) == 0
+    assert rain_expected_in(arriving, 60.0, 19.0, 1) is None
+    assert rain_expected_in(arriving[:1], *BUDAPEST, 1) is None
+
+
+def test_rain_expected_in_without_motion_uses_current_frame():
+    """Test a dry pair without motion only reports rain already there."""
+    empty = np.zeros(SIZE[::-1], np.uint8)
+    dry = [RadarFrame(f"d{step}.png", _time(step), empty, PALETTE) for step in (0, 1)]
+
+    assert rain_expected_in(dry, *BUDAPEST, radius_km=5) is None
+
+
+def _real_frames(velocity, distance, steps=STATIC_MIN_FRAMES):
+    """
+    The bundled composite with a band of rain in its own legend colours
+    starting ``distance`` pixels east of Budapest and moving ``velocity``
+    pixels every five minutes; the map and the legend stay put.
+    """
+    with Image.open(RADAR_GIF) as image:
+        base = np.array(image)
+        palette = bytes(image.getpalette())
+    # Palette indices of the 20 to 45 dBZ legend boxes
+    rain = base[725, list(LEGEND_CENTRES)][6:12]
+    band = np.random.default_rng(3).choice(rain, (200, 120))
+    x, y = (int(value) for value in location_pixel(SIZE, *BUDAPEST))
+    frames = []
+    for step in range(steps):
+        indices = base.copy()
+        top = y - 100 + velocity[0] * step
+        left = x + distance + velocity[1] * step
+        indices[top : top + 200, left : left + 120] = band
+        frames.append(RadarFrame(f"r{step}.png", _time(step), indices, palette))
+    return base, frames
+
+
+def test_motion_of_real_frame_ignores_legend():
+    """Test a band shifted over a real frame is tracked past the static legend."""
+    # As many legend tiles as rain tiles: unmasked, the median halves
+    base, frames = _real_frames((2, -12), 180)
+    x, y = (int(value) for value in location_pixel(SIZE, *BUDAPEST))
+
+    latest, motion = latest_motion(frames)
+
+    assert latest is frames[-1]
+    dy, dx = motion.at(x + 130, y) * 5
+    assert dy == pytest.approx(2, abs=0.2)
+    assert dx == pytest.approx(-12, abs=0.2)
+    assert np.median(motion.vectors.reshape(-1, 2), axis=0) * 5 == pytest.approx(
+        (2, -12), abs=0.2
+    )
+    left, top, right, bottom = LEGEND_BOX
+    assert motion.static[top:bottom, left:right].all()
+    # The band leads 120 px east at 2.4 px per minute: 10 km short of home
+    # after about 46 minutes, so within the 50 minute step
+    assert rain_expected_in(frames, *BUDAPEST, radius_km=10) == 50
+    # Forecasts move the band but leave the legend where it is
+    forecast = forecast_frames(frames)
+    legend = (slice(top, bottom), slice(left, right))
+    assert (forecast[-1].indices[legend] == base[legend]).all()
+    assert not (forecast[0].indices == frames[-1].indices).all()
@@ -0,0 +1,158 @@
+"""Tests for radar_overlay.py"""
+
+import numpy as np
+from PIL import Image
+
+from custom_components.hungaromet import radar_overlay
+from custom_components.hungaromet.radar_overlay import (
+    RadarOverlay,
+    apply_overlay,
+    render_layer,
+)
+from custom_components.hungaromet.radar_region import (
+    RadarRegion,
+    apply_region,
+    location_pixel,
+)
+
+SIZE = (1024, 768)
+HOME = RadarOverlay(47.5, 19.04)
+
+
+def _palette_frame(transparency=None):
+    image = Image.new("P", SIZE, 1)
+    # Transparent, map grey, black and white
+    image.putpalette([0, 0, 0, 150, 160, 150, 10, 10, 10, 250, 250, 250])
+    if transparency is not None:
+        image.info["transparency"] = transparency
+    return image
+
+
+def test_render_layer_marks_home_and_is_cached():
+    """Test the layer covers the home marker and is rendered only once."""
+    layer = render_layer(HOME, None, SIZE)
+
+    assert render_layer(HOME, None, SIZE) is layer
+    assert layer.size == SIZE
+    x, y = (int(value) for value in location_pixel(SIZE, 47.5, 19.04))
+    near_home = (abs(layer.xs - x) <= 6) & (abs(layer.ys - y) <= 6)
+    assert near_home.any()
+    assert (layer.inverse_alpha >= 0).all() and (layer.inverse_alpha < 1).all()
+    bare = render_layer(RadarOverlay(47.5, 19.04, towns=False), None, SIZE)
+    assert len(bare.ys) < len(layer.ys)
+    assert (abs(bare.xs - x) <= 7).all() and (abs(bare.ys - y) <= 7).all()
+
+
+def test_render_layer_matches_cropped_frames():
+    """Test the layer is drawn at the size and offset of the cropped frames."""
+    region = RadarRegion(47.5, 19.04, 100, downscale=3)
+    (cropped,) = apply_region([Image.new("RGB", SIZE)], region)
+
+    layer = render_layer(RadarOverlay(47.5, 19.04, towns=False), region, SIZE)
+
+    assert layer.size == cropped.size
+    centre_x, centre_y = layer.size[0] / 2, layer.size[1] / 2
+    assert abs(layer.xs.mean() - centre_x) < 2
+    assert abs(layer.ys.mean() - centre_y) < 2
+    # Towns outside the crop are left out
+    labelled = render_layer(RadarOverlay(47.5, 19.04), region, SIZE)
+    assert labelled.size == layer.size
+    assert len(labelled.ys) > len(layer.ys)
+
+
+def test_apply_overlay_keeps_palette_frames_paletted():
+    """Test palette frames keep their palette and only overlay pixels change."""
+    image = _palette_frame(transparency=0)
+
+    (result,) = apply_overlay([image], HOME, None, SIZE)
+
+    assert result.mode == "P"
+    assert result.getpalette() == image.getpalette()
+    assert result.info["transparency"] == 0
+    indices = np.array(result)
+    layer = render_layer(HOME, None, SIZE)
+    changed = indices != 1
+    assert changed.sum() <= len(layer.ys)
+    assert changed.any()
+    # The transparent black is never used for dark overlay pixels
+    assert not (indices == 0).any()
+    assert set(np.unique(indices[changed])) <= {2, 3}
+
+
+def test_palette_frames_match_each_colour_once(monkeypatch):
+    """Test frames sharing a palette reuse its matched overlay colours."""
+    layer = render_layer(HOME, None, SIZE)
+    layer.tables.clear()
+    matched = []
+    nearest = radar_overlay._nearest_indices
+
+    def counting(colors, palette, transparency):
+        matched.append(len(colors))
+        return nearest(colors, palette, transparency)
+
+    monkeypatch.setattr(radar_overlay, "_nearest_indices", counting)
+    first, second = apply_overlay(
+        [_palette_frame(transparency=0), _palette_frame(transparency=0)],
+        HOME,
+        None,
+        SIZE,
+    )
+
+    assert len(matched) == 1
+    assert np.array_equal(np.array(first), np.array(second))
+    # Another index under the overlay only matches the new pairs
+    image = _palette_frame(transparency=0)
+    image.paste(2, (0, 0, SIZE[0] // 2, SIZE[1]))
+    (result,) = apply_overlay([image], HOME, None, SIZE)
+    assert len(matched) == 2
+    right = layer.xs >= SIZE[0] // 2
+    assert np.array_equal(
+        np.array(result)[layer.ys[right], layer.xs[right]],
+        np.array(first)[layer.ys[right], layer.xs[right]],
+    )
+    # Each palette has its own table, and only the latest few are kept
+    for value in range(radar_overlay.PALETTE_TABLES + 1):
+        image = _palette_frame()
+        image.putpalette([value, 0, 0, 150, 160, 150, 10, 10, 10, 250, 250, 250])
+        apply_overlay([image], HOME, None, SIZE)
+    assert len(matched) == 7
+    assert len(layer.tables) == radar_overlay.PALETTE_TABLES
+
+
+def test_apply_overlay_blends_rgb_frames():
+    """Test downscaled RGB frames are alpha blended directly."""
+    image = Image.new("RGB", SIZE, (100, 150, 200))
+
+    (result,) = apply_overlay([image], HOME, None, SIZE)
+
+    pixels = np.array(result)
+    layer = render_layer(HOME, None, SIZE)
+    untouched = np.ones(SIZE[::-1], bool)
+    untouched[layer.ys, layer.xs] = False
+    assert (pixels[untouched] == (100, 150, 200)).all()
+    assert (pixels[layer.ys, layer.xs] != (100, 150, 200)).any(axis=1).all()
+
+
+def test_apply_overlay_passes_through():
+    """Test no overlay, no images or other sizes leave frames untouched."""
+    image = Image.new("RGB", (10, 10))
+
+    assert apply_overlay([image], None, None, SIZE) == [image]
+    assert apply_overlay([], HOME, None, SIZE) == []
+    assert apply_overlay([image], HOME, None, SIZE) == [image]
+
+
+def test_labels_without_accented_font(monkeypatch):
+    """Test labels fall back to unaccented names with Pillow's own font."""
+    monkeypatch.setattr(radar_overlay, "LABEL_FONT", "missing-font.ttf")
+    drawn = []
+    monkeypatch.setattr(
+        radar_overlay.ImageDraw.ImageDraw,
+        "text",
+        lambda self, xy, text, **kwargs: drawn.append(text),
+    )
+
+    render_layer(RadarOverlay(46.0, 20.0), None, SIZE)
+
+    assert "Gyor" in drawn
+    assert "Pecs" in drawn
@@ -0,0 +1,142 @@
+"""Tests for radar_precipitation.py"""
+
+import math
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from custom_components.hungaromet.radar_frames import RadarFrame
+from custom_components.hungaromet.radar_precipitation import (
+    REFLECTIVITY_SCALE,
+    palette_dbz,
+    rain_rate,
+    sample_precipitation,
+)
+from custom_components.hungaromet.radar_region import location_pixel
+
+SIZE = (1024, 768)
+BUDAPEST = (47.5, 19.04)
+# Index 0 is the map background, then one index per reflectivity class
+PALETTE = bytes([200, 200, 200] + [c for _, rgb in REFLECTIVITY_SCALE for c in rgb])
+DBZ_INDEX = {dbz: index + 1 for index, (dbz, _) in enumerate(REFLECTIVITY_SCALE)}
+# A real composite with its legend: 16 boxes of 19 pixels from x 709
+RADAR_GIF = Path(__file__).resolve().parents[1] / "radar_animation.gif"
+LEGEND_ROW = 725
+LEGEND_CENTRES = range(709 + 19 // 2, 1013, 19)
+
+
+def _frame(minute, centre_dbz=None, ring_dbz=None, name=None):
+    indices = np.zeros(SIZE[::-1], dtype=np.uint8)
+    x, y = (int(value) for value in location_pixel(SIZE, *BUDAPEST))
+    if ring_dbz is not None:
+        # About 4 km east of the location
+        indices[y, x + 4] = DBZ_INDEX[ring_dbz]
+    if centre_dbz is not None:
+        indices[y, x] = DBZ_INDEX[centre_dbz]
+    timestamp = datetime(2024, 1, 1, 12, tzinfo=timezone.utc) + timedelta(
+        minutes=minute
+    )
+    return RadarFrame(name or f"f{minute}.png", timestamp, indices, PALETTE)
+
+
+def test_rain_rate_follows_marshall_palmer():
+    """Test dBZ convert to mm/h and missing echoes to no rain."""
+    rates = rain_rate([23.0, 40.0, np.nan])
+
+    assert rates[0] == pytest.approx(1.0, rel=0.05)
+    assert rates[1] == pytest.approx(11.5, rel=0.05)
+    assert rates[2] == 0.0
+
+
+def test_palette_dbz_maps_legend_colours():
+    """Test legend colours map to their class and other colours to NaN."""
+    dbz = palette_dbz(PALETTE)
+
+    assert math.isnan(dbz[0])
+    assert dbz[DBZ_INDEX[35]] == 35
+    assert np.isnan(dbz[len(REFLECTIVITY_SCALE) + 1 :]).all()
+    # A slightly off shade still counts
+    assert palette_dbz(bytes((250, 5, 5)))[0] == 45
+    # Boxes sharing a colour give the lower bound
+    assert dbz[DBZ_INDEX[15]] == 10
+
+
+def test_palette_dbz_reads_real_legend():
+    """Test every legend box of a real frame is an echo rising along the legend."""
+    with Image.open(RADAR_GIF) as image:
+        indices = np.array(image)
+        palette = bytes(image.getpalette())
+
+    lookup = palette_dbz(palette, image.info.get("transparency"))
+    dbz = lookup[indices[LEGEND_ROW, list(LEGEND_CENTRES)]]
+
+    assert len(dbz) == len(REFLECTIVITY_SCALE) == 16
+    assert not np.isnan(dbz).any()
+    assert (np.diff(dbz) >= 0).all()
+    assert dbz[0] == -10 and dbz[-1] == 60
+    # Boxes of distinct colours are told apart
+    assert len(set(dbz)) == len({rgb for _, rgb in REFLECTIVITY_SCALE})
+    # The map around the legend is not rain
+    assert np.isnan(lookup[indices[LEGEND_ROW, 690:705]]).all()
+
+
+def test_palette_dbz_honours_transparency():
+    """Test transparent palette entries are never echoes."""
+    assert math.isnan(palette_dbz(PALETTE, DBZ_INDEX[20])[DBZ_INDEX[20]])
+    alpha = bytes([255] * DBZ_INDEX[20] + [0])
+    masked = palette_dbz(PALETTE, alpha)
+    assert math.isnan(masked[DBZ_INDEX[20]])
+    assert masked[DBZ_INDEX[25]] == 25
+
+
+def test_sample_precipitation_reads_location_disk_and_trend():
+    """Test current, maximum and trend come from all frames at once."""
+    frames = [
+        _frame(10, centre_dbz=30, ring_dbz=45),
+        _frame(0, ring_dbz=20),
+        _frame(5, centre_dbz=25, ring_dbz=35),
+    ]
+
+    result = sample_precipitation(frames, *BUDAPEST, radius_km=10)
+
+    assert result.frames == 3
+    assert result.time.minute == 10
+    assert result.dbz == 30
+    assert result.rain_rate == pytest.approx(float(rain_rate(30)), abs=0.01)
+    assert result.max_dbz == 45
+    assert result.max_rain_rate == pytest.approx(float(rain_rate(45)), abs=0.01)
+    assert result.trend > 0
+
+
+def test_sample_precipitation_radius_limits_maximum():
+    """Test echoes outside the radius are ignored."""
+    result = sample_precipitation([_frame(0, ring_dbz=50)], *BUDAPEST, radius_km=1)
+
+    assert result.rain_rate == 0.0
+    assert result.dbz is None
+    assert result.max_dbz is None
+    assert result.trend is None
+
+
+def test_sample_precipitation_without_usable_frames():
+    """Test no frames, untimestamped frames or an outside location give None."""
+    untimed = RadarFrame("legend.png", None, np.zeros((4, 4), np.uint8), PALETTE)
+
+    assert sample_precipitation([], *BUDAPEST, 10) is None
+    assert sample_precipitation([untimed], *BUDAPEST, 10) is None
+    assert sample_precipitation([_frame(0)], 60.0, 19.0, 10) is None
+
+
+def test_sample_precipitation_ignores_frames_of_other_sizes():
+    """Test only frames with the newest frame's size are sampled."""
+    small = RadarFrame(
+        "small.png",
+        datetime(2024, 1, 1, 11, tzinfo=timezone.utc),
+        np.zeros((10, 10), np.uint8),
+        PALETTE,
+    )
+
+    assert sample_precipitation([small, _frame(0)], *BUDAPEST, 10).frames == 1
@@ -0,0 +1,94 @@
+"""Tests for radar_region.py"""
+
+from PIL import Image
+
+from custom_components.hungaromet import radar_region
+from custom_components.hungaromet.radar_region import (
+    RadarRegion,
+    apply_region,
+    apply_variant,
+)
+
+
+def test_crop_box_centres_on_location():
+    """Test the crop box surrounds the location within the composite."""
+    region = RadarRegion(47.5, 19.04, 100)
+
+    left, top, right, bottom = region.crop_box((1024, 768))
+
+    # Budapest sits at roughly (479, 336) on the 1024x768 composite
+    assert left < 479 < right
+    assert top < 336 < bottom
+    # 200 km is about 2.65 degrees of longitude and 1.8 degrees of latitude
+    assert 200 < right - left < 220
+    assert 205 < bottom - top < 225
+
+
+def test_crop_box_is_computed_once_per_config(monkeypatch):
+    """Test the crop box is cached for repeated builds of the same config."""
+    radar_region._crop_box.cache_clear()
+    region = RadarRegion(46.0, 18.0, 50)
+
+    first = region.crop_box((1024, 768))
+    second = RadarRegion(46.0, 18.0, 50).crop_box([1024, 768])
+
+    assert first == second
+    assert radar_region._crop_box.cache_info().hits == 1
+
+
+def test_crop_box_is_clamped_and_rejects_distant_locations():
+    """Test crop boxes stay inside the composite or fall back to full frames."""
+    assert RadarRegion(50.2, 13.1, 100).crop_box((1024, 768))[:2] == (0, 0)
+    assert RadarRegion(60.0, 30.0, 10).crop_box((1024, 768)) is None
+
+
+def test_apply_region_crops_and_downscales():
+    """Test frames are cropped to the region and reduced by the factor."""
+    frames = [Image.new("P", (1024, 768)), Image.new("P", (1024, 768))]
+
+    cropped = apply_region(frames, RadarRegion(47.5, 19.04, 100))
+    reduced = apply_region(frames, RadarRegion(47.5, 19.04, 100, downscale=2))
+
+    assert cropped[0].size == cropped[1].size
+    assert cropped[0].size[0] < 1024
+    width, height = cropped[0].size
+    assert reduced[0].size == ((width + 1) // 2, (height + 1) // 2)
+
+
+def test_apply_region_keeps_frames_without_usable_region():
+    """Test frames are returned unchanged without a usable region."""
+    frames = [Image.new("RGB", (16, 16))]
+
+    assert apply_region(frames, None) is frames
+    assert apply_region([], RadarRegion(47.5, 19.04, 100)) == []
+    assert apply_region(frames, RadarRegion(60.0, 30.0, 10)) is frames
+
+
+def test_apply_variant_reduces_frames():
+    """Test half size halves frames and thumbnails fit the thumbnail width."""
+    frames = [Image.new("P", (1024, 768)), Image.new("P", (1024, 768))]
+
+    assert [frame.size for frame in apply_variant(frames, "half")] == [(512, 384)] * 2
+    (thumbnail, _) = apply_variant(frames, "thumbnail")
+    assert thumbnail.size[0] <= radar_region.THUMBNAIL_WIDTH
+    assert thumbnail.mode == "RGB"
+    small = [Image.new("RGB", (200, 150))]
+    assert apply_variant(small, "thumbnail") is small
+    assert apply_variant([], "half") == []
+
+
+def test_disk_pixels_cover_radius_around_location():
+    """Test the disk holds the location pixel and pixels within the radius."""
+    ys, xs, centre = radar_region.disk_pixels((1024, 768), 47.5, 19.04, 10)
+
+    x, y = radar_region.location_pixel((1024, 768), 47.5, 19.04)
+    assert (xs[centre], ys[centre]) == (int(x), int(y))
+    # Pixels are just under 1 km across, so a 10 km disk holds ~350 of them
+    assert 300 < len(ys) < 420
+    assert xs.max() - xs.min() <= 22
+    assert len(radar_region.disk_pixels((1024, 768), 47.5, 19.04, 0)[0]) == 1
+
+
+def test_disk_pixels_outside_composite():
+    """Test a location off the composite has no disk."""
+    assert radar_region.disk_pixels((1024, 768), 60.0, 19.0, 5) is None
@@ -0,0 +1,107 @@
+"""Tests for radar_view.py"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from custom_components.hungaromet.radar_view import (
+    HungarometRadarView,
+    async_register_radar_view,
+)
+
+
+def _hass(*images):
+    return SimpleNamespace(data={"hungaromet": {"radar_images": list(images)}})
+
+
+def _image(etag="0123abcd"):
+    return SimpleNamespace(
+        file_name="radar_animation.gif",
+        etag=etag,
+        content_type="image/gif",
+        image=lambda: b"GIF89a",
+    )
+
+
+@pytest.mark.asyncio
+async def test_view_serves_animation_with_etag():
+    """Test the animation is served with its hash and revalidated by it."""
+    camera = SimpleNamespace()
+    view = HungarometRadarView(_hass(camera, _image()))
+
+    response = await view.get(
+        make_mocked_request("GET", "/api/hungaromet/radar_animation.gif"),
+        "radar_animation.gif",
+    )
+
+    assert response.status == 200
+    assert response.body == b"GIF89a"
+    assert response.content_type == "image/gif"
+    assert response.headers["ETag"] == '"0123abcd"'
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    for if_none_match in ('"0123abcd"', 'W/"0123abcd"', '"old", "0123abcd"', "*"):
+        response = await view.get(
+            make_mocked_request(
+                "GET",
+                "/api/hungaromet/radar_animation.gif",
+                headers={"If-None-Match": if_none_match},
+            ),
+            "radar_animation.gif",
+        )
+        assert response.status == 304
+        assert response.body is None
+
+    response = await view.get(
+        make_mocked_request(
+            "GET",
+            "/api/hungaromet/radar_animation.gif",
+            headers={"If-None-Match": '"old"'},
+        ),
+        "radar_animation.gif",
+    )
+    assert response.status == 200
+
+
+@pytest.mark.asyncio
+async def test_view_versioned_url_is_immutable():
+    """Test a URL carrying the current hash may be cached indefinitely."""
+    view = HungarometRadarView(_hass(_image()))
+
+    current = await view.get(
+        make_mocked_request("GET", "/api/hungaromet/radar_animation.gif?v=0123abcd"),
+        "radar_animation.gif",
+    )
+    stale = await view.get(
+        make_mocked_request("GET", "/api/hungaromet/radar_animation.gif?v=old"),
+        "radar_animation.gif",
+    )
+
+    assert "immutable" in current.headers["Cache-Control"]
+    assert stale.headers["Cache-Control"] == "no-cache"
+
+
+@pytest.mark.asyncio
+async def test_view_unknown_or_empty_image_is_not_found():
+    """Test other names and images without an animation yet give 404."""
+    view = HungarometRadarView(_hass(_image(etag=None)))
+    request = make_mocked_request("GET", "/api/hungaromet/radar_animation.gif")
+
+    with pytest.raises(web.HTTPNotFound):
+        await view.get(request, "radar_animation.gif")
+    with pytest.raises(web.HTTPNotFound):
+        await HungarometRadarView(SimpleNamespace(data={})).get(request, "other.gif")
+
+
+def test_register_radar_view_once():
+    """Test the view is registered only once per instance."""
+    hass = SimpleNamespace(data={}, http=MagicMock())
+
+    async_register_radar_view(hass)
+    async_register_radar_view(hass)
+
+    hass.http.register_view.assert_called_once()
+    assert isinstance(hass.http.register_view.call_args[0][0], HungarometRadarView)
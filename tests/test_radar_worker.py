@@ -0,0 +1,188 @@
+"""Tests for radar_worker.py"""
+
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image, ImageSequence
+
+from custom_components.hungaromet import radar_worker
+from custom_components.hungaromet.radar_frames import RadarFrameStore, decode_frame
+from custom_components.hungaromet.radar_gif_creator import (
+    RadarDownload,
+    RadarGifUpdater,
+)
+from custom_components.hungaromet.radar_overlay import RadarOverlay
+from custom_components.hungaromet.radar_region import RadarRegion
+from custom_components.hungaromet.radar_worker import (
+    RadarEncodeWorker,
+    build_animations,
+    encode_frames,
+    encode_variants,
+)
+
+
+def _pngs(count=2, size=(64, 48)):
+    pngs = {}
+    for step in range(count):
+        frame = Image.new("RGB", size, color=(20, 40, 60))
+        frame.paste((200, 30, 30), (4 + 8 * step, 10, size[0] // 2, size[1] // 2))
+        frame.paste((30, 200, 30), (size[0] // 2, size[1] // 3, size[0], size[1]))
+        buffer = BytesIO()
+        frame.save(buffer, format="PNG")
+        pngs[f"img{step}.png"] = buffer.getvalue()
+    return pngs
+
+
+def _png_frames(count=2, size=(64, 48)):
+    return [decode_frame(name, png) for name, png in _pngs(count, size).items()]
+
+
+def test_encode_frames_decodes_crops_and_encodes():
+    """Test frames are cropped to the region and encoded."""
+    data = encode_frames(
+        _png_frames(size=(1024, 768)), "gif", RadarRegion(47.5, 19.04, 100)
+    )
+
+    with Image.open(BytesIO(data)) as gif:
+        assert gif.format == "GIF"
+        assert gif.n_frames == 2
+        assert gif.size[0] < 300
+
+
+def test_encode_frames_draws_overlay():
+    """Test the overlay is drawn over the cropped frames before encoding."""
+    frames = _png_frames(size=(1024, 768))
+    region = RadarRegion(47.5, 19.04, 100)
+    overlay = RadarOverlay(47.5, 19.04, towns=False)
+
+    plain = encode_frames(frames, "apng", region)
+    marked = encode_frames(frames, "apng", region, overlay=overlay)
+
+    with Image.open(BytesIO(plain)) as before, Image.open(BytesIO(marked)) as after:
+        assert before.size == after.size
+        centre = (after.size[0] // 2 - 5, after.size[1] // 2)
+        assert before.convert("RGB").getpixel(centre) != after.convert(
+            "RGB"
+        ).getpixel(centre)
+
+
+def test_encode_variants_reduces_the_same_frames():
+    """Test each variant is encoded from the cropped full-size frames."""
+    frames = _png_frames(size=(1024, 768))
+
+    full, half, thumbnail = encode_variants(
+        frames, "apng", variants=("half", "thumbnail")
+    )
+
+    assert full == encode_frames(frames, "apng")
+    with Image.open(BytesIO(half)) as image:
+        assert image.size == (512, 384)
+    with Image.open(BytesIO(thumbnail)) as image:
+        assert image.size == (205, 154)
+
+
+def test_build_animations_decodes_each_frame_once(monkeypatch):
+    """Test PNG bytes are decoded once per process and built into animations."""
+    monkeypatch.setattr(radar_worker, "_FRAMES", RadarFrameStore())
+    pngs = list(_pngs().items())
+    frames = _png_frames()
+
+    with patch(
+        "custom_components.hungaromet.radar_worker.decode_frame",
+        side_effect=decode_frame,
+    ) as mock_decode:
+        first = build_animations(pngs, "apng", variants=("half",))
+        again = build_animations([(name, None) for name, _ in pngs], "apng")
+
+    assert mock_decode.call_count == 2
+    assert first == encode_variants(frames, "apng", variants=("half",))
+    assert again == [first[0]]
+
+
+@patch("custom_components.hungaromet.radar_worker.forecast_frames")
+def test_build_animations_appends_nowcast_frames(mock_forecast):
+    """Test the nowcast runs where the frames are decoded."""
+    frames = _png_frames()
+    mock_forecast.return_value = frames[:1]
+
+    data = build_animations(list(_pngs().items()), "apng", nowcast=True)[0]
+
+    assert [frame.name for frame in mock_forecast.call_args[0][0]] == [
+        "img0.png",
+        "img1.png",
+    ]
+    with Image.open(BytesIO(data)) as animation:
+        assert animation.n_frames == 3
+
+
+def test_worker_builds_in_subprocess():
+    """Test the worker process returns the same animations as in-process."""
+    pngs = list(_pngs().items())
+    worker = RadarEncodeWorker()
+    try:
+        animations = worker.build_animations(
+            iter(pngs), "apng", variants=("half",)
+        )
+    finally:
+        worker.shutdown()
+
+    assert animations == encode_variants(
+        _png_frames(), "apng", variants=("half",)
+    )
+    assert worker._executor is None
+    worker.shutdown()
+
+
+def test_worker_recovers_from_broken_pool():
+    """Test a dead worker process is reported and replaced on the next build."""
+    future = Mock()
+    future.result.side_effect = BrokenProcessPool("killed")
+    executor = Mock()
+    executor.submit.return_value = future
+    worker = RadarEncodeWorker()
+    worker._executor = executor
+
+    assert worker.build_animations(_pngs().items()) is None
+
+    executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    assert worker._executor is None
+
+
+@pytest.mark.asyncio
+@patch("custom_components.hungaromet.radar_gif_creator.get_latest_image_urls")
+@patch("custom_components.hungaromet.radar_gif_creator.download_missing")
+async def test_event_loop_stays_responsive_during_build(
+    mock_download, mock_get_urls, tmp_path
+):
+    """Test a subprocess build leaves the event loop free to run other work."""
+    mock_get_urls.return_value = [f"http://example.com/img{i}.png" for i in range(6)]
+    mock_download.return_value = RadarDownload(
+        mock_get_urls.return_value,
+        downloaded={
+            f"http://example.com/{name}": png
+            for name, png in _pngs(count=6, size=(1024, 768)).items()
+        },
+    )
+    updater = RadarGifUpdater(worker=RadarEncodeWorker())
+    updater.output_path = str(tmp_path / "radar_animation.gif")
+    loop = asyncio.get_running_loop()
+    # Start the worker process outside of the measured build
+    await loop.run_in_executor(None, updater.worker._get_executor)
+
+    delays = []
+    build = loop.run_in_executor(None, updater.update)
+    while not build.done():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        delays.append(time.perf_counter() - started - 0.005)
+    updater.close()
+
+    assert await build == "updated"
+    with Image.open(tmp_path / "radar_animation.gif") as gif:
+        assert len(list(ImageSequence.Iterator(gif))) == 6
+    assert len(delays) > 1
+    assert max(delays) < 0.1
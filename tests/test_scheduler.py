@@ -0,0 +1,330 @@
+"""Tests for scheduler.py"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.hungaromet import scheduler as scheduler_module
+from custom_components.hungaromet.scheduler import (
+    COST_IO,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    HungarometScheduler,
+    async_run_cpu_job,
+    get_scheduler,
+)
+
+NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(name="timers")
+def fixture_timers(monkeypatch):
+    """Record the timers the scheduler arms and pin the clock to NOW."""
+    timers = []
+
+    def fake_track(hass, action, point):
+        timers.append((point, MagicMock()))
+        return timers[-1][1]
+
+    monkeypatch.setattr(scheduler_module, "async_track_point_in_utc_time", fake_track)
+    monkeypatch.setattr(scheduler_module.dt_util, "utcnow", lambda: NOW)
+    return timers
+
+
+def _scheduler():
+    loop = asyncio.get_running_loop()
+    return HungarometScheduler(
+        SimpleNamespace(data={}, loop=loop, async_create_task=loop.create_task)
+    )
+
+
+def _blocking_job(log, name):
+    release = asyncio.Event()
+
+    async def action():
+        log.append(f"{name} start")
+        await release.wait()
+        log.append(f"{name} end")
+
+    return action, release
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_jobs_share_one_timer(timers):
+    """Test every cadence is queued behind a single timer at the earliest run."""
+    scheduler = _scheduler()
+
+    remove_hourly = scheduler.async_schedule(
+        "hourly", MagicMock(), minute=20, second=59
+    )
+    scheduler.async_schedule(
+        "radar", MagicMock(), priority=PRIORITY_HIGH, minute=[1, 6], second=30
+    )
+
+    assert [point for point, _ in timers] == [
+        NOW.replace(minute=20, second=59),
+        NOW.replace(minute=1, second=30),
+    ]
+    timers[0][1].assert_called_once()
+    queue = scheduler.stats()["queue"]
+    assert [entry["job"] for entry in queue] == ["radar", "hourly"]
+    assert queue[0] == {
+        "job": "radar",
+        "due": "2024-01-01T12:01:30+00:00",
+        "cost": "cpu",
+        "priority": 0,
+    }
+
+    # Adding a later job keeps the armed timer
+    scheduler.async_schedule("daily", MagicMock(), hour=9, minute=40)
+    remove_hourly()
+    assert len(timers) == 2
+    assert list(scheduler.stats()["jobs"]) == ["daily", "radar"]
+    assert scheduler.stats()["queue"][-1]["due"] == "2024-01-02T09:40:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_cpu_jobs_are_staggered_by_priority(timers):
+    """Test CPU jobs due together run one at a time, I/O jobs right away."""
+    scheduler = _scheduler()
+    log = []
+    dataset, release_dataset = _blocking_job(log, "dataset")
+    radar, release_radar = _blocking_job(log, "radar")
+    feed, release_feed = _blocking_job(log, "feed")
+    scheduler.async_schedule("dataset", dataset, minute=20, second=59)
+    scheduler.async_schedule(
+        "radar", radar, priority=PRIORITY_HIGH, minute=20, second=59
+    )
+    scheduler.async_schedule(
+        "feed", feed, cost=COST_IO, priority=PRIORITY_LOW, minute=20, second=59
+    )
+
+    due = NOW.replace(minute=20, second=59)
+    scheduler.async_run_due(due)
+    await _settle()
+
+    assert log == ["radar start", "feed start"]
+    stats = scheduler.stats()
+    assert stats["running"] == ["feed", "radar"]
+    assert stats["waiting"] == ["dataset"]
+    assert stats["peak_waiting"] == 1
+    assert stats["queue"][0]["due"] == "2024-01-01T13:20:59+00:00"
+
+    # Due again while still queued or running: no second run is queued
+    scheduler.async_run_due(due + timedelta(hours=1))
+    assert scheduler.stats()["jobs"]["dataset"]["coalesced"] == 1
+    assert scheduler.stats()["jobs"]["radar"]["coalesced"] == 1
+
+    release_feed.set()
+    release_radar.set()
+    await _settle()
+    assert log[2:] == ["feed end", "radar end", "dataset start"]
+    release_dataset.set()
+    await _settle()
+
+    stats = scheduler.stats()
+    assert stats["running"] == [] and stats["waiting"] == []
+    assert stats["jobs"]["dataset"]["runs"] == 1
+    assert stats["jobs"]["dataset"]["max_wait_ms"] >= 0
+    assert stats["jobs"]["radar"]["last_duration_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_once_jobs_run_once_and_can_be_cancelled(timers, caplog):
+    """Test one-off jobs run once, failures are logged and cancels are kept."""
+    scheduler = _scheduler()
+    log = []
+    blocker, release = _blocking_job(log, "blocker")
+
+    async def failing():
+        log.append("failing")
+        raise RuntimeError("boom")
+
+    async def retry():
+        log.append("retry")
+
+    scheduler.async_schedule_once("blocker", 10, blocker)
+    scheduler.async_schedule_once("failing", 10, failing)
+    cancel_retry = scheduler.async_schedule_once("retry", 10, retry)
+    cancel_late = scheduler.async_schedule_once("late", 60, retry)
+    assert timers[-1][0] == NOW + timedelta(seconds=10)
+
+    scheduler.async_run_due(NOW + timedelta(seconds=10))
+    await _settle()
+    assert scheduler.stats()["waiting"] == ["failing", "retry"]
+    # Cancelled while waiting for the CPU lane, or before it was due
+    cancel_retry()
+    cancel_late()
+    assert scheduler.stats()["queue"] == []
+    timers[-1][1].assert_called_once()
+
+    release.set()
+    await _settle()
+
+    assert log == ["blocker start", "blocker end", "failing"]
+    assert "HungaroMet job failing failed" in caplog.text
+    assert scheduler.stats()["jobs"] == {}
+
+
+@pytest.mark.asyncio
+async def test_rescheduling_a_name_replaces_the_job(timers):
+    """Test a job added under a taken name replaces the earlier one."""
+    scheduler = _scheduler()
+    first, second = AsyncMock(), AsyncMock()
+    remove_first = scheduler.async_schedule_once("retry", 60, first)
+    scheduler.async_schedule_once("retry", 30, second)
+
+    remove_first()
+
+    assert [entry["due"] for entry in scheduler.stats()["queue"]] == [
+        "2024-01-01T12:00:30+00:00"
+    ]
+    assert list(scheduler.stats()["jobs"]) == ["retry"]
+    scheduler.async_run_due(NOW + timedelta(seconds=60))
+    await _settle()
+    first.assert_not_awaited()
+    second.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_timer_runs_due_jobs(timers):
+    """Test the timer callback starts the due jobs and re-arms itself."""
+    scheduler = _scheduler()
+    runs = []
+
+    async def action():
+        runs.append(True)
+
+    scheduler.async_schedule(
+        "ten_minutes", action, minute=range(0, 60, 10), second=59
+    )
+    due = timers[-1][0]
+
+    scheduler._handle_timer(due)
+    await _settle()
+
+    assert runs == [True]
+    assert timers[-1][0] == due + timedelta(minutes=10)
+
+
+@pytest.mark.asyncio
+async def test_run_now_shares_the_lane_and_coalesces(timers, caplog):
+    """Test requested runs queue behind the CPU lane and join pending runs."""
+    scheduler = _scheduler()
+    log = []
+    blocker, release = _blocking_job(log, "blocker")
+    scheduler.async_schedule_once("blocker", 10, blocker)
+    scheduler.async_schedule(
+        "feed", AsyncMock(return_value="scheduled"), cost=COST_IO, minute=20
+    )
+    scheduler.async_run_due(NOW + timedelta(seconds=10))
+    await _settle()
+
+    async def radar():
+        log.append("radar")
+        return "built"
+
+    first = asyncio.ensure_future(scheduler.async_run_now("radar", radar))
+    second = asyncio.ensure_future(scheduler.async_run_now("radar", radar))
+    await _settle()
+    # Waits for the lane, and a second request joins the first
+    assert scheduler.stats()["waiting"] == ["radar"]
+    assert log == ["blocker start"]
+
+    # An I/O job runs at once with the action registered under its name
+    assert await scheduler.async_run_now("feed") == "scheduled"
+    assert scheduler.stats()["jobs"]["feed"]["runs"] == 1
+
+    release.set()
+    assert (await first, await second) == ("built", "built")
+    assert log == ["blocker start", "blocker end", "radar"]
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await scheduler.async_run_now("failing", failing)
+    assert "HungaroMet job failing failed" in caplog.text
+
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        await scheduler.async_run_now("cancelled", cancelled)
+    assert scheduler.stats()["running"] == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiting_job_releases_its_callers(timers):
+    """Test a run cancelled while waiting for the lane resolves its waiters."""
+    scheduler = _scheduler()
+    log = []
+    blocker, release = _blocking_job(log, "blocker")
+    scheduler.async_schedule_once("blocker", 10, blocker)
+    remove = scheduler.async_schedule_once("retry", 10, AsyncMock())
+    scheduler.async_run_due(NOW + timedelta(seconds=10))
+    waiter = asyncio.ensure_future(scheduler.async_run_now("retry"))
+    await _settle()
+
+    remove()
+    release.set()
+
+    assert await waiter is None
+    assert scheduler.stats()["waiting"] == []
+
+
+@pytest.mark.asyncio
+async def test_cpu_steps_wait_for_the_lane(timers):
+    """Test CPU steps of I/O jobs queue for the lane and nest in CPU jobs."""
+    scheduler = _scheduler()
+    log = []
+    blocker, release = _blocking_job(log, "blocker")
+    scheduler.async_schedule_once("blocker", 10, blocker)
+    scheduler.async_run_due(NOW + timedelta(seconds=10))
+    await _settle()
+
+    def encode(name):
+        log.append(name)
+        return name
+
+    async def download():
+        log.append("download")
+        return await async_run_cpu_job(scheduler.hass, "encode", encode, "frame")
+
+    scheduler.hass.data["hungaromet"] = {"scheduler": scheduler}
+    scheduler.hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda func, *args: func(*args)
+    )
+    io_job = asyncio.ensure_future(scheduler.async_run("download", download, COST_IO))
+    await _settle()
+    # The download runs beside the CPU job; only its encode step waits
+    assert log == ["blocker start", "download"]
+    assert scheduler.stats()["waiting"] == ["encode"]
+
+    release.set()
+    assert await io_job == "frame"
+    assert log == ["blocker start", "download", "blocker end", "frame"]
+
+    async def nested():
+        # Already holds the lane, so it does not queue behind itself
+        return await scheduler.async_run("inner", AsyncMock(return_value="inner"))
+
+    assert await scheduler.async_run("outer", nested) == "inner"
+
+
+def test_get_scheduler_is_shared():
+    """Test the scheduler is created once per hass."""
+    hass = SimpleNamespace(data={})
+
+    scheduler = get_scheduler(hass)
+
+    assert get_scheduler(hass) is scheduler
+    assert hass.data["hungaromet"]["scheduler"] is scheduler
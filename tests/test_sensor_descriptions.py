@@ -0,0 +1,79 @@
+"""Tests for sensor_descriptions.py"""
+
+from datetime import datetime, timezone
+
+from custom_components.hungaromet.sensor_descriptions import (
+    DATASET_DEVICES,
+    KEY_CLASSES,
+    SENSOR_DESCRIPTIONS,
+    UNITS_BY_KEY,
+    describe_key,
+    period_start,
+)
+
+
+def test_every_dataset_has_device_and_unique_names():
+    for dataset, descriptions in SENSOR_DESCRIPTIONS.items():
+        assert dataset in DATASET_DEVICES
+        names = [description.name for description in descriptions]
+        assert len(names) == len(set(names))
+        assert all(description.dataset == dataset for description in descriptions)
+
+
+def test_units_by_key_lookup():
+    assert UNITS_BY_KEY["average_t"] == "°C"
+    assert UNITS_BY_KEY["average_rau"] == "mm"
+    assert UNITS_BY_KEY["average_fxd"] == "°"
+    assert "time" not in UNITS_BY_KEY
+
+
+def test_describe_key_uses_unit_table():
+    description = describe_key("hourly", "average_u")
+
+    assert description.name == "average_u"
+    assert description.native_unit_of_measurement == "%"
+    assert description.dataset == "hourly"
+    assert describe_key("daily", "time").native_unit_of_measurement is None
+
+
+def test_state_classes_distinguish_totals_from_measurements():
+    by_key = {
+        (description.dataset, description.key): description
+        for descriptions in SENSOR_DESCRIPTIONS.values()
+        for description in descriptions
+    }
+
+    assert by_key[("hourly", "r")].state_class == "total"
+    assert by_key[("hourly", "r")].device_class == "precipitation"
+    assert by_key[("daily", "average_rau")].state_class == "total"
+    assert by_key[("hourly", "t")].state_class == "measurement"
+    assert by_key[("hourly", "t")].device_class == "temperature"
+    assert by_key[("ten_minutes", "tviz")].native_unit_of_measurement == "°C"
+    assert by_key[("hourly", "we")].state_class is None
+    # Wind bearings get no long-term statistics
+    assert by_key[("hourly", "fd")].state_class is None
+    assert by_key[("ten_minutes", "fxd")].state_class is None
+
+
+def test_every_measured_column_has_semantics():
+    measured = {"t", "ta", "tn", "tx", "u", "sg", "sr", "suv", "fs", "fsd", "fx"}
+    measured |= {"fxd", "f", "fd", "r", "rau", "upe", "tsn", "tsn24", "tviz"}
+    measured |= {f"et{depth}" for depth in (5, 10, 20, 50, 100)}
+    measured |= {"water_balance", "sr_mj"}
+
+    assert measured <= set(KEY_CLASSES)
+
+
+def test_period_start_per_dataset():
+    assert period_start("daily", "2024-01-02") == datetime(
+        2024, 1, 2, tzinfo=timezone.utc
+    )
+    assert period_start("hourly", "2024-01-02T10:00:00+00:00") == datetime(
+        2024, 1, 2, 9, tzinfo=timezone.utc
+    )
+    assert period_start("ten_minutes", "2024-01-02T10:00:00+00:00") == datetime(
+        2024, 1, 2, 9, 50, tzinfo=timezone.utc
+    )
+    assert period_start("daily", None) is None
+    assert period_start("daily", "bad") is None
+    assert period_start("hourly", "bad") is None
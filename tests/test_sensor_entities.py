@@ -1,17 +1,49 @@
 import builtins
-from datetime import datetime
+import os
+from datetime import date, datetime, timezone
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, call
 
+import numpy as np
 import pytest
 
-from custom_components.hungaromet.daily_sensor import HungarometWeatherDailySensor
-from custom_components.hungaromet.hourly_sensor import HungarometWeatherHourlySensor
-from custom_components.hungaromet.radar_gif_image import HungarometRadarImage
-from custom_components.hungaromet.station_info_sensor import HungarometStationInfoSensor
-from custom_components.hungaromet.ten_minutes_sensor import (
-    HungarometWeatherTenMinutesSensor,
+from custom_components.hungaromet.radar_camera import HungarometRadarCamera
+from custom_components.hungaromet.radar_frames import RadarFrame, get_frame_store
+from custom_components.hungaromet.radar_gif_creator import content_etag
+from custom_components.hungaromet.radar_gif_image import (
+    HungarometRadarImage,
+    HungarometRadarVariantImage,
+)
+from custom_components.hungaromet.radar_precipitation_sensor import (
+    HungarometRadarPrecipitationSensor,
 )
+from custom_components.hungaromet.sensor_descriptions import (
+    DAILY_SENSORS,
+    describe,
+)
+from custom_components.hungaromet.station_info_sensor import HungarometStationInfoSensor
+from custom_components.hungaromet.weather_sensor import HungarometWeatherSensor
+
+
+def _make_sensor(
+    dataset, hass, name, value, unit, key, coordinator=None, location=None
+):
+    description = describe(dataset, key, name, unit)
+    return HungarometWeatherSensor(
+        hass, description, {key: value}, location, coordinator
+    )
+
+
+def _daily(*args, **kwargs):
+    return _make_sensor("daily", *args, **kwargs)
+
+
+def _hourly(*args, **kwargs):
+    return _make_sensor("hourly", *args, **kwargs)
+
+
+def _ten_minutes(*args, **kwargs):
+    return _make_sensor("ten_minutes", *args, **kwargs)
 
 
 class DummyCoordinator:
@@ -19,6 +51,12 @@ class DummyCoordinator:
         self.data = payload
 
 
+class DummyLocation:
+    def __init__(self, result, unique_id_prefix=""):
+        self.unique_id_prefix = unique_id_prefix
+        self.async_get_data = AsyncMock(return_value=result)
+
+
 class DummyBus:
     def __init__(self):
         self.calls = []
@@ -27,11 +65,54 @@ class DummyBus:
         self.calls.append((event, callback))
 
 
+class FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+        self.removed = []
+        self.once = []
+        self.runs = []
+
+    def async_schedule(self, name, action, **kwargs):
+        self.jobs[name] = (action, kwargs)
+        return lambda: self.removed.append(name)
+
+    def async_schedule_once(self, name, delay, action, **kwargs):
+        self.once.append((name, delay, action))
+        return MagicMock()
+
+    async def async_run(self, name, action, cost, priority):
+        self.runs.append((name, cost, priority))
+        return await action()
+
+
+def _radar_executor(status):
+    """Executor mock finishing every radar fetch and build with ``.status``."""
+
+    def run(func, *args):
+        if func.__name__ == "fetch":
+            return job.status, None
+        return job.status
+
+    job = AsyncMock(side_effect=run)
+    job.status = status
+    return job
+
+
+def _use_scheduler(monkeypatch, module):
+    scheduler = FakeScheduler()
+    for name in (module, "scheduler"):
+        monkeypatch.setattr(
+            f"custom_components.hungaromet.{name}.get_scheduler",
+            lambda hass: scheduler,
+        )
+    return scheduler
+
+
 @pytest.mark.asyncio
 async def test_ten_minutes_sensor_prefers_coordinator_data():
     hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
     coordinator = DummyCoordinator({"data": {"t": 12.34}})
-    sensor = HungarometWeatherTenMinutesSensor(
+    sensor = _ten_minutes(
         hass,
         name="Tízperces hőmérséklet",
         value=None,
@@ -44,49 +125,37 @@ async def test_ten_minutes_sensor_prefers_coordinator_data():
 
     await sensor.async_update_data()
 
-    assert sensor._state == 12.34
+    assert sensor.native_value == 12.34
     hass.async_add_executor_job.assert_not_called()
     sensor.async_write_ha_state.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_hourly_sensor_fetches_when_coordinator_missing():
-    hass = SimpleNamespace(
-        async_add_executor_job=AsyncMock(return_value=({"t": 7.89}, None))
-    )
-    sensor = HungarometWeatherHourlySensor(
-        hass,
+    location = DummyLocation(({"t": 7.89}, None))
+    sensor = _hourly(
+        SimpleNamespace(),
         name="Órás hőmérséklet",
         value=None,
         unit="°C",
         key="t",
+        location=location,
     )
     sensor._added = True
     sensor.async_write_ha_state = MagicMock()
 
     await sensor.async_update_data()
 
-    hass.async_add_executor_job.assert_awaited_once()
-    assert sensor._state == 7.89
+    location.async_get_data.assert_awaited_once_with("hourly")
+    assert sensor.native_value == 7.89
     sensor.async_write_ha_state.assert_called_once()
 
 
 def test_daily_sensor_entity_registry_defaults():
     hass = SimpleNamespace()
-    disabled_key = HungarometWeatherDailySensor(
-        hass,
-        name="Felszínközeli minimum",
-        value=0,
-        unit="°C",
-        key="tsn24",
-    )
-    enabled_key = HungarometWeatherDailySensor(
-        hass,
-        name="Átlaghőmérséklet",
-        value=0,
-        unit="°C",
-        key="t",
-    )
+    by_key = {description.key: description for description in DAILY_SENSORS}
+    disabled_key = HungarometWeatherSensor(hass, by_key["tsn24"], {})
+    enabled_key = HungarometWeatherSensor(hass, by_key["t"], {})
 
     assert disabled_key.entity_registry_enabled_default is False
     assert enabled_key.entity_registry_enabled_default is True
@@ -95,7 +164,7 @@ def test_daily_sensor_entity_registry_defaults():
 @pytest.mark.asyncio
 async def test_daily_sensor_skips_update_when_not_added():
     hass = SimpleNamespace(async_add_executor_job=AsyncMock())
-    sensor = HungarometWeatherDailySensor(
+    sensor = _daily(
         hass,
         name="Napi átlag",
         value=None,
@@ -111,7 +180,7 @@ async def test_daily_sensor_skips_update_when_not_added():
 @pytest.mark.asyncio
 async def test_daily_sensor_uses_coordinator_payload():
     hass = SimpleNamespace(async_add_executor_job=AsyncMock())
-    sensor = HungarometWeatherDailySensor(
+    sensor = _daily(
         hass,
         name="Napi átlag",
         value=None,
@@ -124,14 +193,14 @@ async def test_daily_sensor_uses_coordinator_payload():
 
     await sensor.async_update_data()
 
-    assert sensor._state == 42
+    assert sensor.native_value == 42
     hass.async_add_executor_job.assert_not_called()
     sensor.async_write_ha_state.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_daily_sensor_async_update_delegates_to_update_data():
-    sensor = HungarometWeatherDailySensor(SimpleNamespace(), "Daily", 0, "°C", "t")
+    sensor = _daily(SimpleNamespace(), "Daily", 0, "°C", "t")
     sensor.async_update_data = AsyncMock()
 
     await sensor.async_update()
@@ -140,19 +209,24 @@ async def test_daily_sensor_async_update_delegates_to_update_data():
 
 
 def test_daily_sensor_sync_update_is_noop():
-    sensor = HungarometWeatherDailySensor(SimpleNamespace(), "Daily", 0, "°C", "t")
+    sensor = _daily(SimpleNamespace(), "Daily", 0, "°C", "t")
 
     assert sensor.update() is None
 
 
 @pytest.mark.asyncio
-async def test_radar_image_updates_only_when_added(tmp_path):
+async def test_radar_image_updates_only_when_added(tmp_path, monkeypatch):
+    scheduler = _use_scheduler(monkeypatch, "radar_gif_image")
     gif_dir = tmp_path / "www"
     gif_dir.mkdir()
     gif_file = gif_dir / "radar_animation.gif"
     gif_file.write_bytes(b"gif data")
 
-    hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
+    hass = SimpleNamespace(
+        async_add_executor_job=_radar_executor("updated"),
+        data={},
+        bus=DummyBus(),
+    )
     image = HungarometRadarImage(hass)
     image._gif_path = str(gif_file)
     image.async_write_ha_state = MagicMock()
@@ -163,7 +237,12 @@ async def test_radar_image_updates_only_when_added(tmp_path):
     image._added = True
     await image.async_update_data()
 
-    hass.async_add_executor_job.assert_awaited_once()
+    assert hass.async_add_executor_job.await_args_list == [
+        call(image._updater.fetch, False),
+        call(image._updater.build, None),
+    ]
+    # Only the build waits for the CPU lane, not the download
+    assert scheduler.runs == [(f"{image.unique_id} build", "cpu", 0)]
     assert image._update_counter == 1
     image.async_write_ha_state.assert_called()
 
@@ -171,7 +250,7 @@ async def test_radar_image_updates_only_when_added(tmp_path):
 @pytest.mark.asyncio
 async def test_ten_minutes_sensor_no_update_when_not_added():
     hass = SimpleNamespace(async_add_executor_job=AsyncMock())
-    sensor = HungarometWeatherTenMinutesSensor(
+    sensor = _ten_minutes(
         hass,
         name="Tízperces hőmérséklet",
         value=None,
@@ -186,37 +265,35 @@ async def test_ten_minutes_sensor_no_update_when_not_added():
 
 @pytest.mark.asyncio
 async def test_daily_sensor_uses_average_key_when_direct_missing():
-    hass = SimpleNamespace(
-        async_add_executor_job=AsyncMock(return_value=({"average_t": 18.5}, None))
-    )
-    sensor = HungarometWeatherDailySensor(
-        hass,
+    sensor = _daily(
+        SimpleNamespace(),
         name="Napi átlag",
         value=None,
         unit="°C",
         key="t",
+        location=DummyLocation(({"average_t": 18.5}, None)),
     )
     sensor._added = True
     sensor.async_write_ha_state = MagicMock()
 
     await sensor.async_update_data()
 
-    assert sensor._state == 18.5
+    assert sensor.native_value == 18.5
     sensor.async_write_ha_state.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_station_info_sensor_updates_station_list():
-    hass = SimpleNamespace(
-        async_add_executor_job=AsyncMock(return_value=({}, ["AAA", "BBB"]))
+    location = DummyLocation(({}, ["AAA", "BBB"]))
+    sensor = HungarometStationInfoSensor(
+        SimpleNamespace(), "Stations", [], "platform", location
     )
-    sensor = HungarometStationInfoSensor(hass, "Stations", [], "daily")
     sensor._added = True
     sensor.async_write_ha_state = MagicMock()
 
     await sensor.async_update_data()
 
-    hass.async_add_executor_job.assert_awaited_once()
+    location.async_get_data.assert_awaited_once_with("daily")
     assert sensor.state == 2
     assert sensor.extra_state_attributes["stations"] == ["AAA", "BBB"]
     sensor.async_write_ha_state.assert_called_once()
@@ -224,28 +301,20 @@ async def test_station_info_sensor_updates_station_list():
 
 @pytest.mark.asyncio
 async def test_radar_image_schedules_and_unsubscribes(monkeypatch):
-    captured = {}
+    scheduler = _use_scheduler(monkeypatch, "radar_gif_image")
 
-    def fake_track(hass, callback, **kwargs):
-        captured["kwargs"] = kwargs
-        captured["callback"] = callback
-
-        def _unsub():
-            captured["unsub"] = True
-
-        return _unsub
-
-    monkeypatch.setattr(
-        "custom_components.hungaromet.radar_gif_image.async_track_time_change",
-        fake_track,
+    hass = SimpleNamespace(
+        async_add_executor_job=AsyncMock(return_value=None), data={}, bus=DummyBus()
     )
-
-    hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
     image = HungarometRadarImage(hass)
 
     await image.async_added_to_hass()
     assert image._unsub_update is not None
-    assert captured["kwargs"]["minute"] == [
+    _, kwargs = scheduler.jobs[image.unique_id]
+    assert kwargs["cost"] == "io"
+    assert kwargs["priority"] == 0
+    assert kwargs["second"] == 30
+    assert kwargs["minute"] == [
         1,
         6,
         11,
@@ -260,13 +329,16 @@ async def test_radar_image_schedules_and_unsubscribes(monkeypatch):
         56,
     ]
 
+    assert hass.data["hungaromet"]["radar_images"] == [image]
+
     await image.async_will_remove_from_hass()
-    assert captured.get("unsub") is True
+    assert scheduler.removed == [image.unique_id]
+    assert hass.data["hungaromet"]["radar_images"] == []
 
 
 def test_daily_sensor_state_and_metadata():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherDailySensor(
+    sensor = _daily(
         hass,
         name="Átlaghőmérséklet",
         value=12.3456,
@@ -275,38 +347,31 @@ def test_daily_sensor_state_and_metadata():
     )
 
     assert sensor.name == "Átlaghőmérséklet"
-    assert sensor.state == 12.35
-    sensor._state = None
-    assert sensor.state is None
-    assert sensor.unit_of_measurement == "°C"
+    assert sensor.native_value == 12.3456
+    assert sensor.suggested_display_precision == 2
+    assert sensor.native_unit_of_measurement == "°C"
     assert sensor.device_info["name"] == "HungaroMet"
     assert sensor.unique_id.endswith("átlaghőmérséklet".replace(" ", "_"))
 
 
-def test_hourly_sensor_time_conversion(monkeypatch):
+def test_hourly_sensor_time_conversion():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherHourlySensor(
+    sensor = _hourly(
         hass,
         name="Idő",
-        value="2024-01-01T12:34:56",
-        unit="",
+        value="2024-01-01T12:34:00+00:00",
+        unit=None,
         key="time",
     )
 
-    monkeypatch.setattr(
-        "custom_components.hungaromet.hourly_sensor.dt_util.as_local",
-        lambda dt: dt,
-    )
-
-    assert sensor.state == "2024-01-01 12:34"
-    sensor._state = "invalid"
-    assert sensor.state == "invalid"
+    assert sensor.native_value == datetime(2024, 1, 1, 12, 34, tzinfo=timezone.utc)
+    assert sensor.device_class == "timestamp"
 
 
 @pytest.mark.asyncio
 async def test_hourly_sensor_uses_average_if_needed():
     hass = SimpleNamespace(async_add_executor_job=AsyncMock(return_value=({}, None)))
-    sensor = HungarometWeatherHourlySensor(
+    sensor = _hourly(
         hass,
         name="Órás hőmérséklet",
         value=None,
@@ -319,13 +384,13 @@ async def test_hourly_sensor_uses_average_if_needed():
     sensor.coordinator = DummyCoordinator({"data": {"average_t": 21.5}})
     await sensor.async_update_data()
 
-    assert sensor._state == 21.5
+    assert sensor.native_value == 21.5
     hass.async_add_executor_job.assert_not_called()
 
 
 def test_hourly_sensor_metadata_properties():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherHourlySensor(
+    sensor = _hourly(
         hass,
         name="Órás",
         value=1.234,
@@ -333,28 +398,28 @@ def test_hourly_sensor_metadata_properties():
         key="t",
     )
 
-    assert sensor.unit_of_measurement == "°C"
+    assert sensor.native_unit_of_measurement == "°C"
     assert sensor.device_info["manufacturer"] == "HungaroMet"
-    assert sensor.state == 1.23
+    assert sensor.native_value == 1.234
 
 
 def test_hourly_sensor_returns_none_without_state():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherHourlySensor(hass, "Órás", None, "°C", "tn")
+    sensor = _hourly(hass, "Órás", None, "°C", "tn")
 
-    assert sensor.state is None
+    assert sensor.native_value is None
 
 
-def test_hourly_sensor_time_conversion_failure_returns_raw():
+def test_hourly_sensor_time_conversion_failure_returns_none():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherHourlySensor(hass, "Time", "bad", "", "time")
+    sensor = _hourly(hass, "Time", "bad", None, "time")
 
-    assert sensor.state == "bad"
+    assert sensor.native_value is None
 
 
 def test_hourly_sensor_name_and_unique_id():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherHourlySensor(hass, "Órás", 0, "°C", "t")
+    sensor = _hourly(hass, "Órás", 0, "°C", "t")
 
     assert sensor.name == "Órás"
     assert sensor.unique_id.startswith("hungaromet_weather_hourly_")
@@ -364,7 +429,7 @@ def test_hourly_sensor_name_and_unique_id():
 @pytest.mark.asyncio
 async def test_hourly_sensor_skips_update_when_not_added():
     hass = SimpleNamespace(async_add_executor_job=AsyncMock())
-    sensor = HungarometWeatherHourlySensor(hass, "Órás", None, "°C", "t")
+    sensor = _hourly(hass, "Órás", None, "°C", "t")
 
     await sensor.async_update_data()
 
@@ -373,7 +438,7 @@ async def test_hourly_sensor_skips_update_when_not_added():
 
 @pytest.mark.asyncio
 async def test_hourly_sensor_async_update_delegates_to_update_data():
-    sensor = HungarometWeatherHourlySensor(SimpleNamespace(), "Órás", 0, "°C", "t")
+    sensor = _hourly(SimpleNamespace(), "Órás", 0, "°C", "t")
     sensor.async_update_data = AsyncMock()
 
     await sensor.async_update()
@@ -382,84 +447,78 @@ async def test_hourly_sensor_async_update_delegates_to_update_data():
 
 
 def test_hourly_sensor_sync_update_is_noop():
-    sensor = HungarometWeatherHourlySensor(SimpleNamespace(), "Órás", 0, "°C", "t")
+    sensor = _hourly(SimpleNamespace(), "Órás", 0, "°C", "t")
 
     assert sensor.update() is None
 
 
 @pytest.mark.asyncio
 async def test_ten_minutes_sensor_uses_average_if_needed():
-    hass = SimpleNamespace(
-        async_add_executor_job=AsyncMock(return_value=({"average_t": 11.1}, None))
-    )
-    sensor = HungarometWeatherTenMinutesSensor(
-        hass,
+    sensor = _ten_minutes(
+        SimpleNamespace(),
         name="Tízperces hőmérséklet",
         value=None,
         unit="°C",
         key="t",
+        location=DummyLocation(({"average_t": 11.1}, None)),
     )
     sensor._added = True
     sensor.async_write_ha_state = MagicMock()
 
     await sensor.async_update_data()
 
-    assert sensor._state == 11.1
+    assert sensor.native_value == 11.1
     sensor.async_write_ha_state.assert_called_once()
 
 
-def test_ten_minutes_sensor_time_conversion(monkeypatch):
+def test_ten_minutes_sensor_time_conversion_assumes_utc():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherTenMinutesSensor(
+    sensor = _ten_minutes(
         hass,
         name="Idő",
         value="2024-01-01T06:00:00",
-        unit="",
+        unit=None,
         key="time",
     )
 
-    monkeypatch.setattr(
-        "custom_components.hungaromet.ten_minutes_sensor.dt_util.as_local",
-        lambda dt: dt,
-    )
-
-    assert sensor.state == "2024-01-01 06:00"
+    assert sensor.native_value == datetime(2024, 1, 1, 6, 0, tzinfo=timezone.utc)
 
 
 def test_ten_minutes_sensor_name_and_unique_id():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherTenMinutesSensor(hass, "Ten", 0, "°C", "t")
+    sensor = _ten_minutes(hass, "Ten", 0, "°C", "t")
 
     assert sensor.name == "Ten"
     assert sensor.unique_id.startswith("hungaromet_weather_ten_minutes_")
-    assert sensor.unit_of_measurement == "°C"
+    assert sensor.native_unit_of_measurement == "°C"
     assert sensor.device_info["manufacturer"] == "HungaroMet"
 
 
-def test_ten_minutes_sensor_time_conversion_failure_returns_raw():
+def test_ten_minutes_sensor_time_conversion_failure_returns_none():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherTenMinutesSensor(hass, "Idő", "invalid", "", "time")
+    sensor = _ten_minutes(hass, "Idő", "invalid", None, "time")
 
-    assert sensor.state == "invalid"
+    assert sensor.native_value is None
 
 
 def test_ten_minutes_sensor_state_none_when_missing():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherTenMinutesSensor(hass, "Ten", None, "°C", "f")
+    sensor = _ten_minutes(hass, "Ten", None, "°C", "f")
 
-    assert sensor.state is None
+    assert sensor.native_value is None
 
 
-def test_ten_minutes_sensor_rounds_numeric_state():
+def test_ten_minutes_sensor_keeps_precision_for_display():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherTenMinutesSensor(hass, "Ten", 1.2345, "°C", "t")
+    sensor = _ten_minutes(hass, "Ten", 1.2345, "°C", "t")
 
-    assert sensor.state == 1.23
+    assert sensor.native_value == 1.2345
+    assert sensor.suggested_display_precision == 2
 
 
 @pytest.mark.asyncio
 async def test_ten_minutes_sensor_async_update_delegates_to_update_data():
-    sensor = HungarometWeatherTenMinutesSensor(SimpleNamespace(), "Ten", 0, "°C", "t")
+    sensor = _ten_minutes(SimpleNamespace(), "Ten", 0, "°C", "t")
     sensor.async_update_data = AsyncMock()
 
     await sensor.async_update()
@@ -468,7 +527,7 @@ async def test_ten_minutes_sensor_async_update_delegates_to_update_data():
 
 
 def test_ten_minutes_sensor_sync_update_is_noop():
-    sensor = HungarometWeatherTenMinutesSensor(SimpleNamespace(), "Ten", 0, "°C", "t")
+    sensor = _ten_minutes(SimpleNamespace(), "Ten", 0, "°C", "t")
 
     assert sensor.update() is None
 
@@ -532,14 +591,36 @@ async def test_radar_async_image_missing(tmp_path):
     assert result is None
 
 
-def test_radar_sync_image_reads_file(tmp_path):
+@pytest.mark.asyncio
+async def test_radar_image_loads_existing_file_once_when_added(tmp_path, monkeypatch):
     gif_file = tmp_path / "radar_animation.gif"
     gif_file.write_bytes(b"binary")
-    hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
+    mtime = datetime(2024, 1, 1, 0, 0).timestamp()
+    os.utime(gif_file, (mtime, mtime))
+    _use_scheduler(monkeypatch, "radar_gif_image")
+    hass = SimpleNamespace(
+        async_add_executor_job=AsyncMock(side_effect=lambda func, *args: func(*args)),
+        data={},
+        bus=DummyBus(),
+    )
     image = HungarometRadarImage(hass)
     image._gif_path = str(gif_file)
+    assert image.available is False
+
+    await image.async_added_to_hass()
+    gif_file.unlink()
 
     assert image.image() == b"binary"
+    assert await image.async_image() == b"binary"
+    assert image.available is True
+    assert image.state.startswith("2024-01-01")
+    assert image.image_last_updated == datetime.fromtimestamp(mtime, timezone.utc)
+    assert image.etag == content_etag(b"binary")
+    assert image.content_type == "image/gif"
+
+    await image.async_will_remove_from_hass()
+    await image.async_added_to_hass()
+    hass.async_add_executor_job.assert_called_once()
 
 
 def test_radar_image_property_helpers(tmp_path):
@@ -552,7 +633,17 @@ def test_radar_image_property_helpers(tmp_path):
     assert image.device_info["model"] == "Radar Image"
     assert image.state == "unknown"
     assert image.available is False
-    assert image.extra_state_attributes == {"last_updated": None, "update_counter": 0}
+    assert image.extra_state_attributes == {
+        "last_updated": None,
+        "update_counter": 0,
+        "frame_cache_hits": 0,
+        "frame_cache_misses": 0,
+        "frame_cache_size": 0,
+        "frame_cache_bytes": 0,
+        "latest_frame": None,
+        "etag": None,
+        "url": None,
+    }
 
 
 @pytest.mark.asyncio
@@ -561,7 +652,7 @@ async def test_radar_handle_scheduled_update_ignores_when_not_added(monkeypatch)
     image = HungarometRadarImage(hass)
     image.async_update_data = AsyncMock()
 
-    await image._handle_scheduled_update(None)
+    await image._handle_scheduled_update()
 
     image.async_update_data.assert_not_awaited()
 
@@ -577,21 +668,15 @@ async def test_radar_async_update_delegates_to_update_data():
     image.async_update_data.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-async def test_radar_async_image_reads_file(tmp_path):
+def test_radar_read_gif_file_missing_returns_none(tmp_path):
     hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
     image = HungarometRadarImage(hass)
-    gif_file = tmp_path / "radar_async.gif"
-    gif_file.write_bytes(b"async")
-    image._gif_path = str(gif_file)
-
-    result = await image.async_image()
+    image._gif_path = str(tmp_path / "missing.gif")
 
-    assert result == b"async"
+    assert image._read_gif_file() is None
 
 
-@pytest.mark.asyncio
-async def test_radar_async_image_os_error_returns_none(tmp_path, monkeypatch):
+def test_radar_read_gif_file_os_error_returns_none(tmp_path, monkeypatch):
     hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
     image = HungarometRadarImage(hass)
     gif_file = tmp_path / "radar_async_error.gif"
@@ -606,7 +691,7 @@ async def test_radar_async_image_os_error_returns_none(tmp_path, monkeypatch):
 
     monkeypatch.setattr(builtins, "open", _raise)
 
-    assert await image.async_image() is None
+    assert image._read_gif_file() is None
 
 
 def test_radar_sync_image_missing_returns_none(tmp_path):
@@ -617,39 +702,98 @@ def test_radar_sync_image_missing_returns_none(tmp_path):
     assert image.image() is None
 
 
-def test_radar_sync_image_os_error_returns_none(tmp_path, monkeypatch):
-    hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
+@pytest.mark.asyncio
+async def test_radar_image_stays_unavailable_without_file(monkeypatch):
+    _use_scheduler(monkeypatch, "radar_gif_image")
+    hass = SimpleNamespace(
+        async_add_executor_job=AsyncMock(return_value=None), data={}, bus=DummyBus()
+    )
     image = HungarometRadarImage(hass)
-    gif_file = tmp_path / "radar_sync_error.gif"
-    gif_file.write_bytes(b"data")
-    image._gif_path = str(gif_file)
-    real_open = builtins.open
-
-    def _raise(path, *args, mode="r", **kwargs):
-        if path == str(gif_file):
-            raise OSError("boom")
-        return real_open(path, *args, mode=mode, **kwargs)
 
-    monkeypatch.setattr(builtins, "open", _raise)
+    await image.async_added_to_hass()
 
+    assert image.available is False
     assert image.image() is None
+    assert image.image_last_updated is None
 
 
-def test_radar_image_initializes_with_existing_file(monkeypatch):
-    hass = SimpleNamespace(async_add_executor_job=AsyncMock(), data={}, bus=DummyBus())
-    monkeypatch.setattr(
-        "custom_components.hungaromet.radar_gif_image.os.path.exists",
-        lambda path: True,
-    )
-    monkeypatch.setattr(
-        "custom_components.hungaromet.radar_gif_image.os.path.getmtime",
-        lambda path: datetime(2024, 1, 1, 0, 0).timestamp(),
+@pytest.mark.asyncio
+async def test_radar_image_serves_rebuilt_gif_from_memory(tmp_path, monkeypatch):
+    _use_scheduler(monkeypatch, "radar_gif_image")
+    hass = SimpleNamespace(
+        async_add_executor_job=_radar_executor("updated"),
+        data={},
+        bus=DummyBus(),
     )
-
     image = HungarometRadarImage(hass)
+    image._gif_path = str(tmp_path / "missing.gif")
+    image._added = True
+    image.async_write_ha_state = MagicMock()
+    image._updater.gif_bytes = b"GIF89a"
+    image._updater.etag = "0123abcd"
 
-    assert image.state.startswith("2024-01-01")
+    await image.async_update_data()
+
+    assert await image.async_image() == b"GIF89a"
     assert image.available is True
+    assert image.image_last_updated is not None
+    assert image.state == image._last_updated
+    assert image.etag == "0123abcd"
+    assert image.url == "/api/hungaromet/missing.gif?v=0123abcd"
+
+    # A forced rebuild to the same bytes keeps clients' copies valid
+    updated = image.image_last_updated
+    await image.async_update_data(force=True)
+    assert image.image_last_updated is updated
+
+
+@pytest.mark.asyncio
+async def test_radar_variant_image_follows_full_size_build(tmp_path, monkeypatch):
+    scheduler = _use_scheduler(monkeypatch, "radar_gif_image")
+    hass = SimpleNamespace(
+        async_add_executor_job=AsyncMock(side_effect=lambda func, *args: func(*args)),
+        data={},
+        bus=DummyBus(),
+    )
+    image = HungarometRadarImage(hass, variants=("half",))
+    image._updater.output_path = str(tmp_path / "radar_animation.gif")
+    variant = HungarometRadarVariantImage(image, "half")
+    (tmp_path / "radar_animation_half.gif").write_bytes(b"small")
+    image.async_write_ha_state = variant.async_write_ha_state = MagicMock()
+
+    assert variant._updater is image._updater
+    assert variant.name == "HungaroMet Radar half"
+    assert variant.unique_id == "hungaromet_radar_gif_hungaromet_radar_half"
+    assert variant.file_name == "radar_animation_half.gif"
+
+    await variant.async_added_to_hass()
+    assert scheduler.jobs == {}
+    assert variant.image() == b"small"
+    assert variant in hass.data["hungaromet"]["radar_images"]
+
+    # A failed build leaves the variant as it was
+    image._added = True
+    image._updater.fetch = MagicMock(return_value=("failed", None))
+    image._schedule_reprobe = MagicMock()
+    await image.async_update_data()
+    await variant.async_update_data()
+    assert variant.image() == b"small"
+
+    image._updater.fetch = MagicMock(return_value=("updated", None))
+    image._updater.build = MagicMock(return_value="updated")
+    image._updater.gif_bytes, image._updater.etag = b"GIF89a", "full"
+    image._updater.variant_outputs = {"half": (b"GIF89a half", "half")}
+    await image.async_update_data()
+
+    assert variant.image() == b"GIF89a half"
+    assert variant.etag == "half"
+    assert variant.extra_state_attributes["variant"] == "half"
+    assert variant.extra_state_attributes["update_counter"] == 1
+
+    await variant.async_will_remove_from_hass()
+    assert variant not in hass.data["hungaromet"]["radar_images"]
+    variant.refresh_from_updater()
+    assert variant.extra_state_attributes["update_counter"] == 1
 
 
 @pytest.mark.asyncio
@@ -660,14 +804,14 @@ async def test_radar_handle_scheduled_update(monkeypatch):
     called = AsyncMock()
     monkeypatch.setattr(image, "async_update_data", called)
 
-    await image._handle_scheduled_update(None)
+    await image._handle_scheduled_update()
     called.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_daily_sensor_lifecycle():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherDailySensor(hass, "Daily", 0, "°C", "t")
+    sensor = _daily(hass, "Daily", 0, "°C", "t")
 
     await sensor.async_added_to_hass()
     assert sensor._added is True
@@ -679,7 +823,7 @@ async def test_daily_sensor_lifecycle():
 @pytest.mark.asyncio
 async def test_hourly_sensor_lifecycle():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherHourlySensor(hass, "Hourly", 0, "°C", "t")
+    sensor = _hourly(hass, "Hourly", 0, "°C", "t")
 
     await sensor.async_added_to_hass()
     assert sensor._added is True
@@ -691,10 +835,275 @@ async def test_hourly_sensor_lifecycle():
 @pytest.mark.asyncio
 async def test_ten_minutes_sensor_lifecycle():
     hass = SimpleNamespace()
-    sensor = HungarometWeatherTenMinutesSensor(hass, "Ten", 0, "°C", "t")
+    sensor = _ten_minutes(hass, "Ten", 0, "°C", "t")
 
     await sensor.async_added_to_hass()
     assert sensor._added is True
 
     await sensor.async_will_remove_from_hass()
     assert sensor._added is False
+
+
+def test_description_table_keeps_legacy_unique_ids():
+    hass = SimpleNamespace()
+    by_key = {description.key: description for description in DAILY_SENSORS}
+
+    sensor = HungarometWeatherSensor(hass, by_key["average_rau"], {"average_rau": 1.0})
+
+    assert sensor.unique_id == "hungaromet_weather_napi_csapadékösszeg"
+    assert sensor.native_unit_of_measurement == "mm"
+
+
+def test_daily_time_sensor_parses_date():
+    sensor = _daily(SimpleNamespace(), "Napi idő", "2024-01-01", None, "time")
+
+    assert sensor.native_value == date(2024, 1, 1)
+    assert sensor.device_class == "date"
+
+    sensor = _daily(SimpleNamespace(), "Napi idő", "bad", None, "time")
+    assert sensor.native_value is None
+
+
+def test_update_keeps_previous_value_when_missing():
+    sensor = _hourly(SimpleNamespace(), "Órás", 3.5, "°C", "t")
+
+    assert sensor.ingest({"t": None}) is False
+    assert sensor.native_value == 3.5
+
+
+def test_total_sensor_sets_last_reset_from_measurement_time():
+    sensor = HungarometWeatherSensor(
+        SimpleNamespace(),
+        describe("hourly", "r", "Órás csapadék", "mm"),
+        {"average_r": 0.4, "time": "2024-01-01T10:00:00+00:00"},
+    )
+
+    assert sensor.native_value == 0.4
+    assert sensor.state_class == "total"
+    assert sensor.last_reset == datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def test_measurement_sensor_has_no_last_reset():
+    sensor = HungarometWeatherSensor(
+        SimpleNamespace(),
+        describe("hourly", "t", "Órás hőmérséklet", "°C"),
+        {"average_t": 5.0, "time": "2024-01-01T10:00:00+00:00"},
+    )
+
+    assert sensor.state_class == "measurement"
+    assert sensor.last_reset is None
+
+
+@pytest.mark.asyncio
+async def test_sensor_without_location_or_coordinator_keeps_value():
+    sensor = _hourly(SimpleNamespace(), "Órás", 2.0, "°C", "t")
+    sensor._added = True
+    sensor.async_write_ha_state = MagicMock()
+
+    await sensor.async_update_data()
+
+    assert sensor.native_value == 2.0
+    sensor.async_write_ha_state.assert_not_called()
+
+
+def test_location_prefix_scopes_unique_ids_and_devices():
+    location = DummyLocation(({}, []), unique_id_prefix="entry1_")
+    sensor = _daily(SimpleNamespace(), "Napi átlag", 1.0, "°C", "t", location=location)
+    station = HungarometStationInfoSensor(
+        SimpleNamespace(), "Stations", [], "hourly", location
+    )
+
+    assert sensor.unique_id == "entry1_hungaromet_weather_napi_átlag"
+    assert sensor.device_info["identifiers"] == {("entry1_hungaromet_weather",)}
+    assert station.unique_id == "entry1_hungaromet_weather_station_info_hourly"
+
+
+@pytest.mark.asyncio
+async def test_radar_image_reprobes_when_no_new_frame(monkeypatch):
+    scheduled = _use_scheduler(monkeypatch, "radar_gif_image").once
+    hass = SimpleNamespace(
+        async_add_executor_job=_radar_executor("unchanged"),
+        data={},
+        bus=DummyBus(),
+    )
+    image = HungarometRadarImage(hass)
+    image._added = True
+    image.async_write_ha_state = MagicMock()
+
+    await image._handle_scheduled_update()
+    await image.async_update_data()
+
+    assert len(scheduled) == 1
+    assert scheduled[0][:2] == ("hungaromet_radar_gif_hungaromet_radar reprobe", 60)
+    image.async_write_ha_state.assert_not_called()
+
+    for _ in range(5):
+        await scheduled[-1][2]()
+    assert len(scheduled) == 3
+    assert image._unsub_reprobe is None
+
+    await image._handle_scheduled_update()
+    assert len(scheduled) == 4
+
+    hass.async_add_executor_job.status = "updated"
+    pending = image._unsub_reprobe
+    await image.async_update_data()
+
+    pending.assert_called_once()
+    assert image._unsub_reprobe is None
+    assert image._update_counter == 1
+
+    hass.async_add_executor_job.status = "failed"
+    await image._handle_scheduled_update()
+    assert len(scheduled) == 5
+    pending = image._unsub_reprobe
+
+    await image.async_will_remove_from_hass()
+    pending.assert_called_once()
+    assert image._unsub_reprobe is None
+
+
+@pytest.mark.asyncio
+async def test_radar_precipitation_sensor_reads_frame_store(monkeypatch):
+    scheduler = _use_scheduler(monkeypatch, "radar_precipitation_sensor")
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    hass = SimpleNamespace(data={}, async_add_executor_job=run_in_executor)
+    location = SimpleNamespace(
+        unique_id_prefix="entry_", latitude=47.5, longitude=19.04
+    )
+    sensor = HungarometRadarPrecipitationSensor(hass, location, radius_km=5)
+    sensor.async_write_ha_state = MagicMock()
+
+    assert sensor.unique_id == "entry_hungaromet_radar_precipitation"
+    # One radar device per entry, shared with the image and camera
+    assert sensor.device_info == HungarometRadarCamera(
+        hass, unique_id_prefix="entry_"
+    ).device_info
+    assert sensor.native_unit_of_measurement == "mm/h"
+    await sensor.async_update()
+    assert not sensor.available
+    assert sensor.native_value is None
+    assert sensor.extra_state_attributes == {"radius_km": 5}
+
+    await sensor.async_update_data()
+    sensor.async_write_ha_state.assert_not_called()
+
+    await sensor.async_added_to_hass()
+    callback, kwargs = scheduler.jobs["entry_hungaromet_radar_precipitation"]
+    assert kwargs["cost"] == "io"
+    assert kwargs["minute"][:2] == [2, 7]
+    indices = np.zeros((768, 1024), dtype=np.uint8)
+    indices[335, 479] = 1
+    get_frame_store(hass).put(
+        RadarFrame(
+            "refl2D_pscappi_20240101_1200.png",
+            datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+            indices,
+            bytes((0, 0, 0, 245, 196, 0)),
+        )
+    )
+    # Frames of another product in the shared store are not rain rates
+    get_frame_store(hass).put(
+        RadarFrame(
+            "refl2D_20240101_1205.png",
+            datetime(2024, 1, 1, 12, 5, tzinfo=timezone.utc),
+            indices,
+            bytes((0, 0, 0, 10, 10, 10)),
+        )
+    )
+    await callback()
+
+    name = "entry_hungaromet_radar_precipitation sample"
+    assert scheduler.runs[-1] == (name, "cpu", 20)
+    assert sensor.available
+    assert sensor.native_value == pytest.approx(5.6, abs=0.1)
+    assert sensor.extra_state_attributes["dbz"] == 35
+    assert sensor.extra_state_attributes["frames"] == 1
+    assert sensor.extra_state_attributes["radar_time"] == "2024-01-01T12:00:00+00:00"
+    # A single frame gives no motion to extrapolate
+    assert sensor.extra_state_attributes["rain_expected_in"] is None
+    assert sensor.extra_state_attributes["motion_speed_kmh"] is None
+    sensor.async_write_ha_state.assert_called_once()
+
+    await sensor.async_will_remove_from_hass()
+    assert scheduler.removed == ["entry_hungaromet_radar_precipitation"]
+    await sensor.async_will_remove_from_hass()
+
+
+def _dispatcher_hass(**kwargs):
+    """Hass running dispatcher jobs at once, as the event loop would."""
+    return SimpleNamespace(
+        data={}, async_run_hass_job=lambda job, *args: job.target(*args), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_radar_camera_serves_the_image_frames(monkeypatch):
+    """Test the camera serves the PNGs of each image build without fetching."""
+    _use_scheduler(monkeypatch, "radar_gif_image")
+    hass = _dispatcher_hass(
+        async_add_executor_job=_radar_executor("updated"), bus=DummyBus()
+    )
+    image = HungarometRadarImage(hass, unique_id_prefix="abc_")
+    image._added = True
+    image.async_write_ha_state = MagicMock()
+    camera = HungarometRadarCamera(hass, unique_id_prefix="abc_")
+    camera.async_write_ha_state = MagicMock()
+    other = HungarometRadarCamera(hass)
+    other.async_write_ha_state = MagicMock()
+
+    assert not camera.available
+    assert await camera.async_camera_image() is None
+    await camera.async_added_to_hass()
+    await other.async_added_to_hass()
+
+    # The downloaded bytes, neither listed again nor re-encoded
+    image._updater.pngs = {"a.png": b"a", "b.png": b"b"}
+    await image.async_update_data()
+    assert camera.available
+    assert await camera.async_camera_image() == b"b"
+    assert camera.extra_state_attributes == {
+        "frames": ["a.png", "b.png"],
+        "frame_interval": 1.0,
+    }
+    camera.async_write_ha_state.assert_called_once()
+    # Only the camera of the image's device follows it
+    assert not other.available
+
+    # A forced rebuild of the same frames does not touch the state
+    await image.async_update_data(force=True)
+    camera.async_write_ha_state.assert_called_once()
+
+    for remove in camera._on_remove:
+        remove()
+    image._updater.pngs = {"b.png": b"b", "c.png": b"c"}
+    await image.async_update_data()
+    assert await camera.async_camera_image() == b"b"
+
+
+@pytest.mark.asyncio
+async def test_radar_camera_stream_cycles_frames(monkeypatch):
+    """Test the frame stream steps through the frames and ends without any."""
+    steps = []
+
+    async def fake_stream(request, image_cb, content_type, interval):
+        for _ in range(3):
+            steps.append(await image_cb())
+        return (content_type, interval)
+
+    monkeypatch.setattr(
+        "custom_components.hungaromet.radar_camera.async_get_still_stream",
+        fake_stream,
+    )
+    camera = HungarometRadarCamera(SimpleNamespace(data={}))
+    camera._frames = [("a.png", b"a"), ("b.png", b"b")]
+
+    assert await camera.handle_async_mjpeg_stream(None) == ("image/png", 1.0)
+    assert steps == [b"a", b"b", b"a"]
+
+    camera._frames = []
+    await camera.handle_async_mjpeg_stream(None)
+    assert steps[3:] == [None, None, None]
+
@@ -0,0 +1,299 @@
+"""Tests for the update service helpers in services.py"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import voluptuous as vol
+
+from custom_components.hungaromet.radar_archive import RadarArchive
+from custom_components.hungaromet.radar_precipitation_sensor import (
+    HungarometRadarPrecipitationSensor,
+)
+from custom_components.hungaromet.scheduler import get_scheduler
+from custom_components.hungaromet.services import (
+    TIMELAPSE_SERVICE_SCHEMA,
+    UPDATE_SERVICE_SCHEMA,
+    async_register_platform_service,
+    async_setup_services,
+    async_update_dataset,
+)
+from custom_components.hungaromet.sensor_descriptions import describe
+from custom_components.hungaromet.station_info_sensor import HungarometStationInfoSensor
+from custom_components.hungaromet.weather_sensor import HungarometWeatherSensor
+
+
+class DummyLocation:
+    def __init__(self, result=({}, []), entities=None, key="entry"):
+        self.key = key
+        self.unique_id_prefix = ""
+        self.entities = entities or []
+        self.async_get_data = AsyncMock(return_value=result)
+
+
+class RecordingScheduler:
+    def __init__(self):
+        self.runs = []
+
+    async def async_run_now(self, name, action=None):
+        self.runs.append(name)
+        return await action()
+
+    def stats(self):
+        return {"runs": self.runs}
+
+
+def _sensor(dataset, hass, name, unit, key):
+    return HungarometWeatherSensor(hass, describe(dataset, key, name, unit), {})
+
+
+def _added(sensor):
+    sensor._added = True
+    sensor.async_write_ha_state = MagicMock()
+    return sensor
+
+
+@pytest.mark.asyncio
+async def test_update_dataset_fetches_once_and_fans_out():
+    hass = SimpleNamespace(data={})
+    location = DummyLocation(({"average_t": 1.5, "average_u": 80}, ["A"]))
+    location.entities = [
+        _added(_sensor("hourly", hass, "T", "°C", "t")),
+        _added(_sensor("hourly", hass, "U", "%", "u")),
+        _added(_sensor("hourly", hass, "X", "°C", "tx")),
+        _added(_sensor("daily", hass, "D", "°C", "t")),
+        _added(HungarometStationInfoSensor(hass, "Stations", [], "hourly")),
+    ]
+
+    result = await async_update_dataset(location, "hourly")
+
+    location.async_get_data.assert_awaited_once_with("hourly", False)
+    assert result["status"] == "updated"
+    assert result["entities"] == 3
+    assert "fetch_ms" in result
+    assert location.entities[0].native_value == 1.5
+    assert location.entities[1].native_value == 80
+    assert location.entities[2].native_value is None
+    location.entities[2].async_write_ha_state.assert_not_called()
+    assert location.entities[3].native_value is None
+    assert location.entities[4].state == 1
+
+
+@pytest.mark.asyncio
+async def test_update_dataset_skips_without_active_entities_unless_forced():
+    hass = SimpleNamespace(data={})
+    location = DummyLocation(entities=[_sensor("daily", hass, "D", "°C", "t")])
+
+    result = await async_update_dataset(location, "daily")
+    assert result["status"] == "skipped"
+    location.async_get_data.assert_not_called()
+
+    result = await async_update_dataset(location, "daily", force=True)
+    assert result["status"] == "updated"
+    assert result["entities"] == 0
+    location.async_get_data.assert_awaited_once_with("daily", True)
+
+
+@pytest.mark.asyncio
+async def test_update_dataset_unsupported_type():
+    location = DummyLocation()
+
+    result = await async_update_dataset(location, "weekly")
+
+    assert result["status"] == "unsupported"
+    location.async_get_data.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_dataset_reports_failures():
+    hass = SimpleNamespace(data={})
+    location = DummyLocation(entities=[_added(_sensor("daily", hass, "D", "°C", "t"))])
+    location.async_get_data.side_effect = OSError("offline")
+
+    result = await async_update_dataset(location, "daily")
+
+    assert result["status"] == "failed"
+    assert result["error"] == "offline"
+
+
+@pytest.mark.asyncio
+async def test_update_service_targets_requested_datasets():
+    hass = SimpleNamespace(data={}, services=MagicMock())
+    location = DummyLocation(({"average_t": 3.0}, []))
+    location.entities = [_added(_sensor("hourly", hass, "T", "°C", "t"))]
+    async_register_platform_service(hass, "hungaromet_weather", location)
+    domain, _, handler = hass.services.async_register.call_args[0]
+
+    call = SimpleNamespace(
+        data=UPDATE_SERVICE_SCHEMA({"dataset": ["hourly", "hourly", "radar"]})
+    )
+    response = await handler(call)
+
+    assert domain == "hungaromet_weather"
+    location.async_get_data.assert_awaited_once()
+    assert list(response["datasets"]) == ["hourly", "radar"]
+    assert response["datasets"]["hourly"]["entities"] == 1
+    assert response["datasets"]["radar"]["status"] == "skipped"
+    assert "duration_ms" in response
+
+
+@pytest.mark.asyncio
+async def test_domain_service_covers_all_hub_locations():
+    image = SimpleNamespace(
+        hass=object(),
+        _added=True,
+        unique_id="hungaromet_radar_gif_hungaromet_radar",
+        async_update_data=AsyncMock(),
+    )
+    hass = SimpleNamespace(data={}, services=MagicMock())
+    first = DummyLocation(({"average_t": 1.0}, []), key="a")
+    first.entities = [_added(_sensor("hourly", hass, "T", "°C", "t"))]
+    second = DummyLocation(({"average_t": 2.0}, []), key="b")
+    radar_sensor = _added(HungarometRadarPrecipitationSensor(hass, second))
+    radar_sensor.async_update_data = AsyncMock()
+    second.entities = [_added(_sensor("hourly", hass, "T", "°C", "t")), radar_sensor]
+    async_setup_services(hass)
+    handler = hass.services.async_register.call_args_list[0][0][2]
+
+    response = await handler(SimpleNamespace(data=UPDATE_SERVICE_SCHEMA({})))
+    assert response["datasets"]["hourly"]["status"] == "skipped"
+
+    assert "executors" not in response
+    assert "scheduler" not in response
+
+    executors = MagicMock()
+    executors.stats.return_value = {"io": {"queued": 0}, "cpu": {"queued": 1}}
+    scheduler = RecordingScheduler()
+    hass.data["hungaromet"] = {
+        "hub": SimpleNamespace(locations={"a": first, "b": second}),
+        "radar_images": [image],
+        "executors": executors,
+        "scheduler": scheduler,
+    }
+    response = await handler(
+        SimpleNamespace(data=UPDATE_SERVICE_SCHEMA({"dataset": ["hourly", "radar"]}))
+    )
+
+    assert response["datasets"]["hourly"]["status"] == "updated"
+    assert response["datasets"]["hourly"]["entities"] == 2
+    assert response["datasets"]["radar"]["entities"] == 2
+    radar_sensor.async_update_data.assert_awaited_once()
+    assert first.entities[0].native_value == 1.0
+    assert second.entities[0].native_value == 2.0
+    image.async_update_data.assert_awaited_once_with(False)
+    assert response["executors"]["cpu"] == {"queued": 1}
+    # Every refresh is queued in the scheduler's lane as its scheduled job
+    assert sorted(scheduler.runs) == [
+        "a hourly",
+        "b hourly",
+        "hungaromet_radar_gif_hungaromet_radar",
+        "hungaromet_radar_precipitation",
+    ]
+    assert response["scheduler"] == {"runs": scheduler.runs}
+
+
+def test_update_service_schema_defaults():
+    assert UPDATE_SERVICE_SCHEMA({}) == {"force": False}
+    assert UPDATE_SERVICE_SCHEMA({"dataset": "daily"})["dataset"] == ["daily"]
+
+
+@pytest.mark.asyncio
+async def test_timelapse_service_writes_archive_timelapse(tmp_path):
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    archive = RadarArchive(str(tmp_path / "hungaromet_radar_archive"))
+    archive.timelapse = MagicMock(return_value=(b"RIFF", 12))
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        data={},
+        services=MagicMock(),
+        async_add_executor_job=run_in_executor,
+        loop=loop,
+        async_create_task=loop.create_task,
+    )
+    async_setup_services(hass)
+    domain, service, handler = hass.services.async_register.call_args[0]
+    call = SimpleNamespace(data=TIMELAPSE_SERVICE_SCHEMA({"hours": 3, "format": "webp"}))
+
+    assert (domain, service) == ("hungaromet", "radar_timelapse")
+    assert (await handler(call))["status"] == "unavailable"
+
+    hass.data["hungaromet"] = {"radar_archive": {"": archive}}
+    scheduler = get_scheduler(hass)
+    lane = asyncio.Event()
+    # Queued behind the CPU job holding the lane instead of running beside it
+    busy = asyncio.ensure_future(scheduler.async_run("radar", lane.wait))
+    pending = asyncio.ensure_future(handler(call))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["waiting"] == ["radar_timelapse radar_timelapse_3h.webp"]
+    archive.timelapse.assert_not_called()
+    lane.set()
+    await busy
+    response = await pending
+
+    archive.timelapse.assert_called_once_with(3.0, "webp")
+    assert response["status"] == "updated"
+    assert response["frames"] == 12
+    assert response["path"] == str(tmp_path / "radar_timelapse_3h.webp")
+    assert (tmp_path / "radar_timelapse_3h.webp").read_bytes() == b"RIFF"
+
+    archive.timelapse.return_value = None
+    assert (await handler(call))["status"] == "empty"
+
+
+@pytest.mark.asyncio
+async def test_timelapse_service_uses_the_entry_archive(tmp_path):
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    first = RadarArchive(str(tmp_path / "hungaromet_radar_archive"))
+    second = RadarArchive(
+        str(tmp_path / "b_hungaromet_radar_archive"), file_prefix="b_"
+    )
+    for archive in (first, second):
+        archive.timelapse = MagicMock(return_value=(b"GIF89a", 4))
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        data={
+            "hungaromet": {
+                "radar_archive": {"": first, "b_": second},
+                "hub": SimpleNamespace(
+                    locations={
+                        "a": SimpleNamespace(file_prefix=""),
+                        "b": SimpleNamespace(file_prefix="b_"),
+                        "c": SimpleNamespace(file_prefix="c_"),
+                    }
+                ),
+            }
+        },
+        services=MagicMock(),
+        async_add_executor_job=run_in_executor,
+        loop=loop,
+        async_create_task=loop.create_task,
+    )
+    async_setup_services(hass)
+    handler = hass.services.async_register.call_args[0][2]
+
+    def call(**data):
+        return SimpleNamespace(data=TIMELAPSE_SERVICE_SCHEMA({"hours": 1, **data}))
+
+    response = await handler(call(entry_id="b"))
+    assert response["path"] == str(tmp_path / "b_radar_timelapse_1h.gif")
+    second.timelapse.assert_called_once_with(1.0, "gif")
+    first.timelapse.assert_not_called()
+    # Without an entry the archive enabled first answers
+    response = await handler(call())
+    assert response["path"] == str(tmp_path / "radar_timelapse_1h.gif")
+    # Entries without an archive, and unknown entries, have none to use
+    assert (await handler(call(entry_id="c")))["status"] == "unavailable"
+    assert (await handler(call(entry_id="x")))["status"] == "unavailable"
+    del hass.data["hungaromet"]["hub"]
+    assert (await handler(call(entry_id="b")))["status"] == "unavailable"
+
+
+def test_timelapse_service_schema():
+    assert TIMELAPSE_SERVICE_SCHEMA({"hours": "1.5"}) == {"hours": 1.5, "format": "gif"}
+    with pytest.raises(vol.Invalid):
+        TIMELAPSE_SERVICE_SCHEMA({"hours": 0})